@@ -0,0 +1,310 @@
+"""
+Micro-benchmarks for the framework hot paths
+"""
+import asyncio
+import json
+import os
+import statistics
+import time
+from config.config import Config
+from utils.report_utils import create_dated_report_path, get_report_metadata
+from utils.stub_server import StubServer
+from utils.test_data_manager import TestDataManager, TestDataStore
+from utils.logger import TestLogger
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+BENCHMARKS = []
+
+# Queries of the sync vs async search flow comparison
+SEARCH_FLOW_QUERIES = [f"benchmark query {index}" for index in range(8)]
+
+def benchmark(name, iterations=20, warmup=2, browser=False):
+    """Register a benchmark function"""
+    def decorator(func):
+        BENCHMARKS.append({
+            "name": name,
+            "func": func,
+            "iterations": iterations,
+            "warmup": warmup,
+            "browser": browser
+        })
+        return func
+    return decorator
+
+def percentiles(samples):
+    """Summarize timing samples in milliseconds"""
+    ordered = sorted(samples)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+        p50, p90, p99 = cuts[49], cuts[89], cuts[98]
+    else:
+        p50 = p90 = p99 = ordered[0]
+    return {
+        "iterations": len(ordered),
+        "min_ms": ordered[0] * 1000,
+        "p50_ms": p50 * 1000,
+        "p90_ms": p90 * 1000,
+        "p99_ms": p99 * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000
+    }
+
+class BenchmarkContext:
+    """Shared state for benchmarks: config, local stub server and a lazily created driver"""
+    
+    def __init__(self):
+        self.config = Config()
+        self.server = StubServer().start()
+        self._factory = None
+        self._prelaunch_factory = None
+        self._driver = None
+        self._loop = None
+        self._async_service = None
+        self._async_sessions = None
+    
+    @property
+    def factory(self):
+        if self._factory is None:
+            from utils.webdriver_factory import WebDriverFactory
+            self._factory = WebDriverFactory(self.config)
+        return self._factory
+    
+    @property
+    def prelaunch_factory(self):
+        if self._prelaunch_factory is None:
+            from utils.webdriver_factory import WebDriverFactory
+            self._prelaunch_factory = WebDriverFactory(self.config, prelaunch=True)
+        return self._prelaunch_factory
+    
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = self.factory.create_driver()
+            # Element benchmarks run against the local search page
+            self._driver.get(self.server.base_url)
+        return self._driver
+    
+    def google_page(self):
+        from pages.google_page import GooglePage
+        return GooglePage(self.driver, self.server.base_url)
+    
+    @property
+    def async_sessions(self):
+        """One async session per search flow, all served by a single driver process"""
+        if self._async_sessions is None:
+            from utils.async_webdriver import AsyncDriverService
+            self._loop = asyncio.new_event_loop()
+            self._async_service = AsyncDriverService(self.config).start()
+            self._async_sessions = self.run_async(asyncio.gather(
+                *(self._async_service.new_session() for _ in SEARCH_FLOW_QUERIES)
+            ))
+        return self._async_sessions
+    
+    def run_async(self, awaitable):
+        """Run a coroutine on the context's event loop"""
+        return self._loop.run_until_complete(awaitable)
+    
+    def close(self):
+        if self._driver is not None:
+            self._driver.quit()
+        if self._prelaunch_factory is not None:
+            self._prelaunch_factory.shutdown()
+        if self._async_sessions is not None:
+            self.run_async(asyncio.gather(*(session.quit() for session in self._async_sessions)))
+            self._async_service.stop()
+            self._loop.close()
+        self.server.stop()
+
+@benchmark("config_load", iterations=200)
+def bench_config_load(context):
+    Config()
+
+@benchmark("config_resolve_uncached", iterations=200)
+def bench_config_resolve(context):
+    Config.resolve(context.config.environment)
+
+@benchmark("config_get_100k", iterations=20)
+def bench_config_get(context):
+    config = context.config
+    for _ in range(100000):
+        config.explicit_wait
+
+@benchmark("test_data_load", iterations=200)
+def bench_test_data_load(context):
+    TestDataManager()
+
+@benchmark("test_data_parse_uncached", iterations=200)
+def bench_test_data_parse(context):
+    TestDataStore("test_data/test_data.json").load()
+
+_bench_logger = None
+
+def _benchmark_logger():
+    """Separate logger without console output so the benchmark does not flood the terminal"""
+    global _bench_logger
+    if _bench_logger is None:
+        _bench_logger = TestLogger("framework_benchmark", console=False)
+    return _bench_logger
+
+@benchmark("logger_1000_debug_filtered", iterations=20)
+def bench_logger_debug(context):
+    bench_logger = _benchmark_logger()
+    for index in range(1000):
+        bench_logger.log_element_action("click", f"element {index}")
+
+@benchmark("logger_1000_info", iterations=20)
+def bench_logger_info(context):
+    bench_logger = _benchmark_logger()
+    for index in range(1000):
+        bench_logger.info("benchmark message %d", index)
+
+@benchmark("driver_create_quit", iterations=3, warmup=1, browser=True)
+def bench_driver_creation(context):
+    context.factory.create_driver().quit()
+
+@benchmark("fresh_browser_test_prelaunch", iterations=5, warmup=1, browser=True)
+def bench_fresh_browser_prelaunch(context):
+    # A fresh-browser test: get the browser, load the page, hand the browser back
+    factory = context.prelaunch_factory
+    driver = factory.acquire_fresh()
+    driver.get(context.server.base_url)
+    factory.quit_driver(driver)
+
+@benchmark("google_page_navigate_to", iterations=20, browser=True)
+def bench_navigate_to(context):
+    context.google_page().navigate_to()
+
+@benchmark("base_page_find_element", iterations=50, browser=True)
+def bench_find_element(context):
+    page = context.google_page()
+    page.find_element(page.SEARCH_BOX)
+
+@benchmark("base_page_send_keys", iterations=50, browser=True)
+def bench_send_keys(context):
+    page = context.google_page()
+    page.send_keys(page.SEARCH_BOX, "benchmark")
+
+@benchmark("base_page_click", iterations=50, browser=True)
+def bench_click(context):
+    page = context.google_page()
+    page.click(page.SEARCH_BOX)
+
+@benchmark("base_page_take_screenshot", iterations=20, browser=True)
+def bench_take_screenshot(context):
+    context.google_page().take_screenshot("benchmark")
+
+@benchmark("sync_search_flows_x8", iterations=5, warmup=1, browser=True)
+def bench_sync_search_flows(context):
+    page = context.google_page()
+    for query in SEARCH_FLOW_QUERIES:
+        page.navigate_to()
+        page.search_and_submit(query)
+
+@benchmark("async_search_flows_x8", iterations=5, warmup=1, browser=True)
+def bench_async_search_flows(context):
+    from pages.async_google_page import AsyncGooglePage
+    
+    async def search(session, query):
+        page = AsyncGooglePage(session, context.server.base_url)
+        await page.navigate_to()
+        await page.search_and_submit(query)
+    
+    context.run_async(asyncio.gather(
+        *(search(session, query) for session, query in zip(context.async_sessions, SEARCH_FLOW_QUERIES))
+    ))
+
+def run_benchmark(entry, context):
+    """Run a single benchmark and return its timing summary"""
+    func = entry["func"]
+    for _ in range(entry["warmup"]):
+        func(context)
+    
+    samples = []
+    for _ in range(entry["iterations"]):
+        start = time.perf_counter()
+        func(context)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+def compare_with_baseline(results, baseline, threshold):
+    """Find benchmarks whose median got slower than the baseline by more than threshold"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        limit = reference["p50_ms"] * (1 + threshold)
+        if result["p50_ms"] > limit:
+            regressions.append({
+                "name": name,
+                "baseline_p50_ms": reference["p50_ms"],
+                "p50_ms": result["p50_ms"],
+                "change": result["p50_ms"] / reference["p50_ms"] - 1
+            })
+    return regressions
+
+def run_benchmarks(include_browser=True, baseline_file=BASELINE_FILE, threshold=0.2,
+                   update_baseline=False, name_filter=None, browser=None):
+    """Run the benchmark suite, save results and compare them with the baseline"""
+    report_path = create_dated_report_path()
+    metadata = get_report_metadata()
+    if browser:
+        # Same override as --browser gives a pytest run
+        Config.configure(overrides={"browser.name": browser})
+        metadata["browser"] = browser
+    
+    print(f"⏱️ Running framework benchmarks...")
+    print(f"📁 Report Path: {report_path}")
+    print("-" * 50)
+    
+    context = BenchmarkContext()
+    results = {}
+    try:
+        for entry in BENCHMARKS:
+            if entry["browser"] and not include_browser:
+                continue
+            if name_filter and name_filter not in entry["name"]:
+                continue
+            result = run_benchmark(entry, context)
+            results[entry["name"]] = result
+            print(
+                f"{entry['name']:<30} p50 {result['p50_ms']:9.3f} ms  "
+                f"p90 {result['p90_ms']:9.3f} ms  p99 {result['p99_ms']:9.3f} ms"
+            )
+    finally:
+        context.close()
+    
+    baseline = {}
+    if os.path.exists(baseline_file):
+        with open(baseline_file, "r") as f:
+            baseline = json.load(f)["results"]
+    regressions = compare_with_baseline(results, baseline, threshold)
+    
+    output = {
+        "metadata": metadata,
+        "threshold": threshold,
+        "results": results,
+        "regressions": regressions
+    }
+    results_file = os.path.join(report_path, "benchmarks.json")
+    with open(results_file, "w") as f:
+        json.dump(output, f, indent=4)
+    
+    print("-" * 50)
+    print(f"📊 Benchmark Results: {results_file}")
+    
+    if update_baseline:
+        with open(baseline_file, "w") as f:
+            json.dump({"metadata": metadata, "results": results}, f, indent=4)
+        print(f"📌 Baseline updated: {baseline_file}")
+        return 0
+    
+    if not baseline:
+        print("ℹ️ No baseline found, run with --update-baseline to create one")
+    for regression in regressions:
+        print(
+            f"❌ Regression: {regression['name']} p50 {regression['p50_ms']:.3f} ms "
+            f"vs baseline {regression['baseline_p50_ms']:.3f} ms (+{regression['change']:.0%})"
+        )
+    return 1 if regressions else 0
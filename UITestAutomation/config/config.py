@@ -1,130 +1,396 @@
 import os
+import copy
 import json
 from pathlib import Path
+from types import MappingProxyType
+from utils.immutable import freeze, thaw
+
+CONFIG_DIR = Path(__file__).parent
+
+# Built-in defaults, environment files only need to contain what differs
+DEFAULT_CONFIG = {
+    "browser": {
+        "name": "chrome",
+        "headless": False,
+        "implicit_wait": 10,
+        "page_load_timeout": 30,
+        "page_load_strategy": "normal",
+        "window_size": "1920,1080"
+    },
+    "urls": {
+        "base_url": "https://www.google.com",
+        "test_url": "https://www.google.com"
+    },
+    "timeouts": {
+        "implicit_wait": 10,
+        "explicit_wait": 10,
+        "page_load": 30,
+        "test_budget": 120
+    },
+    "screenshots": {
+        "on_failure": True,
+        "on_success": False,
+        "buffer_size": 5,
+        "format": "jpeg",
+        "quality": 70,
+        "screenshot_dir": "screenshots"
+    },
+    "reports": {
+        "html": True,
+        "allure": True,
+        "json": False,
+        "xml": False
+    },
+    "parallel": {
+        "enabled": False,
+        "workers": "auto"
+    },
+    "driver_pool": {
+        "enabled": True,
+        "max_uses": 50,
+        "reset_url": "about:blank",
+        "prelaunch": True
+    },
+    "artifacts": {
+        "async": True,
+        "queue_size": 256
+    },
+    "stub_server": {
+        "enabled": False,
+        "latency_ms": 0,
+        "failure_rate": 0.0,
+        "results_count": 10,
+        "seed": None
+    },
+    "network": {
+        "profile": "none",
+        "profiles": {}
+    },
+    "drivers": {
+        "cache_dir": ".driver_cache",
+        "ttl_hours": 24,
+        "offline": False,
+        "pinned_versions": {}
+    },
+    "tabs": {
+        "max_tabs": 4
+    },
+    "data_sources": {
+        "dir": "test_data",
+        "sample": None,
+        "seed": None,
+        "shard": None
+    }
+}
+
+# Environment variables that override a single config key
+ENV_OVERRIDES = {
+    "BROWSER": "browser.name",
+    "HEADLESS": "browser.headless",
+    "PAGE_LOAD_STRATEGY": "browser.page_load_strategy",
+    "BASE_URL": "urls.base_url",
+    "NETWORK_PROFILE": "network.profile",
+    "STUB_SERVER": "stub_server.enabled",
+    "DATA_SAMPLE": "data_sources.sample",
+    "DATA_SEED": "data_sources.seed",
+    "DATA_SHARD": "data_sources.shard"
+}
+
+def parse_value(value):
+    """Parse an override given as text, JSON literals keep their type"""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+def _merge(base, override):
+    """Deep merge override into a copy of base"""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def _set_path(data, key, value):
+    """Set a dotted key like browser.name in nested dictionaries"""
+    *sections, name = key.split(".")
+    for section in sections:
+        data = data.setdefault(section, {})
+    data[name] = value
+
+def flatten(data, prefix="", flat=None):
+    """Index every section and value by its dotted key"""
+    flat = {} if flat is None else flat
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        flat[path] = value
+        if isinstance(value, MappingProxyType):
+            flatten(value, f"{path}.", flat)
+    return flat
 
 class Config:
-    """Configuration management for the test framework"""
+    """Configuration management for the test framework
     
-    def __init__(self, environment="local"):
-        self.environment = environment
-        self.config_data = self._load_config()
+    Layers are applied in order: built-in defaults, config_<env>.json,
+    environment variables and command line overrides. Each combination is
+    resolved once per process and shared read-only by all instances.
+    """
     
-    def _load_config(self):
-        """Load configuration from JSON file"""
-        config_file = Path(__file__).parent / f"config_{self.environment}.json"
-        
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                return json.load(f)
+    # (environment, overrides) -> (frozen config, flat index)
+    _resolved = {}
+    # Key used by Config() without arguments, set by configure() or a worker snapshot
+    _process_key = None
+    
+    def __init__(self, environment=None, overrides=None):
+        if environment is None and overrides is None and Config._process_key is not None:
+            key = Config._process_key
         else:
-            # Default configuration
-            return {
-                "browser": {
-                    "name": "chrome",
-                    "headless": False,
-                    "implicit_wait": 10,
-                    "page_load_timeout": 30,
-                    "window_size": "1920,1080"
-                },
-                "urls": {
-                    "base_url": "https://www.google.com",
-                    "test_url": "https://www.google.com"
-                },
-                "timeouts": {
-                    "implicit_wait": 10,
-                    "explicit_wait": 10,
-                    "page_load": 30
-                },
-                "screenshots": {
-                    "on_failure": True,
-                    "on_success": False,
-                    "screenshot_dir": "screenshots"
-                },
-                "reports": {
-                    "html": True,
-                    "allure": True,
-                    "json": False,
-                    "xml": False
-                },
-                "parallel": {
-                    "enabled": False,
-                    "workers": "auto"
-                }
-            }
+            key = self._key(environment or os.getenv("TEST_ENV", "local"), overrides)
+        
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            data = freeze(self.resolve(key[0], json.loads(key[1])))
+            resolved = self._resolved[key] = (data, flatten(data))
+        
+        self.environment = key[0]
+        self.overrides = key[1]
+        self.config_data, self._flat = resolved
+    
+    @staticmethod
+    def _key(environment, overrides):
+        return environment, json.dumps(overrides or {}, sort_keys=True)
+    
+    @classmethod
+    def resolve(cls, environment, overrides=None):
+        """Merge all configuration layers into a plain dictionary"""
+        config_file = CONFIG_DIR / f"config_{environment}.json"
+        if not config_file.exists():
+            raise ValueError(f"Unknown test environment: {environment}")
+        with open(config_file, 'r') as f:
+            data = copy.deepcopy(_merge(DEFAULT_CONFIG, json.load(f)))
+        
+        for variable, key in ENV_OVERRIDES.items():
+            if os.getenv(variable):
+                _set_path(data, key, parse_value(os.environ[variable]))
+        
+        for key, value in (overrides or {}).items():
+            _set_path(data, key, value)
+        return data
+    
+    @classmethod
+    def configure(cls, environment=None, overrides=None):
+        """Resolve the configuration of this process, later Config() calls return it"""
+        Config._process_key = None
+        config = cls(environment, overrides)
+        Config._process_key = (config.environment, config.overrides)
+        return config
+    
+    def snapshot(self):
+        """Serialized resolved configuration, handed to xdist workers"""
+        return json.dumps({
+            "environment": self.environment,
+            "overrides": self.overrides,
+            "data": thaw(self.config_data)
+        })
+    
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Use the configuration resolved by the controller process"""
+        snapshot = json.loads(snapshot)
+        key = (snapshot["environment"], snapshot["overrides"])
+        data = freeze(snapshot["data"])
+        cls._resolved[key] = (data, flatten(data))
+        Config._process_key = key
+        return cls()
+    
+    def get(self, key, default=None):
+        """Look up a dotted key like browser.name with a single dictionary access"""
+        return self._flat.get(key, default)
     
     @property
     def browser_name(self):
-        return self.config_data["browser"]["name"]
+        return self.get("browser.name")
     
     @property
     def browser_headless(self):
-        return self.config_data["browser"]["headless"]
+        return self.get("browser.headless")
     
     @property
     def browser_implicit_wait(self):
-        return self.config_data["browser"]["implicit_wait"]
+        return self.get("browser.implicit_wait")
     
     @property
     def browser_page_load_timeout(self):
-        return self.config_data["browser"]["page_load_timeout"]
+        return self.get("browser.page_load_timeout")
+    
+    @property
+    def browser_page_load_strategy(self):
+        return self.get("browser.page_load_strategy", "normal")
     
     @property
     def browser_window_size(self):
-        return self.config_data["browser"]["window_size"]
+        return self.get("browser.window_size")
     
     @property
     def base_url(self):
-        return self.config_data["urls"]["base_url"]
+        return self.get("urls.base_url")
     
     @property
     def test_url(self):
-        return self.config_data["urls"]["test_url"]
+        return self.get("urls.test_url")
+    
+    @property
+    def stub_server_enabled(self):
+        return self.get("stub_server.enabled", False)
+    
+    @property
+    def stub_server_latency_ms(self):
+        return self.get("stub_server.latency_ms", 0)
+    
+    @property
+    def stub_server_failure_rate(self):
+        return self.get("stub_server.failure_rate", 0.0)
+    
+    @property
+    def stub_server_results_count(self):
+        return self.get("stub_server.results_count", 10)
+    
+    @property
+    def stub_server_seed(self):
+        return self.get("stub_server.seed")
+    
+    @property
+    def network_profile(self):
+        return self.get("network.profile", "none")
+    
+    @property
+    def network_profiles(self):
+        return self.get("network.profiles", {})
     
     @property
     def implicit_wait(self):
-        return self.config_data["timeouts"]["implicit_wait"]
+        return self.get("timeouts.implicit_wait")
     
     @property
     def explicit_wait(self):
-        return self.config_data["timeouts"]["explicit_wait"]
+        return self.get("timeouts.explicit_wait")
     
     @property
     def page_load_timeout(self):
-        return self.config_data["timeouts"]["page_load"]
+        return self.get("timeouts.page_load")
+    
+    @property
+    def test_budget(self):
+        return self.get("timeouts.test_budget", 120)
     
     @property
     def screenshot_on_failure(self):
-        return self.config_data["screenshots"]["on_failure"]
+        return self.get("screenshots.on_failure")
     
     @property
     def screenshot_on_success(self):
-        return self.config_data["screenshots"]["on_success"]
+        return self.get("screenshots.on_success")
+    
+    @property
+    def screenshot_buffer_size(self):
+        return self.get("screenshots.buffer_size", 5)
+    
+    @property
+    def screenshot_format(self):
+        return self.get("screenshots.format", "jpeg")
+    
+    @property
+    def screenshot_quality(self):
+        return self.get("screenshots.quality", 70)
     
     @property
     def screenshot_dir(self):
-        return self.config_data["screenshots"]["screenshot_dir"]
+        return self.get("screenshots.screenshot_dir")
+    
+    @property
+    def artifact_async_enabled(self):
+        return self.get("artifacts.async", True)
+    
+    @property
+    def artifact_queue_size(self):
+        return self.get("artifacts.queue_size", 256)
     
     @property
     def html_reports_enabled(self):
-        return self.config_data["reports"]["html"]
+        return self.get("reports.html")
     
     @property
     def allure_reports_enabled(self):
-        return self.config_data["reports"]["allure"]
+        return self.get("reports.allure")
     
     @property
     def parallel_enabled(self):
-        return self.config_data["parallel"]["enabled"]
+        return self.get("parallel.enabled")
     
     @property
     def parallel_workers(self):
-        return self.config_data["parallel"]["workers"]
+        return self.get("parallel.workers")
+    
+    @property
+    def driver_pool_enabled(self):
+        return self.get("driver_pool.enabled", True)
+    
+    @property
+    def driver_pool_max_uses(self):
+        return self.get("driver_pool.max_uses", 50)
+    
+    @property
+    def driver_pool_reset_url(self):
+        return self.get("driver_pool.reset_url", "about:blank")
+    
+    @property
+    def driver_pool_prelaunch(self):
+        return self.get("driver_pool.prelaunch", True)
+    
+    @property
+    def driver_cache_dir(self):
+        return self.get("drivers.cache_dir", ".driver_cache")
+    
+    @property
+    def driver_cache_ttl_hours(self):
+        return self.get("drivers.ttl_hours", 24)
+    
+    @property
+    def driver_offline(self):
+        return self.get("drivers.offline", False)
+    
+    @property
+    def driver_pinned_versions(self):
+        return self.get("drivers.pinned_versions", {})
+    
+    @property
+    def max_tabs(self):
+        return self.get("tabs.max_tabs", 4)
+    
+    @property
+    def data_dir(self):
+        return self.get("data_sources.dir", "test_data")
+    
+    @property
+    def data_sample(self):
+        return self.get("data_sources.sample")
+    
+    @property
+    def data_seed(self):
+        return self.get("data_sources.seed")
+    
+    @property
+    def data_shard(self):
+        return self.get("data_sources.shard")
     
     def get_browser_options(self):
         """Get browser-specific options"""
         if self.browser_name.lower() == "chrome":
             from selenium.webdriver.chrome.options import Options
             options = Options()
+            options.page_load_strategy = self.browser_page_load_strategy
             
             if self.browser_headless:
                 options.add_argument("--headless")
@@ -134,16 +400,36 @@ class Config:
             options.add_argument("--disable-dev-shm-usage")
             options.add_argument("--disable-gpu")
             options.add_argument("--disable-extensions")
+            # Tabs driven concurrently by the tab pool must keep running in the background
+            options.add_argument("--disable-background-timer-throttling")
+            options.add_argument("--disable-backgrounding-occluded-windows")
+            options.add_argument("--disable-renderer-backgrounding")
+            
+            if self.network_profile != "none":
+                # Performance log is needed to count requests blocked by the network profile
+                options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
             
             return options
         
         elif self.browser_name.lower() == "firefox":
             from selenium.webdriver.firefox.options import Options
             options = Options()
+            options.page_load_strategy = self.browser_page_load_strategy
+            
+            if self.browser_headless:
+                options.add_argument("--headless")
+            
+            return options
+        
+        elif self.browser_name.lower() == "edge":
+            from selenium.webdriver.edge.options import Options
+            options = Options()
+            options.page_load_strategy = self.browser_page_load_strategy
             
             if self.browser_headless:
                 options.add_argument("--headless")
             
+            options.add_argument(f"--window-size={self.browser_window_size}")
             return options
         
         else:
@@ -0,0 +1,265 @@
+import json
+from pathlib import Path
+import pytest
+import pytest_asyncio
+from config.config import Config, parse_value
+from utils.webdriver_factory import WebDriverFactory
+from utils.driver_pool import DriverPool
+from utils.tab_pool import TabPool
+from utils.async_webdriver import AsyncDriverService
+from utils.screenshot_buffer import screenshot_buffer
+from utils.artifact_writer import artifact_writer
+from utils.deadline import start_deadline, clear_deadline
+from utils.stub_server import StubServer
+from utils.test_data_manager import TestDataManager, TestDataStore
+from utils.data_source import DataSource, parse_shard
+from utils.logger import logger, get_run_id, merge_worker_logs
+import allure
+
+pytest_plugins = ["utils.timing_plugin", "utils.scheduling_plugin", "utils.impact_plugin", "utils.results_plugin"]
+
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Store the report of each test phase on the item so fixtures can see the outcome"""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Store the next test on the item so the driver fixture can prepare its browser"""
+    item.next_item = nextitem
+
+def _needs_fresh_browser(node, config):
+    """Check if a test uses a brand-new browser instead of a pooled one"""
+    if node is None or "driver" not in getattr(node, "fixturenames", ()):
+        return False
+    return node.get_closest_marker("fresh_browser") is not None or not config.driver_pool_enabled
+
+def _test_failed(node):
+    """Check if setup or call phase of a test failed"""
+    for when in ("setup", "call"):
+        report = getattr(node, f"rep_{when}", None)
+        if report is not None and report.failed:
+            return True
+    return False
+
+def pytest_addoption(parser):
+    """Command line overrides, the last configuration layer"""
+    group = parser.getgroup("ui", "UI test configuration")
+    group.addoption("--test-env", default=None, help="Configuration environment (config_<env>.json)")
+    group.addoption("--browser", default=None, help="Browser name, overrides browser.name")
+    group.addoption("--headless", action="store_true", default=None, help="Run the browser headless")
+    group.addoption(
+        "--config-set", action="append", default=[], metavar="KEY=VALUE",
+        help="Override any config key, e.g. --config-set timeouts.explicit_wait=5"
+    )
+
+def _cli_overrides(config):
+    """Collect config overrides given on the command line"""
+    overrides = {}
+    if config.getoption("--browser"):
+        overrides["browser.name"] = config.getoption("--browser")
+    if config.getoption("--headless"):
+        overrides["browser.headless"] = True
+    for item in config.getoption("--config-set"):
+        key, separator, value = item.partition("=")
+        if not separator:
+            raise pytest.UsageError(f"--config-set expects KEY=VALUE, got: {item}")
+        overrides[key.strip()] = parse_value(value)
+    return overrides
+
+def pytest_configure(config):
+    """Fix the run id and resolve the configuration before xdist workers start"""
+    get_run_id()
+    if hasattr(config, "workerinput"):
+        # Workers use the configuration resolved by the controller
+        Config.from_snapshot(config.workerinput["config_snapshot"])
+    else:
+        Config.configure(config.getoption("--test-env"), _cli_overrides(config))
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the resolved configuration to an xdist worker"""
+    node.workerinput["config_snapshot"] = Config().snapshot()
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    """Attach the artifacts of a test once its fixtures are torn down, the Allure result is still open"""
+    yield
+    artifact_writer.finish_test()
+
+def _xdist_workers_ran(config):
+    """Check if this is an xdist controller whose workers wrote their own logs"""
+    if hasattr(config, "workerinput") or not config.pluginmanager.hasplugin("xdist"):
+        return False
+    return bool(getattr(config.option, "numprocesses", None))
+
+def pytest_sessionfinish(session, exitstatus):
+    """Flush pending report artifacts, test data writes and logs before the session or worker shuts down"""
+    TestDataStore.commit_all()
+    artifact_writer.close()
+    artifact_writer.report_stats()
+    logger.stop()
+    if _xdist_workers_ran(session.config):
+        # Workers are done by now, the controller merges their logs
+        merge_worker_logs()
+
+@pytest.fixture(scope="session")
+def config():
+    """Framework configuration fixture, resolved once per process in pytest_configure"""
+    return Config()
+
+@pytest.fixture(scope="session")
+def test_data():
+    """Test data manager fixture, the data file is parsed once per process"""
+    return TestDataManager()
+
+def pytest_generate_tests(metafunc):
+    """Parametrize data_row with row numbers of the file named by @pytest.mark.data_source"""
+    marker = metafunc.definition.get_closest_marker("data_source")
+    if marker is None or "data_row" not in metafunc.fixturenames:
+        return
+    
+    config = Config()
+    source = DataSource.get(Path(config.data_dir) / marker.args[0])
+    # Configured sample and seed apply to every data driven test, sample 0 runs the whole file
+    sample = config.data_sample if config.data_sample is not None else marker.kwargs.get("sample")
+    seed = config.data_seed if config.data_seed is not None else marker.kwargs.get("seed", 0)
+    indices = source.select(sample=sample, seed=seed, shard=parse_shard(config.data_shard))
+    metafunc.parametrize("data_row", indices, ids=source.param_id, indirect=True)
+
+@pytest.fixture
+def data_row(request):
+    """Row of the test's data source, read when the test runs"""
+    marker = request.node.get_closest_marker("data_source")
+    source = DataSource.get(Path(Config().data_dir) / marker.args[0])
+    return source.row(request.param)
+
+@pytest.fixture(scope="session")
+def base_url(config):
+    """Base URL of the application, served by the local stub server when enabled"""
+    if not config.stub_server_enabled:
+        yield config.base_url
+        return
+    
+    server = StubServer.from_config(config).start()
+    yield server.base_url
+    server.stop()
+
+@pytest.fixture(scope="session", autouse=True)
+def artifact_settings(config):
+    """Apply screenshot and artifact settings from configuration"""
+    artifact_writer.configure(
+        queue_size=config.artifact_queue_size,
+        enabled=config.artifact_async_enabled
+    )
+    screenshot_buffer.configure(
+        size=config.screenshot_buffer_size,
+        on_failure=config.screenshot_on_failure,
+        on_success=config.screenshot_on_success,
+        image_format=config.screenshot_format,
+        quality=config.screenshot_quality
+    )
+
+@pytest.fixture(scope="function", autouse=True)
+def screenshot_frames(request):
+    """Buffer step screenshots and flush them to the report only if the test failed"""
+    screenshot_buffer.start(request.node.nodeid)
+    yield
+    screenshot_buffer.flush(failed=_test_failed(request.node))
+
+@pytest.fixture(scope="function", autouse=True)
+def time_budget(request, config):
+    """Per-test time budget, overridable with @pytest.mark.deadline(seconds)"""
+    marker = request.node.get_closest_marker("deadline")
+    budget = marker.args[0] if marker else config.test_budget
+    deadline = start_deadline(budget, config.explicit_wait, config.page_load_timeout, request.node.nodeid)
+    yield deadline
+    
+    if _test_failed(request.node) or deadline.exhausted_by:
+        summary = deadline.summary()
+        logger.warning("⏳ Deadline report for %s:\n%s", request.node.nodeid, summary)
+        artifact_writer.attach(summary, name="deadline_budget", attachment_type=allure.attachment_type.TEXT)
+    clear_deadline()
+
+@pytest.fixture(scope="session")
+def driver_pool(config):
+    """Per-worker pool of warm WebDriver instances"""
+    pool = DriverPool(
+        WebDriverFactory(config, prelaunch=config.driver_pool_prelaunch),
+        max_uses=config.driver_pool_max_uses if config.driver_pool_enabled else 1,
+        reset_url=config.driver_pool_reset_url
+    )
+    yield pool
+    pool.close()
+    pool.report_stats()
+    
+    if pool.factory.network_policy:
+        totals = pool.factory.network_policy.totals
+        logger.info(
+            "🚦 Network profile '%s': %d requests blocked, ~%d bytes saved",
+            pool.factory.network_policy.name, totals["blocked_requests"], totals["bytes_saved"]
+        )
+
+@pytest.fixture(scope="session")
+def tab_pool(config):
+    """Per-worker browser whose isolated tabs run flows from threads, for memory per concurrent test"""
+    pool = TabPool.from_factory(WebDriverFactory(config), max_tabs=config.max_tabs)
+    yield pool
+    pool.report_stats()
+    pool.close()
+
+@pytest.fixture(scope="session")
+def async_driver_service(config):
+    """Per-worker driver process that serves the async sessions"""
+    service = AsyncDriverService(config).start()
+    yield service
+    service.stop()
+
+@pytest_asyncio.fixture
+async def async_driver_factory(async_driver_service):
+    """Open async sessions on demand, all of them are quit after the test"""
+    sessions = []
+    
+    async def open_session():
+        session = await async_driver_service.new_session()
+        sessions.append(session)
+        return session
+    
+    yield open_session
+    
+    for session in sessions:
+        try:
+            await session.quit()
+        except Exception as e:
+            logger.warning("Async session quit failed: %s", e)
+
+@pytest.fixture(scope="function")
+def driver(request, config, driver_pool):
+    """WebDriver fixture served from the worker's driver pool, or a brand-new browser for @pytest.mark.fresh_browser"""
+    fresh = _needs_fresh_browser(request.node, config)
+    driver = driver_pool.factory.acquire_fresh(prelaunch_next=False) if fresh else driver_pool.acquire()
+    if _needs_fresh_browser(getattr(request.node, "next_item", None), config):
+        # A spare browser is only launched when the next test will take it
+        driver_pool.factory.prelaunch_next()
+    yield driver
+    
+    network_policy = driver_pool.factory.network_policy
+    if network_policy:
+        stats = network_policy.collect_stats(driver)
+        logger.debug(
+            "🚦 %s: %d requests blocked, ~%d bytes saved",
+            request.node.nodeid, stats["blocked_requests"], stats["bytes_saved"]
+        )
+        if stats["blocked_requests"]:
+            artifact_writer.attach(
+                json.dumps(stats, indent=4),
+                name="network_policy",
+                attachment_type=allure.attachment_type.JSON
+            )
+    
+    if fresh:
+        driver_pool.factory.quit_driver(driver)
+    else:
+        driver_pool.release(driver, failed=_test_failed(request.node))
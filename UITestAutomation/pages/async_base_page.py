@@ -0,0 +1,234 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException, TimeoutException, WebDriverException
+)
+from pages.page_core import (
+    DOCUMENT_STATE_SCRIPT, FIRST_MATCH_SCRIPT, NETWORK_IDLE_SCRIPT, READ_ELEMENTS_SCRIPT,
+    READY_STATE_SCRIPT, READY_STATES, PageCore
+)
+from utils.screenshot_buffer import screenshot_buffer
+from utils.timing import timed
+
+class AsyncBasePage(PageCore):
+    """Base page for page objects driven by an AsyncWebDriver session
+    
+    Mirrors BasePage with awaitable methods. Waits sleep on the event loop, so
+    one thread can drive many sessions at once. Allure steps are left to the
+    caller because their step stack is per thread, not per task.
+    """
+    
+    async def _until(self, condition, step, timeout=None, page_load=False, poll_frequency=0.5):
+        """Explicit wait limited by the remaining budget of the running test"""
+        with self._wait_limit(step, timeout, page_load) as limit:
+            return await self._poll(condition, limit, poll_frequency)
+    
+    async def _poll(self, condition, timeout, poll_frequency):
+        """Await condition until it returns a truthy value, like WebDriverWait.until"""
+        end = time.monotonic() + timeout
+        while True:
+            try:
+                value = await condition(self.driver)
+                if value:
+                    return value
+            except (NoSuchElementException, StaleElementReferenceException):
+                pass
+            if time.monotonic() >= end:
+                raise TimeoutException(f"Condition not met within {timeout:.1f}s")
+            await asyncio.sleep(poll_frequency)
+    
+    async def _attach_screenshot(self, name):
+        """Attach a screenshot of the failure to the report"""
+        self._attach_png(name, await self.driver.get_screenshot_as_base64())
+    
+    @timed("navigate")
+    async def open(self, url, timeout=None):
+        """Load a URL, limited by the remaining budget of the running test"""
+        with self._page_load_limit(url, timeout) as limit:
+            timeouts = await self.driver.get_timeouts()
+            if limit >= timeouts["pageLoad"]:
+                await self.driver.get(url)
+                return
+            
+            await self.driver.set_timeouts(timeouts["implicit"], page_load=limit)
+            try:
+                await self.driver.get(url)
+            finally:
+                await self.driver.set_timeouts(timeouts["implicit"], page_load=timeouts["pageLoad"])
+    
+    @timed("find")
+    async def find_element(self, locator, timeout=None):
+        """Find element with explicit wait"""
+        async def present(driver):
+            return await driver.find_element(*locator)
+        
+        try:
+            return await self._until(present, f"find_element {locator[1]}", timeout)
+        except TimeoutException:
+            await self._attach_screenshot(f"element_not_found_{locator[1]}")
+            raise
+    
+    @timed("find")
+    async def find_elements(self, locator, timeout=None):
+        """Find elements with explicit wait"""
+        async def present(driver):
+            return await driver.find_elements(*locator)
+        
+        try:
+            return await self._until(present, f"find_elements {locator[1]}", timeout)
+        except TimeoutException:
+            await self._attach_screenshot(f"elements_not_found_{locator[1]}")
+            raise
+    
+    @timed("click")
+    async def click(self, locator, timeout=None):
+        """Click element with explicit wait"""
+        element = await self.find_element(locator, timeout)
+        try:
+            await element.click()
+        except Exception:
+            await self._attach_screenshot(f"click_failed_{locator[1]}")
+            raise
+    
+    @timed("send_keys")
+    async def send_keys(self, locator, text, timeout=None):
+        """Send keys to element with explicit wait"""
+        element = await self.find_element(locator, timeout)
+        try:
+            await element.clear()
+            await element.send_keys(text)
+        except Exception:
+            await self._attach_screenshot(f"send_keys_failed_{locator[1]}")
+            raise
+    
+    @timed("get_text")
+    async def get_text(self, locator, timeout=None):
+        """Get text from element with explicit wait"""
+        element = await self.find_element(locator, timeout)
+        return await element.get_text()
+    
+    @timed("find")
+    async def find_first_matching(self, group, timeout=None):
+        """Resolve an ordered group of fallback locators in one script call per poll"""
+        order, candidates = self._fallback_candidates(group)
+        
+        async def first_match(driver):
+            return await driver.execute_script(FIRST_MATCH_SCRIPT, candidates)
+        
+        try:
+            match = await self._until(first_match, f"find_first_matching {group}", timeout, poll_frequency=0.25)
+        except TimeoutException:
+            return None, 0
+        return self._fallback_match(group, order, match)
+    
+    @timed("read")
+    async def read_elements(self, reads, wait_for=None, timeout=None):
+        """Read fields of many elements with a single script execution"""
+        # wait_for is a locator that must be present first, so reads do not race rendering
+        requests = self._read_requests(reads)
+        if wait_for is not None:
+            async def present(driver):
+                return await driver.find_element(*wait_for)
+            
+            await self._until(present, f"read_elements {wait_for[1]}", timeout)
+        return await self.driver.execute_script(READ_ELEMENTS_SCRIPT, requests)
+    
+    async def is_element_present(self, locator, timeout=None):
+        """Check if element is present"""
+        try:
+            await self.find_element(locator, timeout)
+            return True
+        except TimeoutException:
+            return False
+    
+    @timed("wait")
+    async def is_element_visible(self, locator, timeout=None):
+        """Check if element is visible"""
+        async def visible(driver):
+            return await (await driver.find_element(*locator)).is_displayed()
+        
+        try:
+            await self._until(visible, f"is_element_visible {locator[1]}", timeout)
+            return True
+        except TimeoutException:
+            return False
+    
+    @timed("wait")
+    async def wait_for_page_load(self, timeout=None):
+        """Wait for page to load completely"""
+        async def loaded(driver):
+            return await driver.execute_script(READY_STATE_SCRIPT) == "complete"
+        
+        try:
+            await self._until(loaded, "wait_for_page_load", timeout, page_load=True)
+        except TimeoutException:
+            await self._attach_screenshot("page_load_timeout")
+            raise
+    
+    @timed("wait")
+    async def wait_until_ready(self, readiness=None, timeout=None):
+        """Wait until the page satisfies its declared readiness condition"""
+        kind, argument, step = self._readiness(readiness)
+        if kind == "ready_state":
+            async def condition(driver):
+                return READY_STATES.index(await driver.execute_script(READY_STATE_SCRIPT)) >= argument
+        elif kind == "network_idle":
+            idle = self._network_idle_check(argument)
+            
+            async def condition(driver):
+                return idle(await driver.execute_script(NETWORK_IDLE_SCRIPT))
+        else:
+            async def condition(driver):
+                element = await driver.find_element(*argument)
+                return await element.is_displayed() and await element.is_enabled()
+        
+        try:
+            await self._until(condition, step, timeout, page_load=True, poll_frequency=0.05)
+        except TimeoutException:
+            await self._attach_screenshot("page_not_ready")
+            raise
+    
+    async def capture_navigation_marker(self):
+        """Capture a marker of the current document to detect a later navigation"""
+        time_origin, url = await self.driver.execute_script("return [performance.timeOrigin, location.href];")
+        return {"time_origin": time_origin, "url": url}
+    
+    @timed("wait")
+    async def wait_for_navigation(self, marker, ready_state="complete", timeout=None):
+        """Wait until a new document replaced the marked one and reached the ready state"""
+        check = self._navigation_check(marker, ready_state)
+        
+        async def navigated(driver):
+            try:
+                return check(await driver.execute_script(DOCUMENT_STATE_SCRIPT))
+            except WebDriverException:
+                # Script can fail while the old document is being torn down
+                return False
+        
+        try:
+            await self._until(navigated, "wait_for_navigation", timeout, page_load=True, poll_frequency=0.05)
+        except TimeoutException:
+            await self._attach_screenshot("navigation_timeout")
+            raise
+    
+    @asynccontextmanager
+    async def expect_navigation(self, ready_state="complete", timeout=None):
+        """Async context manager that waits for the navigation triggered inside the block"""
+        marker = await self.capture_navigation_marker()
+        yield marker
+        await self.wait_for_navigation(marker, ready_state, timeout)
+    
+    @timed("screenshot")
+    async def take_screenshot(self, name="screenshot"):
+        """Take step screenshot, attached now or buffered until the test fails"""
+        if screenshot_buffer.enabled:
+            screenshot_buffer.add(name, await self.driver.get_screenshot_as_base64())
+    
+    async def get_current_url(self):
+        """Get current URL"""
+        return await self.driver.get_current_url()
+    
+    async def get_page_title(self):
+        """Get page title"""
+        return await self.driver.get_title()
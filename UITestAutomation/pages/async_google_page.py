@@ -0,0 +1,80 @@
+from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException
+from pages.async_base_page import AsyncBasePage
+from pages.google_page import GoogleLocators
+from utils.timing import timed
+from urllib.parse import urlparse
+
+class AsyncGooglePage(GoogleLocators, AsyncBasePage):
+    """Async Page Object for Google Search Page"""
+    
+    def __init__(self, driver, base_url="https://www.google.com"):
+        super().__init__(driver)
+        self.url = base_url
+    
+    @timed("navigate")
+    async def navigate_to(self):
+        """Navigate to Google homepage"""
+        await self.open(self.url)
+        await self.wait_until_ready()
+        await self.take_screenshot("google_homepage")
+    
+    async def search(self, query):
+        """Perform a search with the given query"""
+        await self.send_keys(self.SEARCH_BOX, query)
+        await self.take_screenshot("search_entered")
+    
+    async def submit_search(self):
+        """Submit the search by pressing Enter"""
+        # Google does not navigate when the query is empty
+        if (await self.get_search_box_value()).strip():
+            async with self.expect_navigation("interactive"):
+                await (await self.find_element(self.SEARCH_BOX)).send_keys(Keys.RETURN)
+        else:
+            await (await self.find_element(self.SEARCH_BOX)).send_keys(Keys.RETURN)
+            await self.wait_for_page_load()
+        await self.take_screenshot("search_results")
+    
+    async def search_and_submit(self, query):
+        """Search and submit in one action"""
+        await self.search(query)
+        # Try clicking search button first, then fallback to Enter key
+        try:
+            await self.click_search_button()
+        except Exception:
+            await self.submit_search()
+    
+    async def click_search_button(self):
+        """Click the search button"""
+        async with self.expect_navigation("interactive"):
+            await self.click(self.SEARCH_BUTTON)
+        await self.take_screenshot("search_results")
+    
+    async def get_search_results_count(self):
+        """Get the number of search results"""
+        _, count = await self.find_first_matching("SEARCH_RESULT_LOCATORS")
+        return count
+    
+    async def get_result_titles(self):
+        """Get the titles of all search results"""
+        try:
+            titles, = await self.read_elements([(self.RESULT_TITLES, "all_text")], wait_for=self.RESULT_TITLES)
+        except TimeoutException:
+            return []
+        return titles
+    
+    async def is_search_results_page(self):
+        """Check if we're on search results page"""
+        current_url = (await self.get_current_url()).lower()
+        return "search" in current_url or "q=" in current_url
+    
+    async def is_google_homepage(self):
+        """Check if we're on Google homepage"""
+        current_url = await self.get_current_url()
+        host = urlparse(self.url).hostname.replace("www.", "")
+        return host in current_url and "search" not in current_url.lower()
+    
+    async def get_search_box_value(self):
+        """Get the current value in search box"""
+        value, = await self.read_elements([(self.SEARCH_BOX, "value")], wait_for=self.SEARCH_BOX)
+        return value or ""
@@ -1,78 +1,117 @@
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import allure
-import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from contextlib import contextmanager
+from pages.page_core import (
+    DOCUMENT_STATE_SCRIPT, FIRST_MATCH_SCRIPT, NETWORK_IDLE_SCRIPT, READ_ELEMENTS_SCRIPT,
+    READY_STATE_SCRIPT, READY_STATES, PageCore
+)
+from utils.screenshot_buffer import screenshot_buffer
+from utils.timing import timed
 
-class BasePage:
+class BasePage(PageCore):
     """Base page class that all page objects inherit from"""
     
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
         self.wait = WebDriverWait(driver, 10)
     
-    def find_element(self, locator, timeout=10):
+    def _until(self, condition, step, timeout=None, page_load=False, poll_frequency=0.5):
+        """Explicit wait limited by the remaining budget of the running test"""
+        with self._wait_limit(step, timeout, page_load) as limit:
+            return WebDriverWait(self.driver, limit, poll_frequency=poll_frequency).until(condition)
+    
+    def _attach_screenshot(self, name):
+        """Attach a screenshot of the failure to the report"""
+        self._attach_png(name, self.driver.get_screenshot_as_base64())
+    
+    @timed("navigate")
+    def open(self, url, timeout=None):
+        """Load a URL, limited by the remaining budget of the running test"""
+        with self._page_load_limit(url, timeout) as limit:
+            page_load = self.driver.timeouts.page_load
+            if limit >= page_load:
+                self.driver.get(url)
+                return
+            
+            self.driver.set_page_load_timeout(limit)
+            try:
+                self.driver.get(url)
+            finally:
+                self.driver.set_page_load_timeout(page_load)
+    
+    @timed("find")
+    def find_element(self, locator, timeout=None):
         """Find element with explicit wait"""
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(locator)
+            return self._until(
+                EC.presence_of_element_located(locator), f"find_element {locator[1]}", timeout
             )
         except TimeoutException:
-            allure.attach(
-                self.driver.get_screenshot_as_png(),
-                name=f"element_not_found_{locator[1]}",
-                attachment_type=allure.attachment_type.PNG
-            )
+            self._attach_screenshot(f"element_not_found_{locator[1]}")
             raise
     
-    def find_elements(self, locator, timeout=10):
+    @timed("find")
+    def find_elements(self, locator, timeout=None):
         """Find elements with explicit wait"""
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_all_elements_located(locator)
+            return self._until(
+                EC.presence_of_all_elements_located(locator), f"find_elements {locator[1]}", timeout
             )
         except TimeoutException:
-            allure.attach(
-                self.driver.get_screenshot_as_png(),
-                name=f"elements_not_found_{locator[1]}",
-                attachment_type=allure.attachment_type.PNG
-            )
+            self._attach_screenshot(f"elements_not_found_{locator[1]}")
             raise
     
-    def click(self, locator, timeout=10):
+    @timed("click")
+    def click(self, locator, timeout=None):
         """Click element with explicit wait"""
         element = self.find_element(locator, timeout)
         try:
             element.click()
         except Exception as e:
-            allure.attach(
-                self.driver.get_screenshot_as_png(),
-                name=f"click_failed_{locator[1]}",
-                attachment_type=allure.attachment_type.PNG
-            )
+            self._attach_screenshot(f"click_failed_{locator[1]}")
             raise
     
-    def send_keys(self, locator, text, timeout=10):
+    @timed("send_keys")
+    def send_keys(self, locator, text, timeout=None):
         """Send keys to element with explicit wait"""
         element = self.find_element(locator, timeout)
         try:
             element.clear()
             element.send_keys(text)
         except Exception as e:
-            allure.attach(
-                self.driver.get_screenshot_as_png(),
-                name=f"send_keys_failed_{locator[1]}",
-                attachment_type=allure.attachment_type.PNG
-            )
+            self._attach_screenshot(f"send_keys_failed_{locator[1]}")
             raise
     
-    def get_text(self, locator, timeout=10):
+    @timed("get_text")
+    def get_text(self, locator, timeout=None):
         """Get text from element with explicit wait"""
         element = self.find_element(locator, timeout)
         return element.text
     
-    def is_element_present(self, locator, timeout=10):
+    @timed("find")
+    def find_first_matching(self, group, timeout=None):
+        """Resolve an ordered group of fallback locators in one script call per poll"""
+        order, candidates = self._fallback_candidates(group)
+        try:
+            match = self._until(
+                lambda driver: driver.execute_script(FIRST_MATCH_SCRIPT, candidates),
+                f"find_first_matching {group}", timeout, poll_frequency=0.25
+            )
+        except TimeoutException:
+            return None, 0
+        return self._fallback_match(group, order, match)
+    
+    @timed("read")
+    def read_elements(self, reads, wait_for=None, timeout=None):
+        """Read fields of many elements with a single script execution"""
+        # wait_for is a locator that must be present first, so reads do not race rendering
+        requests = self._read_requests(reads)
+        if wait_for is not None:
+            self._until(EC.presence_of_element_located(wait_for), f"read_elements {wait_for[1]}", timeout)
+        return self.driver.execute_script(READ_ELEMENTS_SCRIPT, requests)
+    
+    def is_element_present(self, locator, timeout=None):
         """Check if element is present"""
         try:
             self.find_element(locator, timeout)
@@ -80,43 +119,98 @@ class BasePage:
         except TimeoutException:
             return False
     
-    def is_element_visible(self, locator, timeout=10):
+    @timed("wait")
+    def is_element_visible(self, locator, timeout=None):
         """Check if element is visible"""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(locator)
-            )
+            self._until(EC.visibility_of_element_located(locator), f"is_element_visible {locator[1]}", timeout)
             return True
         except TimeoutException:
             return False
     
-    def wait_for_page_load(self, timeout=30):
+    @timed("wait")
+    def wait_for_page_load(self, timeout=None):
         """Wait for page to load completely"""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            self._until(
+                lambda driver: driver.execute_script(READY_STATE_SCRIPT) == "complete",
+                "wait_for_page_load", timeout, page_load=True
             )
         except TimeoutException:
-            allure.attach(
-                self.driver.get_screenshot_as_png(),
-                name="page_load_timeout",
-                attachment_type=allure.attachment_type.PNG
-            )
+            self._attach_screenshot("page_load_timeout")
             raise
     
-    def take_screenshot(self, name="screenshot"):
-        """Take screenshot and attach to Allure report"""
-        allure.attach(
-            self.driver.get_screenshot_as_png(),
-            name=name,
-            attachment_type=allure.attachment_type.PNG
+    @timed("wait")
+    def wait_until_ready(self, readiness=None, timeout=None):
+        """Wait until the page satisfies its declared readiness condition"""
+        kind, argument, step = self._readiness(readiness)
+        if kind == "ready_state":
+            condition = lambda driver: READY_STATES.index(driver.execute_script(READY_STATE_SCRIPT)) >= argument
+        elif kind == "network_idle":
+            idle = self._network_idle_check(argument)
+            condition = lambda driver: idle(driver.execute_script(NETWORK_IDLE_SCRIPT))
+        else:
+            condition = EC.element_to_be_clickable(argument)
+        
+        try:
+            self._until(condition, step, timeout, page_load=True, poll_frequency=0.05)
+        except TimeoutException:
+            self._attach_screenshot("page_not_ready")
+            raise
+    
+    def capture_navigation_marker(self):
+        """Capture a marker of the current document to detect a later navigation"""
+        html, time_origin, url = self.driver.execute_script(
+            "return [document.documentElement, performance.timeOrigin, location.href];"
         )
+        return {"html": html, "time_origin": time_origin, "url": url}
     
+    @timed("wait")
+    def wait_for_navigation(self, marker, ready_state="complete", timeout=None):
+        """Wait until a new document replaced the marked one and reached the ready state"""
+        check = self._navigation_check(marker, ready_state)
+        
+        def navigated(driver):
+            try:
+                return check(driver.execute_script(DOCUMENT_STATE_SCRIPT))
+            except WebDriverException:
+                # Script can fail while the old document is being torn down
+                return False
+        
+        try:
+            self._until(navigated, "wait_for_navigation", timeout, page_load=True, poll_frequency=0.05)
+        except TimeoutException:
+            self._attach_screenshot("navigation_timeout")
+            raise
+    
+    @contextmanager
+    def expect_navigation(self, ready_state="complete", timeout=None):
+        """Context manager that waits for the navigation triggered inside the block"""
+        marker = self.capture_navigation_marker()
+        yield marker
+        self.wait_for_navigation(marker, ready_state, timeout)
+    
+    @timed("screenshot")
+    def take_screenshot(self, name="screenshot"):
+        """Take step screenshot, attached now or buffered until the test fails"""
+        screenshot_buffer.capture(self.driver, name)
+    
+    @timed("scroll")
     def scroll_to_element(self, locator):
         """Scroll to element"""
         element = self.find_element(locator)
         self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-        time.sleep(0.5)  # Small delay for smooth scrolling
+        
+        # Wait until the element is actually inside the viewport
+        self._until(
+            lambda driver: driver.execute_script(
+                "const r = arguments[0].getBoundingClientRect();"
+                "return r.bottom > 0 && r.right > 0 && "
+                "r.top < window.innerHeight && r.left < window.innerWidth;",
+                element
+            ),
+            f"scroll_to_element {locator[1]}", poll_frequency=0.05
+        )
     
     def get_current_url(self):
         """Get current URL"""
@@ -1,11 +1,13 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException
 from pages.base_page import BasePage
+from utils.timing import timed
+from urllib.parse import urlparse
 import allure
-import time
 
-class GooglePage(BasePage):
-    """Page Object for Google Search Page"""
+class GoogleLocators:
+    """Locators of the Google search pages, shared by the sync and async page objects"""
     
     # Locators
     SEARCH_BOX = (By.NAME, "q")
@@ -14,16 +16,34 @@ class GooglePage(BasePage):
     GOOGLE_LOGO = (By.ID, "hplogo")
     SEARCH_RESULTS = (By.ID, "search")
     FIRST_RESULT = (By.CSS_SELECTOR, "#search .g:first-child h3")
+    RESULT_TITLES = (By.CSS_SELECTOR, "#search .g h3")
+    
+    # Fallback locators for search results, most specific first
+    SEARCH_RESULT_LOCATORS = [
+        (By.CSS_SELECTOR, "#search .g"),
+        (By.CSS_SELECTOR, "#search .rc"),
+        (By.CSS_SELECTOR, ".g"),
+        (By.CSS_SELECTOR, ".rc"),
+        (By.CSS_SELECTOR, "[data-sokoban-container] .g"),
+        (By.CSS_SELECTOR, ".MjjYud")
+    ]
+    
+    # The homepage is usable as soon as the search box accepts input
+    READINESS = SEARCH_BOX
+
+class GooglePage(GoogleLocators, BasePage):
+    """Page Object for Google Search Page"""
     
-    def __init__(self, driver):
+    def __init__(self, driver, base_url="https://www.google.com"):
         super().__init__(driver)
-        self.url = "https://www.google.com"
+        self.url = base_url
     
+    @timed("navigate")
     def navigate_to(self):
         """Navigate to Google homepage"""
         with allure.step("Navigate to Google homepage"):
-            self.driver.get(self.url)
-            self.wait_for_page_load()
+            self.open(self.url)
+            self.wait_until_ready()
             self.take_screenshot("google_homepage")
     
     def search(self, query):
@@ -35,9 +55,13 @@ class GooglePage(BasePage):
     def submit_search(self):
         """Submit the search by pressing Enter"""
         with allure.step("Submit search"):
-            self.send_keys(self.SEARCH_BOX, Keys.RETURN)
-            time.sleep(2)  # Wait for page to load
-            self.wait_for_page_load()
+            # Google does not navigate when the query is empty
+            if self.get_search_box_value().strip():
+                with self.expect_navigation("interactive"):
+                    self.find_element(self.SEARCH_BOX).send_keys(Keys.RETURN)
+            else:
+                self.find_element(self.SEARCH_BOX).send_keys(Keys.RETURN)
+                self.wait_for_page_load()
             self.take_screenshot("search_results")
     
     def search_and_submit(self, query):
@@ -52,55 +76,43 @@ class GooglePage(BasePage):
     def click_search_button(self):
         """Click the search button"""
         with allure.step("Click search button"):
-            self.click(self.SEARCH_BUTTON)
-            time.sleep(2)  # Wait for page to load
-            self.wait_for_page_load()
+            with self.expect_navigation("interactive"):
+                self.click(self.SEARCH_BUTTON)
             self.take_screenshot("search_results")
     
     def click_feeling_lucky(self):
         """Click the 'I'm Feeling Lucky' button"""
         with allure.step("Click 'I'm Feeling Lucky' button"):
-            self.click(self.FEELING_LUCKY_BUTTON)
-            self.wait_for_page_load()
+            with self.expect_navigation():
+                self.click(self.FEELING_LUCKY_BUTTON)
             self.take_screenshot("feeling_lucky_result")
     
     def get_search_results_count(self):
         """Get the number of search results"""
+        _, count = self.find_first_matching("SEARCH_RESULT_LOCATORS")
+        return count
+    
+    def get_result_titles(self):
+        """Get the titles of all search results"""
         try:
-            # Try different selectors for search results
-            selectors = [
-                "#search .g",
-                "#search .rc",
-                ".g",
-                ".rc",
-                "[data-sokoban-container] .g",
-                ".MjjYud"
-            ]
-            
-            for selector in selectors:
-                try:
-                    results = self.find_elements((By.CSS_SELECTOR, selector))
-                    if results:
-                        return len(results)
-                except:
-                    continue
-            
-            return 0
-        except:
-            return 0
+            titles, = self.read_elements([(self.RESULT_TITLES, "all_text")], wait_for=self.RESULT_TITLES)
+        except TimeoutException:
+            return []
+        return titles
     
     def get_first_result_title(self):
         """Get the title of the first search result"""
         try:
-            return self.get_text(self.FIRST_RESULT)
-        except:
+            title, = self.read_elements([(self.FIRST_RESULT, "text")], wait_for=self.FIRST_RESULT)
+        except TimeoutException:
             return None
+        return title
     
     def click_first_result(self):
         """Click on the first search result"""
         with allure.step("Click first search result"):
-            self.click(self.FIRST_RESULT)
-            self.wait_for_page_load()
+            with self.expect_navigation():
+                self.click(self.FIRST_RESULT)
             self.take_screenshot("first_result_clicked")
     
     def is_search_results_page(self):
@@ -110,7 +122,9 @@ class GooglePage(BasePage):
     
     def is_google_homepage(self):
         """Check if we're on Google homepage"""
-        return "google.com" in self.get_current_url() and "search" not in self.get_current_url().lower()
+        current_url = self.get_current_url()
+        host = urlparse(self.url).hostname.replace("www.", "")
+        return host in current_url and "search" not in current_url.lower()
     
     def clear_search_box(self):
         """Clear the search box"""
@@ -120,5 +134,14 @@ class GooglePage(BasePage):
     
     def get_search_box_value(self):
         """Get the current value in search box"""
-        element = self.find_element(self.SEARCH_BOX)
-        return element.get_attribute("value")
+        value, = self.read_elements([(self.SEARCH_BOX, "value")], wait_for=self.SEARCH_BOX)
+        return value or ""
+    
+    def get_search_state(self):
+        """Read search box value and visibility plus result titles in one round trip"""
+        value, visible, titles = self.read_elements([
+            (self.SEARCH_BOX, "value"),
+            (self.SEARCH_BOX, "visible"),
+            (self.RESULT_TITLES, "all_text")
+        ], wait_for=self.SEARCH_BOX)
+        return {"search_box_value": value or "", "search_box_visible": visible, "result_titles": titles}
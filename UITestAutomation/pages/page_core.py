@@ -0,0 +1,220 @@
+from contextlib import contextmanager
+from selenium.common.exceptions import TimeoutException
+from utils.artifact_writer import artifact_writer
+from utils.deadline import current_deadline
+from utils.locators import to_script_locator
+import allure
+
+READY_STATES = ("loading", "interactive", "complete")
+
+READY_STATE_SCRIPT = "return document.readyState"
+
+# Changes when a new document replaces the current one
+DOCUMENT_STATE_SCRIPT = "return [performance.timeOrigin, document.readyState];"
+
+# Milliseconds since the last resource finished loading, plus the resource count
+NETWORK_IDLE_SCRIPT = """
+const entries = performance.getEntriesByType("resource");
+let lastEnd = 0;
+for (const entry of entries) {
+    lastEnd = Math.max(lastEnd, entry.responseEnd);
+}
+return [entries.length, performance.now() - lastEnd, document.readyState];
+"""
+
+def network_idle(idle_ms=500):
+    """Readiness condition: no resource finished loading for the given time"""
+    return ("network_idle", idle_ms)
+
+# Used when no test deadline is active
+DEFAULT_EXPLICIT_WAIT = 10
+DEFAULT_PAGE_LOAD_TIMEOUT = 30
+
+# Counts matches of each [kind, selector] pair in order, stops at the first hit
+FIRST_MATCH_SCRIPT = """
+const candidates = arguments[0];
+for (let i = 0; i < candidates.length; i++) {
+    const [kind, selector] = candidates[i];
+    let count = 0;
+    try {
+        if (kind === "xpath") {
+            count = document.evaluate(selector, document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+        } else {
+            count = document.querySelectorAll(selector).length;
+        }
+    } catch (e) {
+        count = 0;
+    }
+    if (count > 0) {
+        return [i, count];
+    }
+}
+return null;
+"""
+
+# Reads the requested field of each [kind, selector, field, name] entry
+READ_ELEMENTS_SCRIPT = """
+function query(kind, selector) {
+    if (kind === "xpath") {
+        const result = document.evaluate(selector, document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < result.snapshotLength; i++) {
+            nodes.push(result.snapshotItem(i));
+        }
+        return nodes;
+    }
+    return Array.from(document.querySelectorAll(selector));
+}
+function visible(el) {
+    const style = window.getComputedStyle(el);
+    const rect = el.getBoundingClientRect();
+    return style.visibility !== "hidden" && style.display !== "none" &&
+        rect.width > 0 && rect.height > 0;
+}
+function read(el, field, name) {
+    switch (field) {
+        case "text": return el.innerText;
+        case "value": return el.value;
+        case "attribute": return el.getAttribute(name);
+        case "visible": return visible(el);
+        case "rect": {
+            const r = el.getBoundingClientRect();
+            return {x: r.x, y: r.y, width: r.width, height: r.height};
+        }
+    }
+    return null;
+}
+return arguments[0].map(([kind, selector, field, name, all]) => {
+    let nodes = [];
+    try {
+        nodes = query(kind, selector);
+    } catch (e) {
+        nodes = [];
+    }
+    if (all) {
+        return nodes.map(el => read(el, field, name));
+    }
+    if (nodes.length === 0) {
+        return field === "visible" ? false : null;
+    }
+    return read(nodes[0], field, name);
+});
+"""
+
+READ_FIELDS = ("text", "value", "attribute", "visible", "rect")
+
+class PageCore:
+    """What BasePage and AsyncBasePage share: locators, reads, readiness and wait budgets
+    
+    Nothing here talks to the driver. The subclasses run the scripts and
+    conditions, blocking or awaited, and feed the results back in.
+    """
+    
+    # Index of the fallback locator that matched last time, per page class and group
+    _fallback_winners = {}
+    
+    # Cheapest readiness condition the page needs: a document ready state,
+    # a locator that must be interactable or network_idle(ms)
+    READINESS = "complete"
+    
+    def __init__(self, driver):
+        self.driver = driver
+    
+    @contextmanager
+    def _wait_limit(self, step, timeout=None, page_load=False):
+        """Timeout of a wait, limited by the remaining budget of the running test"""
+        deadline = current_deadline()
+        if deadline is None:
+            if timeout is None:
+                timeout = DEFAULT_PAGE_LOAD_TIMEOUT if page_load else DEFAULT_EXPLICIT_WAIT
+            yield timeout
+            return
+        
+        with deadline.step(f"{type(self).__name__}.{step}"):
+            yield deadline.timeout(timeout, page_load)
+    
+    @contextmanager
+    def _page_load_limit(self, url, timeout=None):
+        """Page load timeout of a navigation, failing at once when the test has no budget left"""
+        with self._wait_limit(f"open {url}", timeout, page_load=True) as limit:
+            if limit <= 0:
+                raise TimeoutException(f"No time left to load {url}")
+            yield limit
+    
+    @staticmethod
+    def _attach_png(name, screenshot):
+        """Attach a base64 screenshot of a failure to the report"""
+        artifact_writer.attach(
+            screenshot,
+            name=name,
+            attachment_type=allure.attachment_type.PNG,
+            encoding="base64"
+        )
+    
+    def _fallback_candidates(self, group):
+        """Try order of a fallback locator group, the last winner first, and its script locators"""
+        locators = getattr(self, group)
+        order = list(range(len(locators)))
+        winner = self._fallback_winners.get((type(self).__name__, group))
+        if winner is not None:
+            order.remove(winner)
+            order.insert(0, winner)
+        return order, [to_script_locator(locators[i]) for i in order]
+    
+    def _fallback_match(self, group, order, match):
+        """Locator and match count of a FIRST_MATCH_SCRIPT result, remembered as the next winner"""
+        position, count = match
+        self._fallback_winners[(type(self).__name__, group)] = order[position]
+        return getattr(self, group)[order[position]], count
+    
+    @staticmethod
+    def _read_requests(reads):
+        """READ_ELEMENTS_SCRIPT arguments of (locator, field) or (locator, field, attribute_name) reads"""
+        # A field prefixed with "all_" returns a list with a value per matching element
+        requests = []
+        for read in reads:
+            locator, field = read[0], read[1]
+            name = read[2] if len(read) > 2 else None
+            read_all = field.startswith("all_")
+            field = field[4:] if read_all else field
+            if field not in READ_FIELDS:
+                raise ValueError(f"Unsupported field: {field}")
+            requests.append(to_script_locator(locator) + [field, name, read_all])
+        return requests
+    
+    def _readiness(self, readiness=None):
+        """Kind, argument and step name of a readiness condition, the page's own by default"""
+        readiness = readiness or self.READINESS
+        if readiness in READY_STATES:
+            return "ready_state", READY_STATES.index(readiness), f"wait_until_ready {readiness}"
+        if readiness[0] == "network_idle":
+            return "network_idle", readiness[1], f"wait_until_ready network_idle {readiness[1]}ms"
+        return "locator", readiness, f"wait_until_ready {readiness[1]}"
+    
+    @staticmethod
+    def _network_idle_check(idle_ms):
+        """Check of NETWORK_IDLE_SCRIPT results that holds once no new resource finished for idle_ms"""
+        last_count = [-1]
+        
+        def idle(result):
+            count, since_last_ms, state = result
+            settled = count == last_count[0]
+            last_count[0] = count
+            return settled and state != "loading" and since_last_ms >= idle_ms
+        
+        return idle
+    
+    @staticmethod
+    def _navigation_check(marker, ready_state):
+        """Check of DOCUMENT_STATE_SCRIPT results that holds once a new document reached the ready state"""
+        wanted = READY_STATES.index(ready_state)
+        
+        def navigated(result):
+            time_origin, state = result
+            if time_origin == marker["time_origin"]:
+                return False
+            return READY_STATES.index(state) >= wanted
+        
+        return navigated
@@ -4,11 +4,17 @@ Test Runner with Dated Reporting
 """
 import os
 import sys
-import subprocess
 import argparse
+import json
+import time
 from utils.report_utils import create_dated_report_path, get_report_metadata
+from utils.test_scheduler import DurationHistory, actual_makespan
+from utils.run_stream import stream_pytest
+from utils.run_index import RunIndex
+from utils.test_impact import select_tests
 
-def run_tests_with_dated_reports(markers=None, parallel=False, browser="chrome"):
+def run_tests_with_dated_reports(markers=None, parallel=False, browser="chrome", max_failures=None,
+                                 changed_since=None, record_impact=False, html_report=False):
     """Run tests with dated report folders"""
     
     # Create dated report path
@@ -23,58 +29,113 @@ def run_tests_with_dated_reports(markers=None, parallel=False, browser="chrome")
     print(f"🏷️  Markers: {markers or 'All tests'}")
     print("-" * 50)
     
-    # Build pytest command
-    cmd = ["pytest"]
+    # Build pytest command, the live progress parses the -v result lines
+    cmd = ["pytest", "-v"]
     
     # Add markers if specified
     if markers:
         cmd.extend(["-m", markers])
     
-    # Add parallel execution
+    # Add parallel execution, longest tests first in bins of tests sharing driver requirements
     if parallel:
-        cmd.extend(["-n", "auto"])
+        cmd.extend(["-n", "auto", "--dist", "loadgroup", "--schedule-by-duration"])
     
-    # Add HTML report
-    html_report_path = os.path.join(report_path, "report.html")
-    cmd.extend(["--html", html_report_path, "--self-contained-html"])
+    # Results stream into results.jsonl with an index.html viewer, pytest-html only on request
+    results_viewer_path = os.path.join(report_path, "index.html")
+    if html_report:
+        cmd.extend(["--html", os.path.join(report_path, "report.html")])
     
     # Add Allure report
     allure_results_path = os.path.join(report_path, "allure-results")
     cmd.extend(["--alluredir", allure_results_path])
     
+    # Record which code every test runs, or run only the tests affected by the changes
+    if record_impact:
+        cmd.append("--record-impact")
+    selection = None
+    if changed_since:
+        selection = select_tests(changed_since)
+        if selection["full_suite"]:
+            print(f"🎯 Running the full suite: {selection['reason']}")
+        else:
+            print(f"🎯 Changes since {changed_since}: {selection['reason']}")
+            selection_file = os.path.join(report_path, "impact_selection.json")
+            with open(selection_file, "w", encoding="utf-8") as f:
+                json.dump(selection, f, indent=4)
+            cmd.extend(["--impact-selection", selection_file])
+    
     # Add metadata to environment
     env = os.environ.copy()
-    env["TEST_ENV"] = "local"
+    env["TEST_ENV"] = os.getenv("TEST_ENV", "local")
     env["BROWSER"] = browser
     env["REPORT_PATH"] = report_path
     
     try:
-        # Run tests
-        result = subprocess.run(cmd, env=env, capture_output=True, text=True)
-        
-        # Print output
-        print(result.stdout)
-        if result.stderr:
-            print("Warnings/Errors:")
-            print(result.stderr)
+        # Run tests, output is streamed to the console and to pytest_output.log
+        start = time.perf_counter()
+        returncode, events = stream_pytest(
+            cmd, env=env, log_file=os.path.join(report_path, "pytest_output.log"), max_failures=max_failures
+        )
+        wall_time = time.perf_counter() - start
+        run_summary = events.summary()
+        if selection and not selection["full_suite"] and returncode == 5:
+            # Nothing affected by the changes is not a failure
+            print("🎯 No tests affected by the changes")
+            returncode = 0
         
         # Print summary
         print("-" * 50)
-        print(f"✅ Test execution completed!")
-        print(f"📊 HTML Report: {html_report_path}")
+        if run_summary["aborted"]:
+            print(f"🛑 Test execution stopped early: {run_summary['aborted']}")
+        else:
+            print(f"✅ Test execution completed!")
+        for nodeid in run_summary["failures"]:
+            print(f"❌ {nodeid}")
+        print(f"📊 Results: {results_viewer_path} (python -m http.server -d {report_path})")
         print(f"📈 Allure Results: {allure_results_path}")
         print(f"🔗 View Allure Report: allure serve {allure_results_path}")
         
+        # Compare the schedule with what happened and remember the durations
+        schedule_summary = summarize_schedule(report_path, wall_time)
+        history = DurationHistory.load()
+        history.add_report(report_path)
+        history.save()
+        
         # Create summary file
-        create_summary_file(report_path, metadata, result.returncode)
+        create_summary_file(report_path, metadata, returncode, schedule_summary, run_summary, selection)
         
-        return result.returncode
+        # Add the finished run to the trend database
+        index = RunIndex()
+        try:
+            added = index.ingest()
+        finally:
+            index.close()
+        print(f"🗃️ Run index: {added} new runs in {index.db_file} (python -m utils.run_index --help)")
         
+        return returncode
+    
     except Exception as e:
         print(f"❌ Error running tests: {e}")
         return 1
 
-def create_summary_file(report_path, metadata, exit_code):
+def summarize_schedule(report_path, wall_time):
+    """Predicted vs actual makespan of a run"""
+    busy = actual_makespan(report_path)
+    summary = {"wall_time": wall_time, "actual_makespan": max(busy.values(), default=0.0), "worker_busy": busy}
+    
+    schedule_file = os.path.join(report_path, "schedule.json")
+    if os.path.exists(schedule_file):
+        with open(schedule_file, "r") as f:
+            schedule = json.load(f)
+        summary["predicted_makespan"] = schedule["predicted_makespan"]
+        summary["estimate_sources"] = schedule["estimate_sources"]
+        print(
+            f"🗓️ Makespan: predicted {summary['predicted_makespan']:.1f}s, "
+            f"actual {summary['actual_makespan']:.1f}s (wall {wall_time:.1f}s)"
+        )
+    return summary
+
+def create_summary_file(report_path, metadata, exit_code, schedule_summary=None, run_summary=None, selection=None):
     """Create a summary file with test execution details"""
     summary_file = os.path.join(report_path, "test_summary.txt")
     
@@ -88,20 +149,65 @@ def create_summary_file(report_path, metadata, exit_code):
         f.write(f"Exit Code: {exit_code}\n")
         f.write(f"Status: {'PASSED' if exit_code == 0 else 'FAILED'}\n")
         f.write(f"Report Path: {report_path}\n")
+        if selection:
+            scope = "full suite" if selection["full_suite"] else "affected tests"
+            f.write(f"Test Selection: {scope} since {selection['base_ref']} ({selection['reason']})\n")
+        if run_summary:
+            if run_summary["aborted"]:
+                f.write(f"Aborted: {run_summary['aborted']}\n")
+            collected = run_summary["collected"] if run_summary["collected"] is not None else "?"
+            f.write(f"Tests: {run_summary['completed']}/{collected} run\n")
+            for outcome, count in sorted(run_summary["totals"].items()):
+                f.write(f"  {outcome.title()}: {count}\n")
+            if run_summary["reruns"]:
+                f.write(f"  Reruns: {run_summary['reruns']}\n")
+            f.write(f"Throughput: {run_summary['throughput']:.2f} tests/s\n")
+            if run_summary["failures"]:
+                f.write("Failures:\n")
+                for nodeid in run_summary["failures"]:
+                    f.write(f"  {nodeid}\n")
+        if schedule_summary:
+            f.write(f"Wall Time: {schedule_summary['wall_time']:.1f}s\n")
+            if "predicted_makespan" in schedule_summary:
+                f.write(f"Predicted Makespan: {schedule_summary['predicted_makespan']:.1f}s\n")
+            f.write(f"Actual Makespan: {schedule_summary['actual_makespan']:.1f}s\n")
+            for worker, busy in sorted(schedule_summary["worker_busy"].items()):
+                f.write(f"  {worker}: {busy:.1f}s busy\n")
 
 def main():
     parser = argparse.ArgumentParser(description="Run tests with dated reporting")
     parser.add_argument("--markers", "-m", help="Test markers to run (e.g., smoke, regression)")
     parser.add_argument("--parallel", "-p", action="store_true", help="Run tests in parallel")
     parser.add_argument("--browser", "-b", default="chrome", help="Browser to use")
+    parser.add_argument("--max-failures", type=int, default=None, help="Stop the whole run after this many failed tests")
+    parser.add_argument("--changed-since", metavar="REF", help="Run only tests affected by changes since a git ref")
+    parser.add_argument("--record-impact", action="store_true", help="Record the test impact index during this run")
+    parser.add_argument("--html-report", action="store_true", help="Also build the pytest-html report at session end")
+    parser.add_argument("--benchmark", action="store_true", help="Run framework micro-benchmarks instead of tests")
+    parser.add_argument("--no-browser", action="store_true", help="Skip benchmarks that need a browser")
+    parser.add_argument("--update-baseline", action="store_true", help="Store benchmark results as the new baseline")
+    parser.add_argument("--regression-threshold", type=float, default=0.2, help="Allowed p50 slowdown vs baseline (0.2 = 20%%)")
     
     args = parser.parse_args()
     
+    if args.benchmark:
+        from benchmarks.framework_benchmarks import run_benchmarks
+        sys.exit(run_benchmarks(
+            include_browser=not args.no_browser,
+            threshold=args.regression_threshold,
+            update_baseline=args.update_baseline,
+            browser=args.browser
+        ))
+    
     # Run tests
     exit_code = run_tests_with_dated_reports(
         markers=args.markers,
         parallel=args.parallel,
-        browser=args.browser
+        browser=args.browser,
+        max_failures=args.max_failures,
+        changed_since=args.changed_since,
+        record_impact=args.record_impact,
+        html_report=args.html_report
     )
     
     sys.exit(exit_code)
@@ -0,0 +1,57 @@
+"""
+Generate a search query corpus for @pytest.mark.data_source
+
+    python -m test_data.generate_search_queries --rows 2000 --output test_data/search_queries_large.jsonl
+"""
+import argparse
+import itertools
+import json
+import random
+
+TOPICS = [
+    "Selenium", "pytest", "Page Object Model", "WebDriver", "Python", "Test Automation",
+    "UI Automation", "explicit waits", "locators", "headless Chrome", "Firefox", "xdist",
+    "Allure", "Docker", "CI pipeline", "flaky tests", "regression testing", "smoke testing",
+    "cross browser testing", "accessibility testing"
+]
+
+VALID_TEMPLATES = [
+    "{a} tutorial", "{a} documentation", "{a} examples", "{a} error handling",
+    "{a} best practices", "{a} interview questions", "how to use {a}",
+    "{a} vs {b}", "{a} with {b}"
+]
+
+SPECIAL_TEMPLATES = [
+    '"{a}" {b}', "{a} & {b}", "{a}/{b}", "{a} + {b}", "{a} — {b}",
+    "{a} 3.8+", "{a} @#$%", "{a} çşğüöı"
+]
+
+def generate(rows, seed=0):
+    """Unique query rows in a seeded random order"""
+    candidates = []
+    for category, templates in (("valid_searches", VALID_TEMPLATES), ("special_characters", SPECIAL_TEMPLATES)):
+        queries = set()
+        for template in templates:
+            for a, b in itertools.permutations(TOPICS, 2):
+                queries.add(template.format(a=a, b=b))
+        candidates.extend({"query": query, "category": category} for query in sorted(queries))
+    
+    random.Random(seed).shuffle(candidates)
+    if rows > len(candidates):
+        raise ValueError(f"At most {len(candidates)} unique rows can be generated")
+    return candidates[:rows]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a JSON Lines search query corpus")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="test_data/search_queries_large.jsonl")
+    args = parser.parse_args(argv)
+    
+    with open(args.output, "w", encoding="utf-8") as f:
+        for row in generate(args.rows, args.seed):
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    print(f"📝 {args.rows} queries written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,20 @@
+import asyncio
+import functools
+import json
 import pytest
 import allure
-import datetime
 from pages.google_page import GooglePage
-from utils.webdriver_factory import WebDriverFactory
-from utils.test_data_manager import TestDataManager
-from config.config import Config
+from pages.async_google_page import AsyncGooglePage
+from utils.artifact_writer import artifact_writer
 
 @allure.epic("Google Search Tests")
 @allure.feature("Search Functionality")
 class TestGoogleSearchPOM:
     
     @pytest.fixture(scope="function")
-    def driver(self):
-        """WebDriver fixture using factory pattern"""
-        config = Config()
-        factory = WebDriverFactory(config)
-        driver = factory.create_driver()
-        yield driver
-        driver.quit()
-    
-    @pytest.fixture(scope="function")
-    def google_page(self, driver):
+    def google_page(self, driver, base_url):
         """Google page object fixture"""
-        return GooglePage(driver)
-    
-    @pytest.fixture(scope="function")
-    def test_data(self):
-        """Test data manager fixture"""
-        return TestDataManager()
+        return GooglePage(driver, base_url)
     
     @allure.story("Basic Google Search with POM")
     @allure.severity(allure.severity_level.NORMAL)
@@ -35,9 +22,6 @@ class TestGoogleSearchPOM:
     @pytest.mark.ui
     def test_google_search_pom(self, google_page, test_data):
         """Test basic Google search functionality using Page Object Model"""
-        test_start_time = datetime.datetime.now()
-        allure.dynamic.description(f"Test started at: {test_start_time}")
-        
         # Get test data
         search_query = test_data.get_random_search_query("valid_searches")
         expected_title = test_data.get_expected_result("google_title")
@@ -49,23 +33,12 @@ class TestGoogleSearchPOM:
         with allure.step("Perform search"):
             google_page.search_and_submit(search_query)
             assert google_page.is_search_results_page()
-        
-        # Add test completion metadata
-        test_end_time = datetime.datetime.now()
-        test_duration = test_end_time - test_start_time
-        allure.attach(
-            f"Test Duration: {test_duration}\nStart Time: {test_start_time}\nEnd Time: {test_end_time}",
-            name="test_metadata",
-            attachment_type=allure.attachment_type.TEXT
-        )
     
     @allure.story("Empty Search with POM")
     @allure.severity(allure.severity_level.MINOR)
     @pytest.mark.regression
     def test_empty_search_pom(self, google_page, test_data):
         """Test Google search with empty query using POM"""
-        test_start_time = datetime.datetime.now()
-        
         expected_title = test_data.get_expected_result("google_title")
         
         with allure.step("Navigate to Google"):
@@ -75,22 +48,28 @@ class TestGoogleSearchPOM:
             google_page.submit_search()
             assert expected_title in google_page.get_page_title()
             assert google_page.is_google_homepage()
+    
+    @allure.story("Search in a Fresh Browser")
+    @allure.severity(allure.severity_level.MINOR)
+    @pytest.mark.regression
+    @pytest.mark.fresh_browser
+    def test_search_in_fresh_browser(self, google_page, test_data):
+        """Test Google search in a browser no other test used before"""
+        search_query = test_data.get_random_search_query("valid_searches")
         
-        test_end_time = datetime.datetime.now()
-        test_duration = test_end_time - test_start_time
-        allure.attach(
-            f"Test Duration: {test_duration}\nStart Time: {test_start_time}\nEnd Time: {test_end_time}",
-            name="test_metadata",
-            attachment_type=allure.attachment_type.TEXT
-        )
+        with allure.step("Navigate to Google"):
+            google_page.navigate_to()
+            assert google_page.get_search_box_value() == ""
+        
+        with allure.step("Perform search"):
+            google_page.search_and_submit(search_query)
+            assert google_page.is_search_results_page()
     
     @allure.story("Special Characters Search with POM")
     @allure.severity(allure.severity_level.NORMAL)
     @pytest.mark.regression
     def test_special_characters_search_pom(self, google_page, test_data):
         """Test Google search with special characters using POM"""
-        test_start_time = datetime.datetime.now()
-        
         search_query = test_data.get_random_search_query("special_characters")
         
         with allure.step("Navigate to Google"):
@@ -99,37 +78,22 @@ class TestGoogleSearchPOM:
         with allure.step("Search with special characters"):
             google_page.search_and_submit(search_query)
             assert google_page.is_search_results_page()
-        
-        test_end_time = datetime.datetime.now()
-        test_duration = test_end_time - test_start_time
-        allure.attach(
-            f"Test Duration: {test_duration}\nStart Time: {test_start_time}\nEnd Time: {test_end_time}",
-            name="test_metadata",
-            attachment_type=allure.attachment_type.TEXT
-        )
     
-    @pytest.mark.parametrize("search_query", [
-        "Selenium Python",
-        "Test Automation",
-        "WebDriver",
-        "Python Testing"
-    ])
+    @pytest.mark.data_source("search_queries.jsonl", sample=4)
     @allure.story("Parametrized Search Tests")
     @allure.severity(allure.severity_level.NORMAL)
     @pytest.mark.regression
-    def test_parametrized_search(self, google_page, search_query):
-        """Parametrized test for multiple search queries"""
-        test_start_time = datetime.datetime.now()
+    def test_parametrized_search(self, google_page, data_row):
+        """Parametrized test for queries of the search corpus"""
+        search_query = data_row["query"]
         
         with allure.step(f"Navigate to Google and search for: {search_query}"):
             google_page.navigate_to()
             google_page.search_and_submit(search_query)
             assert google_page.is_search_results_page()
         
-        test_end_time = datetime.datetime.now()
-        test_duration = test_end_time - test_start_time
-        allure.attach(
-            f"Query: {search_query}\nDuration: {test_duration}",
+        artifact_writer.attach(
+            f"Query: {search_query}\nCategory: {data_row['category']}",
             name="parametrized_test_metadata",
             attachment_type=allure.attachment_type.TEXT
         )
@@ -139,8 +103,6 @@ class TestGoogleSearchPOM:
     @pytest.mark.regression
     def test_search_results_validation(self, google_page, test_data):
         """Test search results validation"""
-        test_start_time = datetime.datetime.now()
-        
         search_query = test_data.get_random_search_query("valid_searches")
         min_results = test_data.get_expected_result("min_results_count")
         
@@ -151,10 +113,8 @@ class TestGoogleSearchPOM:
             results_count = google_page.get_search_results_count()
             assert results_count >= int(min_results), f"Expected at least {min_results} results, got {results_count}"
         
-        test_end_time = datetime.datetime.now()
-        test_duration = test_end_time - test_start_time
-        allure.attach(
-            f"Results Count: {results_count}\nDuration: {test_duration}",
+        artifact_writer.attach(
+            f"Results Count: {results_count}",
             name="results_validation_metadata",
             attachment_type=allure.attachment_type.TEXT
         )
@@ -164,8 +124,6 @@ class TestGoogleSearchPOM:
     @pytest.mark.regression
     def test_clear_search_box(self, google_page):
         """Test clearing search box functionality"""
-        test_start_time = datetime.datetime.now()
-        
         with allure.step("Navigate to Google and enter text"):
             google_page.navigate_to()
             google_page.search("Test query")
@@ -174,11 +132,44 @@ class TestGoogleSearchPOM:
         with allure.step("Clear search box"):
             google_page.clear_search_box()
             assert google_page.get_search_box_value() == ""
-        
-        test_end_time = datetime.datetime.now()
-        test_duration = test_end_time - test_start_time
-        allure.attach(
-            f"Test Duration: {test_duration}",
-            name="clear_search_metadata",
-            attachment_type=allure.attachment_type.TEXT
+    
+    @allure.story("Concurrent Searches in Tabs")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.regression
+    def test_concurrent_searches_in_tabs(self, tab_pool, base_url, test_data):
+        """Run several searches at once, each in its own isolated tab of one browser"""
+        queries = list(test_data.get_search_queries("valid_searches"))
+        
+        def search(tab, query):
+            page = GooglePage(tab, base_url)
+            page.navigate_to()
+            page.search_and_submit(query)
+            return page.is_search_results_page()
+        
+        with allure.step(f"Search {len(queries)} queries in up to {tab_pool.max_tabs} tabs"):
+            results = tab_pool.run([functools.partial(search, query=query) for query in queries])
+            assert all(results), dict(zip(queries, results))
+        
+        artifact_writer.attach(
+            json.dumps(tab_pool.get_stats(), indent=4),
+            name="tab_pool_stats",
+            attachment_type=allure.attachment_type.JSON
         )
+    
+    @allure.story("Concurrent Async Searches")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.regression
+    @pytest.mark.asyncio
+    async def test_concurrent_async_searches(self, async_driver_factory, base_url, test_data):
+        """Run several searches at once, each in its own async session of one driver process"""
+        queries = list(test_data.get_search_queries("valid_searches"))
+        
+        async def search(query):
+            page = AsyncGooglePage(await async_driver_factory(), base_url)
+            await page.navigate_to()
+            await page.search_and_submit(query)
+            return await page.is_search_results_page()
+        
+        with allure.step(f"Search {len(queries)} queries in parallel async sessions"):
+            results = await asyncio.gather(*(search(query) for query in queries))
+            assert all(results), dict(zip(queries, results))
@@ -0,0 +1,40 @@
+import json
+from utils.logger import merge_worker_logs
+
+def write_log(log_dir, worker, lines):
+    (log_dir / f"test_execution_run1_{worker}.log").write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+class TestMergeWorkerLogs:
+    
+    def test_text_records_with_brace_continuation_lines(self, tmp_path):
+        write_log(tmp_path, "gw0", [
+            "2024-01-01 10:00:00.100 - UI_Test_Automation - INFO - Config:",
+            "{",
+            '    "browser": "chrome"',
+            "}",
+            "2024-01-01 10:00:00.300 - UI_Test_Automation - INFO - Done"
+        ])
+        write_log(tmp_path, "gw1", [
+            "2024-01-01 10:00:00.200 - UI_Test_Automation - INFO - Capabilities: ",
+            "{'browserName': 'chrome'}"
+        ])
+        
+        merged = merge_worker_logs(str(tmp_path), "run1")
+        assert merged.read_text(encoding="utf-8").splitlines() == [
+            "[gw0] 2024-01-01 10:00:00.100 - UI_Test_Automation - INFO - Config:",
+            "{",
+            '    "browser": "chrome"',
+            "}",
+            "[gw1] 2024-01-01 10:00:00.200 - UI_Test_Automation - INFO - Capabilities: ",
+            "{'browserName': 'chrome'}",
+            "[gw0] 2024-01-01 10:00:00.300 - UI_Test_Automation - INFO - Done"
+        ]
+    
+    def test_json_records_are_merged_unprefixed(self, tmp_path):
+        first = {"time": "2024-01-01 10:00:00.100", "worker": "gw0", "message": "a"}
+        second = {"time": "2024-01-01 10:00:00.200", "worker": "gw1", "message": "b"}
+        write_log(tmp_path, "gw0", [json.dumps(first)])
+        write_log(tmp_path, "gw1", [json.dumps(second)])
+        
+        merged = merge_worker_logs(str(tmp_path), "run1")
+        assert [json.loads(line) for line in merged.read_text(encoding="utf-8").splitlines()] == [first, second]
@@ -0,0 +1,64 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from utils.run_index import RunIndex, main
+
+def write_run(reports_dir, started, results):
+    """Finished run folder with a summary file and one results record per (nodeid, outcome)"""
+    run_dir = reports_dir / started.strftime("%Y-%m-%d") / started.strftime("%Y%m%d_%H%M%S")
+    run_dir.mkdir(parents=True)
+    (run_dir / "test_summary.txt").write_text(
+        f"Time: {started.strftime('%Y%m%d_%H%M%S')}\nExit Code: 0\nWall Time: 12.5s\n", encoding="utf-8"
+    )
+    with open(run_dir / "results.jsonl", "w", encoding="utf-8") as f:
+        for nodeid, outcome in results:
+            f.write(json.dumps({"nodeid": nodeid, "outcome": outcome, "duration": 1.0, "worker": "gw0"}) + "\n")
+
+@pytest.fixture
+def index(tmp_path):
+    run_index = RunIndex(reports_dir=str(tmp_path / "reports"))
+    yield run_index
+    run_index.close()
+
+def ingest_runs(index, tmp_path, runs):
+    started = datetime.now() - timedelta(days=1)
+    for offset, results in enumerate(runs):
+        write_run(tmp_path / "reports", started + timedelta(minutes=offset), results)
+    assert index.ingest() == len(runs)
+
+class TestFlakyTests:
+    
+    def test_flipping_test_is_reported(self, index, tmp_path):
+        ingest_runs(index, tmp_path, [
+            [("tests/test_a.py::test_flips", "passed"), ("tests/test_a.py::test_stable", "passed")],
+            [("tests/test_a.py::test_flips", "failed"), ("tests/test_a.py::test_stable", "passed")],
+            [("tests/test_a.py::test_flips", "passed"), ("tests/test_a.py::test_stable", "passed")]
+        ])
+        
+        flaky = index.flaky_tests(min_runs=3)
+        assert [item["nodeid"] for item in flaky] == ["tests/test_a.py::test_flips"]
+        assert flaky[0]["flip_rate"] == 1.0
+        assert flaky[0]["failure_rate"] == pytest.approx(1 / 3)
+    
+    def test_single_run_with_rerun(self, index, tmp_path):
+        ingest_runs(index, tmp_path, [
+            [("tests/test_a.py::test_flaky", "rerun"), ("tests/test_a.py::test_flaky", "passed")]
+        ])
+        
+        flaky = index.flaky_tests(min_runs=1)
+        assert flaky == [{
+            "nodeid": "tests/test_a.py::test_flaky", "runs": 1, "failure_rate": 0.0, "flip_rate": 0.0, "reruns": 1
+        }]
+    
+    def test_skipped_runs_do_not_count(self, index, tmp_path):
+        ingest_runs(index, tmp_path, [
+            [("tests/test_a.py::test_skips", "failed")],
+            [("tests/test_a.py::test_skips", "skipped")],
+            [("tests/test_a.py::test_skips", "skipped")]
+        ])
+        
+        assert index.flaky_tests(min_runs=2) == []
+    
+    def test_min_runs_below_one_is_rejected(self, tmp_path):
+        with pytest.raises(SystemExit):
+            main(["--reports-dir", str(tmp_path / "reports"), "flaky", "--min-runs", "0"])
@@ -0,0 +1,97 @@
+import pytest
+from utils.run_stream import RunEvents
+
+# Output of pytest 7.4 / xdist 3.3 for the same five tests, header lines trimmed
+VERBOSE_OUTPUT = """\
+collecting ... collected 5 items
+
+test_sample.py::test_pass PASSED                                         [ 20%]
+test_sample.py::test_fail FAILED                                         [ 40%]
+test_sample.py::test_skip SKIPPED (unconditional skip)                   [ 60%]
+test_sample.py::test_param[1] PASSED                                     [ 80%]
+test_sample.py::test_param[2] PASSED                                     [100%]
+
+=================================== FAILURES ===================================
+__________________________________ test_fail ___________________________________
+FAILED test_sample.py::test_fail - assert False
+"""
+
+XDIST_VERBOSE_OUTPUT = """\
+created: 2/2 workers
+2 workers [5 items]
+
+scheduling tests via LoadScheduling
+
+test_sample.py::test_pass 
+[gw0] [ 20%] PASSED test_sample.py::test_pass 
+test_sample.py::test_fail 
+test_sample.py::test_skip 
+[gw1] [ 40%] SKIPPED test_sample.py::test_skip 
+test_sample.py::test_param[1] 
+[gw1] [ 60%] PASSED test_sample.py::test_param[1] 
+[gw0] [ 80%] FAILED test_sample.py::test_fail 
+test_sample.py::test_param[2] 
+[gw0] [100%] PASSED test_sample.py::test_param[2] 
+
+=================================== FAILURES ===================================
+__________________________________ test_fail ___________________________________
+[gw0] linux -- Python 3.11.7 /usr/bin/python
+FAILED test_sample.py::test_fail - assert False
+"""
+
+QUIET_OUTPUT = """\
+collected 5 items
+
+test_sample.py .Fs..                                                     [100%]
+
+=================================== FAILURES ===================================
+"""
+
+XDIST_QUIET_OUTPUT = """\
+created: 2/2 workers
+2 workers [5 items]
+
+.s.F.                                                                    [100%]
+=================================== FAILURES ===================================
+[gw0] linux -- Python 3.11.7 /usr/bin/python
+"""
+
+def feed(output):
+    events = RunEvents()
+    for line in output.splitlines():
+        events.feed(line)
+    return events
+
+class TestRunEvents:
+    
+    @pytest.mark.parametrize("output", [VERBOSE_OUTPUT, XDIST_VERBOSE_OUTPUT], ids=["plain", "xdist"])
+    def test_verbose_results_are_parsed(self, output):
+        events = feed(output)
+        assert events.collected == 5
+        assert events.completed == 5
+        assert events.totals() == {"PASSED": 3, "FAILED": 1, "SKIPPED": 1}
+        assert events.failures == ["test_sample.py::test_fail"]
+    
+    @pytest.mark.parametrize("output", [QUIET_OUTPUT, XDIST_QUIET_OUTPUT], ids=["plain", "xdist"])
+    def test_quiet_output_reports_no_results(self, output):
+        """Without -v only the collected count is known, run_tests.py always passes -v"""
+        events = feed(output)
+        assert events.collected == 5
+        assert events.completed == 0
+        assert events.failures == []
+    
+    def test_teardown_error_after_pass_stays_failed(self):
+        events = feed(
+            "tests/test_a.py::test_one PASSED\n"
+            "tests/test_a.py::test_one ERROR\n"
+            "tests/test_a.py::test_one PASSED\n"
+        )
+        assert events.failures == ["tests/test_a.py::test_one"]
+    
+    def test_reruns_are_counted_but_not_completed(self):
+        events = feed(
+            "[gw1] [ 50%] RERUN tests/test_a.py::test_flaky \n"
+            "[gw1] [ 50%] PASSED tests/test_a.py::test_flaky \n"
+        )
+        assert events.completed == 1
+        assert events.summary()["reruns"] == 1
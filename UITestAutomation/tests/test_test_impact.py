@@ -0,0 +1,136 @@
+import importlib.util
+import subprocess
+from datetime import datetime, timedelta
+import pytest
+from utils.test_impact import ImpactIndex, ImpactRecorder, select_tests
+
+SAMPLE_PAGE = '''\
+class SamplePage:
+    SEARCH_BOX = "q"
+    
+    def read(self):
+        return self.SEARCH_BOX
+    
+    def other(self):
+        return 1
+
+def helper():
+    def inner():
+        return 2
+    return inner()
+'''
+
+def git(*args):
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Git repository with one committed page module, the working directory of the test"""
+    repo = tmp_path / "repo"
+    (repo / "pages").mkdir(parents=True)
+    (repo / "pages" / "sample_page.py").write_text(SAMPLE_PAGE, encoding="utf-8")
+    monkeypatch.chdir(repo)
+    git("init", "-q")
+    git("add", "-A")
+    git("commit", "-q", "-m", "Add sample page")
+    return repo
+
+def write_index(reports_dir, commit=None, created=None):
+    """Index as recorded at the current commit, one test per function"""
+    index = ImpactIndex(str(reports_dir))
+    index.commit = commit or git("rev-parse", "HEAD")
+    index.created = created or datetime.now()
+    index.tests = {
+        "tests/test_sample.py::test_read": {"pages/sample_page.py::SamplePage.read"},
+        "tests/test_sample.py::test_other": {"pages/sample_page.py::SamplePage.other"},
+        "tests/test_sample.py::test_helper": {"pages/sample_page.py::helper"}
+    }
+    index.imported = {"pages/sample_page.py"}
+    index.save()
+    return index
+
+def edit(project, old, new):
+    page = project / "pages" / "sample_page.py"
+    page.write_text(page.read_text(encoding="utf-8").replace(old, new), encoding="utf-8")
+
+class TestSelectTests:
+    
+    def test_changed_method_selects_its_tests(self, project, tmp_path):
+        write_index(tmp_path / "reports")
+        edit(project, "return 1", "return 3")
+        
+        selection = select_tests("HEAD", str(tmp_path / "reports"))
+        assert not selection["full_suite"], selection["reason"]
+        assert selection["selected"] == ["tests/test_sample.py::test_other"]
+    
+    def test_nested_function_change_selects_the_outer_function(self, project, tmp_path):
+        write_index(tmp_path / "reports")
+        edit(project, "return 2", "return 4")
+        
+        selection = select_tests("HEAD", str(tmp_path / "reports"))
+        assert selection["selected"] == ["tests/test_sample.py::test_helper"]
+    
+    def test_changed_locator_selects_its_readers(self, project, tmp_path):
+        write_index(tmp_path / "reports")
+        edit(project, 'SEARCH_BOX = "q"', 'SEARCH_BOX = "query"')
+        
+        selection = select_tests("HEAD", str(tmp_path / "reports"))
+        assert selection["selected"] == ["tests/test_sample.py::test_read"]
+    
+    def test_module_level_change_selects_the_whole_file(self, project, tmp_path):
+        write_index(tmp_path / "reports")
+        edit(project, "class SamplePage:", "import os\n\nclass SamplePage:")
+        
+        selection = select_tests("HEAD", str(tmp_path / "reports"))
+        assert len(selection["selected"]) == 3
+    
+    def test_stale_index_runs_full_suite(self, project, tmp_path):
+        write_index(tmp_path / "reports", created=datetime.now() - timedelta(days=20))
+        edit(project, "return 1", "return 3")
+        
+        selection = select_tests("HEAD", str(tmp_path / "reports"))
+        assert selection["full_suite"]
+        assert selection["reason"] == "index is 20 days old"
+    
+    def test_index_from_another_branch_runs_full_suite(self, project, tmp_path):
+        main = git("rev-parse", "--abbrev-ref", "HEAD")
+        git("checkout", "-q", "-b", "elsewhere")
+        edit(project, "return 1", "return 5")
+        git("commit", "-q", "-am", "Change other")
+        elsewhere = git("rev-parse", "HEAD")
+        git("checkout", "-q", main)
+        write_index(tmp_path / "reports", commit=elsewhere)
+        
+        selection = select_tests("HEAD", str(tmp_path / "reports"))
+        assert selection["full_suite"]
+        assert selection["reason"] == f"index commit {elsewhere[:10]} is not an ancestor of HEAD"
+    
+    def test_missing_index_runs_full_suite(self, project, tmp_path):
+        selection = select_tests("HEAD", str(tmp_path / "reports"))
+        assert selection["full_suite"]
+        assert "--record-impact" in selection["reason"]
+
+class TestImpactRecorder:
+    
+    def test_calls_are_recorded_per_top_level_function(self, project):
+        spec = importlib.util.spec_from_file_location("sample_page", project / "pages" / "sample_page.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        
+        recorder = ImpactRecorder(str(project))
+        if not recorder.start():
+            pytest.skip("another trace function is active")
+        try:
+            recorder.start_test("tests/test_sample.py::test_read")
+            module.SamplePage().read()
+            module.helper()
+            recorder.finish_test()
+        finally:
+            recorder.stop()
+        
+        assert recorder.tests["tests/test_sample.py::test_read"] == {
+            "pages/sample_page.py::SamplePage.read", "pages/sample_page.py::helper"
+        }
@@ -0,0 +1,229 @@
+import atexit
+import base64
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+import allure
+from allure_commons import plugin_manager
+from allure_commons.model2 import ATTACHMENT_PATTERN, Attachment
+from utils.logger import logger
+
+_STOP = object()
+
+class ArtifactWriter:
+    """Bounded queue of report attachments drained by a background writer thread
+    
+    Decoding, hashing and writing the files into the Allure results happen on
+    the writer thread. When the test is torn down, the pytest thread only
+    adds the written files to the test's Allure result, so they land on the
+    right test whichever thread (tabs, async flows) made them.
+    """
+    
+    def __init__(self, queue_size=256, enabled=True):
+        self.enabled = enabled
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {
+            "submitted": 0,
+            "written": 0,
+            "failed": 0,
+            "bytes": 0,
+            "duplicates": 0,
+            "blocked_puts": 0,
+            "blocked_time": 0.0,
+            "max_queue_depth": 0
+        }
+        self._digests = set()
+        self._ready = []
+        self._attachments = []
+        self.allure_dir = None
+    
+    def configure(self, queue_size=None, enabled=None, allure_dir=None):
+        """Apply artifact settings, the queue ones only before the writer thread started"""
+        if allure_dir is not None:
+            # Allure resolves --alluredir against the starting directory too
+            self.allure_dir = os.path.abspath(allure_dir)
+        if self._thread is None:
+            if queue_size is not None:
+                self.queue = queue.Queue(maxsize=queue_size)
+            if enabled is not None:
+                self.enabled = enabled
+    
+    def attach(self, body, name, attachment_type=allure.attachment_type.TEXT, encoding=None):
+        """Attach data to the report without blocking on encoding"""
+        # encoding="base64" defers decoding of screenshots to the writer thread
+        item = (body, encoding, name, attachment_type)
+        if not self.enabled:
+            self._write(item)
+            return
+        
+        self._ensure_started()
+        blocked_time = None
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            # Back-pressure: the test thread waits for the writer to catch up
+            start = time.perf_counter()
+            self.queue.put(item)
+            blocked_time = time.perf_counter() - start
+        
+        with self._lock:
+            self.stats["submitted"] += 1
+            if blocked_time is not None:
+                self.stats["blocked_puts"] += 1
+                self.stats["blocked_time"] += blocked_time
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self.queue.qsize())
+    
+    def _allure_active(self):
+        """Check if an Allure listener writes results into --alluredir in this run"""
+        return self.allure_dir is not None and bool(plugin_manager.hook.attach_data.get_hookimpls())
+    
+    @staticmethod
+    def _allure_test_result():
+        """Allure result of the running test, None outside of a test"""
+        for plugin in plugin_manager.get_plugins():
+            reporter = getattr(plugin, "allure_logger", None)
+            if reporter is not None:
+                return reporter.get_test(None)
+        return None
+    
+    def finish_test(self):
+        """Add the files written for the finished test to its Allure result, call on the pytest thread"""
+        self.flush()
+        with self._lock:
+            ready, self._ready = self._ready, []
+            # Identical artifacts are only counted within a test
+            self._digests.clear()
+        if not ready:
+            return
+        
+        test_result = self._allure_test_result()
+        for file_name, name, attachment_type in ready:
+            if test_result is not None:
+                test_result.attachments.append(
+                    Attachment(source=file_name, name=name, type=getattr(attachment_type, "mime_type", None))
+                )
+            else:
+                # Made outside of a test, e.g. at session end: the file stays in the results folder
+                logger.debug("No open Allure test for attachment %s", name)
+            self._add_attachment(name, attachment_type, os.path.join(self.allure_dir, file_name))
+    
+    def _add_attachment(self, name, attachment_type, path):
+        with self._lock:
+            self._attachments.append({
+                "name": name,
+                "type": getattr(attachment_type, "mime_type", None),
+                "path": path
+            })
+    
+    def take_attachments(self):
+        """Attachments added since the last call, for the results of the finished test"""
+        with self._lock:
+            attachments, self._attachments = self._attachments, []
+        return attachments
+    
+    def _ensure_started(self):
+        """Start the writer thread on first use"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+    
+    def _run(self):
+        """Drain the queue until the stop marker arrives"""
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._write(item)
+            finally:
+                self.queue.task_done()
+    
+    def _write(self, item):
+        """Decode, hash and write a single artifact, it is attached when the test finishes"""
+        body, encoding, name, attachment_type = item
+        try:
+            if encoding == "base64":
+                body = base64.b64decode(body)
+            elif isinstance(body, str):
+                body = body.encode("utf-8")
+            
+            digest = hashlib.sha256(body).hexdigest()
+            with self._lock:
+                if digest in self._digests:
+                    self.stats["duplicates"] += 1
+                self._digests.add(digest)
+                self.stats["bytes"] += len(body)
+            
+            if self._allure_active():
+                # Named like Allure names its own attachment files
+                file_name = ATTACHMENT_PATTERN.format(
+                    prefix=uuid.uuid4(), ext=getattr(attachment_type, "extension", "attach")
+                )
+                with open(os.path.join(self.allure_dir, file_name), "wb") as f:
+                    f.write(body)
+                with self._lock:
+                    self._ready.append((file_name, name, attachment_type))
+                    self.stats["written"] += 1
+            else:
+                self._write_fallback(body, digest, name, attachment_type)
+        except Exception as e:
+            with self._lock:
+                self.stats["failed"] += 1
+            logger.error("❌ Failed to write artifact %s: %s", name, e)
+    
+    def _write_fallback(self, body, digest, name, attachment_type):
+        """Store artifacts under the report folder when no Allure run is active"""
+        artifact_dir = os.path.join(os.getenv("REPORT_PATH", "reports"), "artifacts")
+        os.makedirs(artifact_dir, exist_ok=True)
+        extension = getattr(attachment_type, "extension", "attach")
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)[:80]
+        path = os.path.join(artifact_dir, f"{digest[:16]}_{safe_name}.{extension}")
+        with open(path, "wb") as f:
+            f.write(body)
+        self._add_attachment(name, attachment_type, os.path.abspath(path))
+        with self._lock:
+            self.stats["written"] += 1
+    
+    def flush(self):
+        """Block until every queued artifact has been written"""
+        if self._thread is not None:
+            self.queue.join()
+    
+    def close(self):
+        """Flush pending artifacts and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self.queue.put(_STOP)
+            thread.join()
+        # Artifacts made outside of a test end up in the report folder
+        self.finish_test()
+    
+    def report_stats(self, report_path=None):
+        """Log writer statistics and save them next to the reports"""
+        with self._lock:
+            stats = dict(self.stats, worker=os.getenv("PYTEST_XDIST_WORKER", "master"))
+        logger.info(
+            "📦 Artifacts [%s]: %d/%d written, %d blocked puts (%.3fs), max queue depth %d",
+            stats["worker"], stats["written"], stats["submitted"],
+            stats["blocked_puts"], stats["blocked_time"], stats["max_queue_depth"]
+        )
+        
+        report_path = report_path or os.getenv("REPORT_PATH")
+        if report_path:
+            os.makedirs(report_path, exist_ok=True)
+            with open(os.path.join(report_path, f"artifacts_{stats['worker']}.json"), "w") as f:
+                json.dump(stats, f, indent=4)
+        
+        return stats
+
+# Global artifact writer instance
+artifact_writer = ArtifactWriter()
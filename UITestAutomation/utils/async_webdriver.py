@@ -0,0 +1,305 @@
+import asyncio
+import json
+import socket
+import subprocess
+import time
+import urllib.request
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    InvalidSelectorException,
+    JavascriptException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException
+)
+from selenium.webdriver.common.by import By
+from utils.driver_resolver import DriverResolver
+from utils.locators import css_selector
+from utils.logger import logger
+
+# W3C identifier of a web element in JSON payloads
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# W3C error codes mapped to the exceptions the sync path raises
+W3C_ERRORS = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "element not interactable": ElementNotInteractableException,
+    "element click intercepted": ElementClickInterceptedException,
+    "invalid selector": InvalidSelectorException,
+    "javascript error": JavascriptException,
+    "no such window": NoSuchWindowException,
+    "timeout": TimeoutException,
+    "script timeout": TimeoutException
+}
+
+# Driver binaries that serve many sessions from one process
+MULTI_SESSION_BROWSERS = ("chrome", "edge")
+
+class AsyncHTTPClient:
+    """Minimal keep-alive HTTP/1.1 client on asyncio streams for the WebDriver wire protocol"""
+    
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._idle = []
+    
+    async def request(self, method, path, payload=None):
+        """Send a JSON request and return the status code and decoded body"""
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("ascii")
+        
+        while True:
+            reused = bool(self._idle)
+            reader, writer = self._idle.pop() if reused else await asyncio.open_connection(self.host, self.port)
+            try:
+                writer.write(head + body)
+                await writer.drain()
+                status, headers, data = await self._read_response(reader)
+                break
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused:
+                    raise
+                # The driver closed an idle keep-alive connection, retry on a new one
+        
+        if headers.get("connection", "").lower() == "close":
+            writer.close()
+        else:
+            self._idle.append((reader, writer))
+        return status, json.loads(data) if data else None
+    
+    async def _read_response(self, reader):
+        """Read status line, headers and a Content-Length or chunked body"""
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            return status, headers, b"".join(chunks)
+        return status, headers, await reader.readexactly(int(headers.get("content-length", 0)))
+    
+    def close(self):
+        """Close idle connections"""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+class AsyncWebElement:
+    """Element of an async session, every command is awaitable"""
+    
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.id = element_id
+    
+    async def _execute(self, method, path, payload=None):
+        return await self.driver.execute(method, f"/element/{self.id}{path}", payload)
+    
+    async def click(self):
+        await self._execute("POST", "/click", {})
+    
+    async def clear(self):
+        await self._execute("POST", "/clear", {})
+    
+    async def send_keys(self, *values):
+        await self._execute("POST", "/value", {"text": "".join(str(value) for value in values)})
+    
+    async def get_text(self):
+        return await self._execute("GET", "/text")
+    
+    async def get_attribute(self, name):
+        return await self._execute("GET", f"/attribute/{name}")
+    
+    async def get_property(self, name):
+        return await self._execute("GET", f"/property/{name}")
+    
+    async def is_displayed(self):
+        # Not part of W3C, chromedriver and msedgedriver keep the legacy endpoint
+        return await self._execute("GET", "/displayed")
+    
+    async def is_enabled(self):
+        return await self._execute("GET", "/enabled")
+
+class AsyncWebDriver:
+    """WebDriver session driven from an event loop instead of a blocked thread"""
+    
+    def __init__(self, client, session_id, capabilities=None):
+        self.client = client
+        self.session_id = session_id
+        self.capabilities = capabilities or {}
+    
+    @classmethod
+    async def create(cls, client, capabilities):
+        """Open a new session on the driver endpoint"""
+        status, response = await client.request(
+            "POST", "/session", {"capabilities": {"alwaysMatch": capabilities}}
+        )
+        value = response["value"]
+        if status >= 400:
+            raise WebDriverException(f"Could not create session: {value.get('message')}")
+        return cls(client, value["sessionId"], value.get("capabilities"))
+    
+    async def execute(self, method, path, payload=None):
+        """Run a session command and return its value, raising Selenium exceptions on errors"""
+        status, response = await self.client.request(method, f"/session/{self.session_id}{path}", payload)
+        value = response.get("value") if response else None
+        if status >= 400:
+            error = value.get("error", "") if isinstance(value, dict) else ""
+            message = value.get("message") if isinstance(value, dict) else str(value)
+            raise W3C_ERRORS.get(error, WebDriverException)(message)
+        return value
+    
+    def _wrap(self, value):
+        """Turn element references in a response into AsyncWebElement objects"""
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            return {key: self._wrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        return value
+    
+    def _unwrap(self, value):
+        """Serialize AsyncWebElement arguments as element references"""
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [self._unwrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._unwrap(item) for key, item in value.items()}
+        return value
+    
+    @staticmethod
+    def _locator(by, value):
+        # W3C drivers only know ids, names and class names through CSS
+        selector = css_selector(by, value)
+        if selector is not None:
+            return {"using": By.CSS_SELECTOR, "value": selector}
+        return {"using": by, "value": value}
+    
+    async def get(self, url):
+        await self.execute("POST", "/url", {"url": url})
+    
+    async def get_title(self):
+        return await self.execute("GET", "/title")
+    
+    async def get_current_url(self):
+        return await self.execute("GET", "/url")
+    
+    async def find_element(self, by, value):
+        return self._wrap(await self.execute("POST", "/element", self._locator(by, value)))
+    
+    async def find_elements(self, by, value):
+        return self._wrap(await self.execute("POST", "/elements", self._locator(by, value)))
+    
+    async def execute_script(self, script, *args):
+        return self._wrap(await self.execute(
+            "POST", "/execute/sync", {"script": script, "args": self._unwrap(list(args))}
+        ))
+    
+    async def get_screenshot_as_base64(self):
+        return await self.execute("GET", "/screenshot")
+    
+    async def get_timeouts(self):
+        """Session timeouts in seconds, keyed by their W3C names"""
+        timeouts = await self.execute("GET", "/timeouts")
+        return {name: value / 1000 for name, value in timeouts.items() if value is not None}
+    
+    async def set_timeouts(self, implicit=0, page_load=None):
+        timeouts = {"implicit": int(implicit * 1000)}
+        if page_load is not None:
+            timeouts["pageLoad"] = int(page_load * 1000)
+        await self.execute("POST", "/timeouts", timeouts)
+    
+    async def set_window_size(self, width, height):
+        await self.execute("POST", "/window/rect", {"width": width, "height": height})
+    
+    async def quit(self):
+        """End the session and close its connections"""
+        try:
+            await self.execute("DELETE", "")
+        finally:
+            self.client.close()
+
+class AsyncDriverService:
+    """One driver process serving many async sessions over its HTTP endpoint"""
+    
+    def __init__(self, config, host="127.0.0.1"):
+        self.config = config
+        self.host = host
+        self.port = None
+        self.process = None
+        self.browser = config.browser_name.lower()
+        if self.browser not in MULTI_SESSION_BROWSERS:
+            raise ValueError(f"Async sessions need a multi-session driver, not supported for {self.browser}")
+    
+    def start(self, timeout=20):
+        """Launch the driver binary and wait until it accepts sessions"""
+        with socket.socket() as sock:
+            sock.bind((self.host, 0))
+            self.port = sock.getsockname()[1]
+        
+        path = DriverResolver.from_config(self.config).resolve(self.browser)
+        self.process = subprocess.Popen(
+            [path, f"--port={self.port}"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        
+        end = time.monotonic() + timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://{self.host}:{self.port}/status", timeout=1) as response:
+                    if json.load(response)["value"].get("ready"):
+                        break
+            except OSError:
+                pass
+            if time.monotonic() >= end or self.process.poll() is not None:
+                self.stop()
+                raise WebDriverException(f"Driver service did not start on port {self.port}")
+            time.sleep(0.1)
+        
+        logger.info("⚡ Async driver service listening on %s:%s", self.host, self.port)
+        return self
+    
+    async def new_session(self):
+        """Open a configured session with its own keep-alive connections"""
+        capabilities = self.config.get_browser_options().to_capabilities()
+        driver = await AsyncWebDriver.create(AsyncHTTPClient(self.host, self.port), capabilities)
+        # Page objects rely on explicit waits only, like the sync factory
+        await driver.set_timeouts(implicit=0, page_load=self.config.browser_page_load_timeout)
+        if self.config.browser_window_size:
+            width, height = self.config.browser_window_size.split(',')
+            await driver.set_window_size(int(width), int(height))
+        return driver
+    
+    def stop(self):
+        """Stop the driver process"""
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
@@ -0,0 +1,93 @@
+import csv
+import json
+import random
+from array import array
+from pathlib import Path
+
+class DataSource:
+    """Large JSON Lines or CSV data file read lazily through a line offset index
+    
+    Only the byte offset of every row is kept in memory. Tests are parametrized
+    with row numbers and a row is parsed when the test runs, so collection time
+    and memory stay flat as the file grows. One record per line, CSV fields must
+    not contain line breaks.
+    """
+    
+    # Resolved path -> source, the index is built once per process
+    _sources = {}
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.format = "csv" if self.path.suffix.lower() == ".csv" else "jsonl"
+        self.header = None
+        self.offsets = array("q")
+        self._build_index()
+    
+    @classmethod
+    def get(cls, path):
+        """Shared source of a data file"""
+        key = str(Path(path).resolve())
+        source = cls._sources.get(key)
+        if source is None:
+            source = cls._sources[key] = cls(path)
+        return source
+    
+    def _build_index(self):
+        """Record the byte offset of every data row"""
+        if not self.path.exists():
+            raise FileNotFoundError(f"Data source not found: {self.path}")
+        
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    if self.format == "csv" and self.header is None:
+                        self.header = next(csv.reader([line.decode("utf-8-sig")]))
+                    else:
+                        self.offsets.append(offset)
+                offset += len(line)
+    
+    def __len__(self):
+        return len(self.offsets)
+    
+    def row(self, index):
+        """Read and parse a single row"""
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[index])
+            line = f.readline().decode("utf-8")
+        
+        if self.format == "csv":
+            return dict(zip(self.header, next(csv.reader([line]))))
+        return json.loads(line)
+    
+    def select(self, sample=None, seed=0, shard=None):
+        """Row numbers to run: an optional deterministic sample, then a shard of it
+        
+        sample is a row count or a fraction of the file, shard is (index, count)
+        with a zero based index. The same arguments always select the same rows.
+        """
+        indices = range(len(self))
+        if sample:
+            count = int(len(self) * sample) if isinstance(sample, float) else int(sample)
+            if count < len(self):
+                # Sampling a range does not materialize the whole file
+                indices = sorted(random.Random(seed).sample(indices, count))
+        
+        if shard:
+            shard_index, shard_count = shard
+            indices = indices[shard_index::shard_count]
+        return list(indices)
+    
+    def param_id(self, index):
+        """Test id of a row, derived from the index without reading the row"""
+        return f"{self.path.stem}-{index}"
+
+def parse_shard(shard):
+    """Parse a one based shard like 2/4 into a zero based (index, count)"""
+    if not shard:
+        return None
+    number, _, count = str(shard).partition("/")
+    number, count = int(number), int(count)
+    if not 1 <= number <= count:
+        raise ValueError(f"Invalid data shard: {shard}")
+    return number - 1, count
@@ -0,0 +1,78 @@
+import time
+from contextlib import contextmanager
+
+class Deadline:
+    """Wall-clock budget of a single test shared by all of its waits"""
+    
+    def __init__(self, budget, explicit_wait=10, page_load_timeout=30, name=None):
+        self.budget = budget
+        self.explicit_wait = explicit_wait
+        self.page_load_timeout = page_load_timeout
+        self.name = name
+        self.started_at = time.monotonic()
+        self.steps = []
+        self.exhausted_by = None
+    
+    def elapsed(self):
+        """Seconds spent since the deadline started"""
+        return time.monotonic() - self.started_at
+    
+    def remaining(self):
+        """Seconds left in the budget, never negative"""
+        return max(0.0, self.budget - self.elapsed())
+    
+    def expired(self):
+        """Check if the budget is used up"""
+        return self.remaining() <= 0
+    
+    def timeout(self, requested=None, page_load=False):
+        """Timeout for a single wait, capped by what is left of the budget"""
+        if requested is None:
+            requested = self.page_load_timeout if page_load else self.explicit_wait
+        return min(requested, self.remaining())
+    
+    @contextmanager
+    def step(self, name):
+        """Record how much of the budget a step consumed"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            consumed = time.monotonic() - start
+            self.steps.append((name, consumed))
+            if self.exhausted_by is None and self.expired():
+                self.exhausted_by = name
+    
+    def summary(self, top=10):
+        """Human readable breakdown of where the budget went"""
+        lines = [
+            f"Budget: {self.budget:.1f}s, used: {min(self.elapsed(), self.budget):.2f}s, "
+            f"remaining: {self.remaining():.2f}s"
+        ]
+        if self.exhausted_by:
+            lines.append(f"Budget exhausted during: {self.exhausted_by}")
+        
+        totals = {}
+        for name, consumed in self.steps:
+            totals[name] = totals.get(name, 0.0) + consumed
+        lines.append("Slowest steps:")
+        for name, consumed in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]:
+            lines.append(f"  {consumed:8.3f}s  {name}")
+        return "\n".join(lines)
+
+_current = None
+
+def start_deadline(budget, explicit_wait=10, page_load_timeout=30, name=None):
+    """Start the deadline of the running test"""
+    global _current
+    _current = Deadline(budget, explicit_wait, page_load_timeout, name)
+    return _current
+
+def current_deadline():
+    """Get the deadline of the running test, None outside of a test"""
+    return _current
+
+def clear_deadline():
+    """Drop the deadline of the finished test"""
+    global _current
+    _current = None
@@ -0,0 +1,132 @@
+import json
+import os
+import time
+from utils.webdriver_factory import WebDriverFactory
+from utils.logger import logger
+
+class DriverPool:
+    """Pool of warm WebDriver instances owned by a single test worker"""
+    
+    def __init__(self, factory: WebDriverFactory, max_uses=50, reset_url="about:blank"):
+        self.factory = factory
+        self.max_uses = max_uses
+        self.reset_url = reset_url
+        self.worker_id = os.getenv("PYTEST_XDIST_WORKER", "master")
+        self._idle = []
+        self._uses = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "recycled": 0,
+            "reset_failures": 0,
+            "resets": 0,
+            "reset_time": 0.0,
+            "max_reset_time": 0.0
+        }
+    
+    def acquire(self):
+        """Return a warm driver from the pool or launch a new one"""
+        if self._idle:
+            self.stats["hits"] += 1
+            return self._idle.pop()
+        
+        self.stats["misses"] += 1
+        driver = self.factory.create_driver()
+        self._uses[id(driver)] = 0
+        return driver
+    
+    def release(self, driver, failed=False):
+        """Give a driver back to the pool, resetting or recycling it"""
+        # Drivers are recycled after max_uses tests or after a failed test
+        uses = self._uses.get(id(driver), 0) + 1
+        self._uses[id(driver)] = uses
+        
+        if failed or uses >= self.max_uses:
+            self.stats["recycled"] += 1
+            self._discard(driver)
+            return
+        
+        if self._reset(driver):
+            self._idle.append(driver)
+        else:
+            self.stats["reset_failures"] += 1
+            self._discard(driver)
+    
+    def _reset(self, driver):
+        """Bring a driver back to a pristine state, return False if it is unusable"""
+        start = time.perf_counter()
+        try:
+            # Close every window except the first one
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            
+            # Storage is only reachable for the origin that is currently loaded
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                pass
+            
+            driver.delete_all_cookies()
+            if hasattr(driver, "execute_cdp_cmd"):
+                # Chromium only: also drop cookies set for other domains
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            
+            driver.get(self.reset_url)
+            return True
+        except Exception as e:
+            logger.warning("Driver reset failed, recycling driver: %s", e)
+            return False
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stats["resets"] += 1
+            self.stats["reset_time"] += elapsed
+            self.stats["max_reset_time"] = max(self.stats["max_reset_time"], elapsed)
+    
+    def _discard(self, driver):
+        """Quit a driver and forget about it"""
+        self._uses.pop(id(driver), None)
+        self.factory.quit_driver(driver)
+    
+    def close(self):
+        """Quit all idle drivers and wait for the factory's background work"""
+        while self._idle:
+            self._discard(self._idle.pop())
+        self.factory.shutdown()
+    
+    def get_stats(self):
+        """Get pool statistics"""
+        resets = self.stats["resets"]
+        requests = self.stats["hits"] + self.stats["misses"]
+        return {
+            "worker": self.worker_id,
+            **self.stats,
+            "hit_rate": self.stats["hits"] / requests if requests else 0.0,
+            "avg_reset_time": self.stats["reset_time"] / resets if resets else 0.0,
+            "fresh_browsers": self.factory.get_stats()
+        }
+    
+    def report_stats(self, report_path=None):
+        """Log pool statistics and save them next to the reports"""
+        stats = self.get_stats()
+        logger.info(
+            "🏊 Driver pool [%s]: %d hits, %d misses, %d recycled, avg reset %.3fs",
+            stats["worker"], stats["hits"], stats["misses"], stats["recycled"], stats["avg_reset_time"]
+        )
+        fresh = stats["fresh_browsers"]
+        if fresh["fresh_drivers"]:
+            logger.info(
+                "🚀 Fresh browsers [%s]: %d launched, %.0f%% prelaunched, avg handover wait %.3fs",
+                stats["worker"], fresh["fresh_drivers"], fresh["prelaunch_hit_rate"] * 100, fresh["avg_handover_wait"]
+            )
+        
+        report_path = report_path or os.getenv("REPORT_PATH")
+        if report_path:
+            os.makedirs(report_path, exist_ok=True)
+            stats_file = os.path.join(report_path, f"driver_pool_{stats['worker']}.json")
+            with open(stats_file, "w") as f:
+                json.dump(stats, f, indent=4)
+        
+        return stats
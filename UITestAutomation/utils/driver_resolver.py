@@ -0,0 +1,147 @@
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from utils.file_lock import FileLock
+from utils.logger import logger
+
+DRIVER_BINARIES = {
+    "chrome": "chromedriver",
+    "firefox": "geckodriver",
+    "edge": "msedgedriver"
+}
+
+# Browser names used by webdriver-manager to read the installed browser version
+BROWSER_TYPES = {
+    "chrome": "google-chrome",
+    "firefox": "firefox",
+    "edge": "edge"
+}
+
+class DriverResolver:
+    """Resolve driver binaries once and cache their paths in a shared on-disk manifest"""
+    
+    # In-process cache, shared by every factory of the same worker
+    _resolved = {}
+    _browser_majors = {}
+    
+    def __init__(self, cache_dir=".driver_cache", ttl_hours=24, pinned_versions=None, offline=False):
+        self.cache_dir = Path(cache_dir)
+        self.manifest_file = self.cache_dir / "manifest.json"
+        self.lock_file = self.cache_dir / "manifest.lock"
+        self.ttl = ttl_hours * 3600
+        self.pinned_versions = pinned_versions or {}
+        self.offline = offline or os.getenv("DRIVER_OFFLINE", "").lower() in ("1", "true", "yes")
+    
+    @classmethod
+    def from_config(cls, config):
+        """Create resolver from framework configuration"""
+        return cls(
+            cache_dir=config.driver_cache_dir,
+            ttl_hours=config.driver_cache_ttl_hours,
+            pinned_versions=config.driver_pinned_versions,
+            offline=config.driver_offline
+        )
+    
+    def resolve(self, browser):
+        """Get the driver binary path for the given browser"""
+        browser = browser.lower()
+        if browser not in DRIVER_BINARIES:
+            raise ValueError(f"Unsupported browser: {browser}")
+        
+        version = self.pinned_versions.get(browser) or "latest"
+        key = f"{browser}:{version}"
+        if version == "latest":
+            # A browser upgrade inside the TTL needs a matching driver, not the cached one
+            major = self.browser_major(browser)
+            if major:
+                key = f"{key}:{major}"
+        
+        path = self._resolved.get(key)
+        if path and os.path.exists(path):
+            return path
+        
+        entry = self._read_manifest().get(key)
+        if not self._is_valid(entry, version):
+            with FileLock(self.lock_file):
+                # Another worker may have resolved it while we were waiting
+                manifest = self._read_manifest()
+                entry = manifest.get(key)
+                if not self._is_valid(entry, version):
+                    entry = {
+                        "path": self._download(browser, version),
+                        "version": version,
+                        "resolved_at": time.time()
+                    }
+                    manifest[key] = entry
+                    self._write_manifest(manifest)
+        
+        self._resolved[key] = entry["path"]
+        return entry["path"]
+    
+    @classmethod
+    def browser_major(cls, browser):
+        """Major version of the installed browser, None if it cannot be detected"""
+        if browser not in cls._browser_majors:
+            major = None
+            try:
+                from webdriver_manager.core.os_manager import OperationSystemManager
+                version = OperationSystemManager().get_browser_version_from_os(BROWSER_TYPES[browser])
+                if version:
+                    major = version.split(".")[0]
+            except Exception as e:
+                logger.debug("Could not detect the %s version: %s", browser, e)
+            cls._browser_majors[browser] = major
+        return cls._browser_majors[browser]
+    
+    def _is_valid(self, entry, version):
+        """Check if a manifest entry can be used without resolving again"""
+        if not entry or not os.path.exists(entry.get("path", "")):
+            return False
+        if self.offline or version != "latest":
+            # Pinned versions and offline runs never expire
+            return True
+        return time.time() - entry.get("resolved_at", 0) < self.ttl
+    
+    def _download(self, browser, version):
+        """Resolve the driver through webdriver-manager or from PATH in offline mode"""
+        if self.offline:
+            path = shutil.which(DRIVER_BINARIES[browser])
+            if not path:
+                raise FileNotFoundError(
+                    f"Offline mode: {DRIVER_BINARIES[browser]} not found in cache or on PATH"
+                )
+            logger.info("🔌 Offline driver for %s: %s", browser, path)
+            return path
+        
+        pinned = None if version == "latest" else version
+        if browser == "chrome":
+            from webdriver_manager.chrome import ChromeDriverManager
+            manager = ChromeDriverManager(driver_version=pinned)
+        elif browser == "firefox":
+            from webdriver_manager.firefox import GeckoDriverManager
+            manager = GeckoDriverManager(version=pinned)
+        else:
+            from webdriver_manager.microsoft import EdgeChromiumDriverManager
+            manager = EdgeChromiumDriverManager(version=pinned)
+        
+        path = manager.install()
+        logger.info("⬇️ Resolved %s driver %s: %s", browser, version, path)
+        return path
+    
+    def _read_manifest(self):
+        """Read the manifest, an unreadable manifest counts as empty"""
+        try:
+            with open(self.manifest_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _write_manifest(self, manifest):
+        """Atomically replace the manifest file"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_file = self.manifest_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(temp_file, self.manifest_file)
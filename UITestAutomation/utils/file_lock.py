@@ -0,0 +1,53 @@
+import os
+import time
+
+class FileLock:
+    """Cross-process lock based on exclusive creation of a lock file"""
+    
+    def __init__(self, lock_file, timeout=120, stale_after=300, poll_interval=0.05):
+        self.lock_file = str(lock_file)
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self._fd = None
+    
+    def acquire(self):
+        """Block until the lock file could be created"""
+        deadline = time.monotonic() + self.timeout
+        os.makedirs(os.path.dirname(self.lock_file) or ".", exist_ok=True)
+        
+        while True:
+            try:
+                self._fd = os.open(self.lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._fd, str(os.getpid()).encode())
+                return
+            except FileExistsError:
+                self._break_stale_lock()
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Could not acquire lock: {self.lock_file}")
+                time.sleep(self.poll_interval)
+    
+    def release(self):
+        """Release the lock"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            try:
+                os.remove(self.lock_file)
+            except FileNotFoundError:
+                pass
+    
+    def _break_stale_lock(self):
+        """Remove a lock left behind by a crashed process"""
+        try:
+            if time.time() - os.path.getmtime(self.lock_file) > self.stale_after:
+                os.remove(self.lock_file)
+        except OSError:
+            pass
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
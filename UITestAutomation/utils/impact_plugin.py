@@ -0,0 +1,86 @@
+import glob
+import json
+import os
+import pytest
+from utils.logger import logger
+from utils.test_impact import ImpactIndex, ImpactRecorder
+
+_recorder = None
+
+def pytest_addoption(parser):
+    group = parser.getgroup("ui")
+    group.addoption(
+        "--record-impact", action="store_true", default=False,
+        help="Record the functions every test calls into reports/test_impact.json"
+    )
+    group.addoption(
+        "--impact-selection", default=None, metavar="FILE",
+        help="Run only the tests a run_tests.py --changed-since selection lists, plus tests unknown to the index"
+    )
+
+def _reports_dir():
+    return os.getenv("REPORTS_DIR", "reports")
+
+def pytest_configure(config):
+    global _recorder
+    if not config.getoption("--record-impact"):
+        return
+    if not hasattr(config, "workerinput"):
+        # Leftovers of an interrupted recording must not end up in the index
+        for partial in glob.glob(os.path.join(ImpactIndex.partial_dir(_reports_dir()), "impact_*.json")):
+            os.remove(partial)
+    _recorder = ImpactRecorder(str(config.rootpath))
+    if not _recorder.start():
+        logger.warning("⚠️ Another trace function is active (coverage?), test impact is not recorded")
+        _recorder = None
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Attribute every call made while the test runs to the test"""
+    if _recorder is None:
+        yield
+        return
+    _recorder.start_test(item.nodeid)
+    yield
+    _recorder.finish_test()
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """Calls of session and module fixtures serve all tests, not the one that happens to set them up"""
+    if _recorder is None or fixturedef.scope == "function":
+        yield
+        return
+    previous = _recorder.record_shared()
+    yield
+    _recorder.restore(previous)
+
+def pytest_collection_modifyitems(session, config, items):
+    """Deselect recorded tests the selection did not pick, tests the index does not know always run"""
+    selection_file = config.getoption("--impact-selection")
+    if not selection_file:
+        return
+    with open(selection_file, "r", encoding="utf-8") as f:
+        selection = json.load(f)
+    if selection["full_suite"]:
+        return
+    
+    known, selected = set(selection["known"]), set(selection["selected"])
+    keep, skip = [], []
+    for item in items:
+        (keep if item.nodeid in selected or item.nodeid not in known else skip).append(item)
+    if skip:
+        config.hook.pytest_deselected(items=skip)
+        items[:] = keep
+
+def pytest_sessionfinish(session, exitstatus):
+    """Save what this process recorded, the controller merges everything into the index"""
+    if _recorder is None:
+        return
+    _recorder.stop()
+    worker = os.getenv("PYTEST_XDIST_WORKER", "master")
+    if _recorder.tests:
+        _recorder.save(os.path.join(ImpactIndex.partial_dir(_reports_dir()), f"impact_{worker}.json"))
+    if not hasattr(session.config, "workerinput"):
+        index = ImpactIndex.build(_reports_dir())
+        if index:
+            logger.info("🎯 Test impact index: %d tests recorded at %s", len(index.tests), index.commit[:10])
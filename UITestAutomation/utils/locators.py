@@ -0,0 +1,65 @@
+from selenium.webdriver.common.by import By
+
+def css_string(value):
+    """Double quoted CSS string, e.g. for attribute selectors"""
+    escaped = []
+    for char in value:
+        if char in '"\\':
+            escaped.append("\\" + char)
+        elif ord(char) < 0x20 or ord(char) == 0x7F:
+            escaped.append(f"\\{ord(char):x} ")
+        else:
+            escaped.append(char)
+    return '"' + "".join(escaped) + '"'
+
+def css_identifier(value):
+    """Escape a class name or id for a CSS selector, following CSS.escape()"""
+    escaped = []
+    for index, char in enumerate(value):
+        code = ord(char)
+        if code == 0:
+            escaped.append("\ufffd")
+        elif code < 0x20 or code == 0x7F or ("0" <= char <= "9" and (index == 0 or (index == 1 and value[0] == "-"))):
+            escaped.append(f"\\{code:x} ")
+        elif char == "-" and index == 0 and len(value) == 1:
+            escaped.append("\\-")
+        elif code >= 0x80 or char in "-_" or (char.isascii() and char.isalnum()):
+            escaped.append(char)
+        else:
+            escaped.append("\\" + char)
+    return "".join(escaped)
+
+def xpath_literal(value):
+    """XPath string literal, XPath 1.0 has no escapes so mixed quotes go through concat()"""
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    parts = value.split('"')
+    return "concat(" + ", '\"', ".join(f'"{part}"' for part in parts) + ")"
+
+def css_selector(by, value):
+    """CSS selector for the strategies W3C drivers only know through CSS, None for the others"""
+    if by == By.ID:
+        return f"[id={css_string(value)}]"
+    if by == By.NAME:
+        return f"[name={css_string(value)}]"
+    if by == By.CLASS_NAME:
+        return f".{css_identifier(value)}"
+    return None
+
+def to_script_locator(locator):
+    """Convert a Selenium locator to a [kind, selector] pair usable from JavaScript"""
+    by, value = locator
+    if by in (By.CSS_SELECTOR, By.TAG_NAME):
+        return ["css", value]
+    if by == By.XPATH:
+        return ["xpath", value]
+    if by == By.LINK_TEXT:
+        return ["xpath", f"//a[normalize-space(.)={xpath_literal(value)}]"]
+    if by == By.PARTIAL_LINK_TEXT:
+        return ["xpath", f"//a[contains(., {xpath_literal(value)})]"]
+    selector = css_selector(by, value)
+    if selector is None:
+        raise ValueError(f"Unsupported locator strategy: {by}")
+    return ["css", selector]
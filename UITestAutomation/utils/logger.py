@@ -1,105 +1,226 @@
+import atexit
+import heapq
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import re
+import threading
 from datetime import datetime
 from pathlib import Path
 
+# Matches the timestamp that starts every record of the text format
+RECORD_START = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}) - ")
+
+def get_run_id():
+    """Identifier shared by all processes of a test run, inherited by xdist workers"""
+    return os.environ.setdefault("TEST_RUN_ID", datetime.now().strftime("%Y%m%d_%H%M%S_%f"))
+
+def get_worker_id():
+    """xdist worker id, or master outside of xdist"""
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+    
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "worker": get_worker_id(),
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+    
+    def formatTime(self, record, datefmt=None):
+        return datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
 class TestLogger:
     """Custom logger for test automation framework"""
     
-    def __init__(self, name="UI_Test_Automation", log_level=logging.INFO):
+    def __init__(self, name="UI_Test_Automation", log_level=logging.INFO, log_dir="logs", console=True):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(log_level)
-        
-        # Prevent duplicate handlers
-        if not self.logger.handlers:
-            self._setup_handlers()
+        self.log_dir = Path(log_dir)
+        self.console = console
+        self.log_file = None
+        self.listener = None
+        self._handlers = []
+        self._queue_handler = None
+        self._lock = threading.Lock()
+        # Handlers are created on first use so that the run id is known by then
+        self._started = bool(self.logger.handlers)
+    
+    def _ensure_started(self):
+        """Setup handlers on first use"""
+        if not self._started:
+            with self._lock:
+                if not self._started:
+                    self._setup_handlers()
+                    self._started = True
     
     def _setup_handlers(self):
-        """Setup console and file handlers"""
+        """Setup console and file handlers behind a queue drained by a listener thread"""
         # Create logs directory
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
+        self.log_dir.mkdir(exist_ok=True)
         
-        # Create timestamp for log file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = log_dir / f"test_execution_{timestamp}.log"
+        # One file per run and worker, workers never share a file
+        self.log_file = self.log_dir / f"test_execution_{get_run_id()}_{get_worker_id()}.log"
         
         # File handler
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
+        self._handlers = [file_handler]
         
         # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
+        if self.console:
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            self._handlers.append(console_handler)
         
         # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        if os.getenv("LOG_FORMAT", "").lower() == "json":
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(
+                '%(asctime)s.%(msecs)03d - %(name)s - %(levelname)s - %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            )
+        for handler in self._handlers:
+            handler.setFormatter(formatter)
         
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # Add handlers to logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-    
-    def info(self, message):
+        # Records are handed to the listener thread, disk writes leave the test thread
+        log_queue = queue.SimpleQueue()
+        self._queue_handler = logging.handlers.QueueHandler(log_queue)
+        self.logger.addHandler(self._queue_handler)
+        self.listener = logging.handlers.QueueListener(log_queue, *self._handlers, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop)
+    
+    def stop(self):
+        """Flush queued records and continue logging synchronously"""
+        with self._lock:
+            if self.listener is None:
+                return
+            self.listener.stop()
+            self.listener = None
+            self.logger.removeHandler(self._queue_handler)
+            for handler in self._handlers:
+                handler.flush()
+                self.logger.addHandler(handler)
+    
+    # Messages use %-style arguments, they are only formatted if the record is emitted
+    
+    def info(self, message, *args):
         """Log info message"""
-        self.logger.info(message)
+        self._ensure_started()
+        self.logger.info(message, *args)
     
-    def debug(self, message):
+    def debug(self, message, *args):
         """Log debug message"""
-        self.logger.debug(message)
+        self._ensure_started()
+        self.logger.debug(message, *args)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """Log warning message"""
-        self.logger.warning(message)
+        self._ensure_started()
+        self.logger.warning(message, *args)
     
-    def error(self, message):
+    def error(self, message, *args):
         """Log error message"""
-        self.logger.error(message)
+        self._ensure_started()
+        self.logger.error(message, *args)
     
-    def critical(self, message):
+    def critical(self, message, *args):
         """Log critical message"""
-        self.logger.critical(message)
+        self._ensure_started()
+        self.logger.critical(message, *args)
     
     def log_test_start(self, test_name):
         """Log test start"""
-        self.info(f"🚀 Starting test: {test_name}")
+        self.info("🚀 Starting test: %s", test_name)
     
     def log_test_end(self, test_name, status="PASSED"):
         """Log test end"""
-        self.info(f"✅ Test {test_name} {status}")
+        self.info("✅ Test %s %s", test_name, status)
     
     def log_test_failure(self, test_name, error_message):
         """Log test failure"""
-        self.error(f"❌ Test {test_name} FAILED: {error_message}")
+        self.error("❌ Test %s FAILED: %s", test_name, error_message)
     
     def log_browser_action(self, action, details=""):
         """Log browser action"""
-        self.debug(f"🌐 Browser Action: {action} {details}")
+        self.debug("🌐 Browser Action: %s %s", action, details)
     
     def log_page_load(self, url):
         """Log page load"""
-        self.debug(f"📄 Loading page: {url}")
+        self.debug("📄 Loading page: %s", url)
     
     def log_element_action(self, action, element_info):
         """Log element action"""
-        self.debug(f"🔍 Element Action: {action} on {element_info}")
+        self.debug("🔍 Element Action: %s on %s", action, element_info)
     
     def log_screenshot(self, screenshot_path):
         """Log screenshot taken"""
-        self.debug(f"📸 Screenshot saved: {screenshot_path}")
+        self.debug("📸 Screenshot saved: %s", screenshot_path)
     
     def log_configuration(self, config_info):
         """Log configuration information"""
-        self.info(f"⚙️ Configuration: {config_info}")
+        self.info("⚙️ Configuration: %s", config_info)
     
     def log_performance(self, operation, duration):
         """Log performance metrics"""
-        self.info(f"⏱️ Performance: {operation} took {duration:.2f} seconds")
+        self.debug("⏱️ Performance: %s took %.2f seconds", operation, duration)
+
+def _is_json_log(log_file):
+    """Check if a worker log was written in the JSON format, judged by its first line"""
+    with open(log_file, "r", encoding="utf-8") as f:
+        return f.readline().startswith("{")
+
+def _read_records(log_file, worker_index, json_lines=False):
+    """Yield (timestamp, worker index, record text) for every record of a worker log"""
+    timestamp, lines = None, []
+    with open(log_file, "r", encoding="utf-8") as f:
+        for line in f:
+            if json_lines:
+                # One record per line
+                yield json.loads(line)["time"], worker_index, line
+                continue
+            
+            # Only the timestamp starts a record, a message line may start with anything
+            match = RECORD_START.match(line)
+            if match:
+                if lines:
+                    yield timestamp, worker_index, "".join(lines)
+                timestamp, lines = match.group(1), [line]
+            else:
+                # Continuation of a multi-line message
+                lines.append(line)
+    if lines:
+        yield timestamp or "", worker_index, "".join(lines)
+
+def merge_worker_logs(log_dir="logs", run_id=None):
+    """Merge the per-worker logs of a run into one file ordered by time"""
+    run_id = run_id or get_run_id()
+    worker_logs = sorted(Path(log_dir).glob(f"test_execution_{run_id}_*.log"))
+    if not worker_logs:
+        return None
+    
+    merged_file = Path(log_dir) / f"test_execution_{run_id}.log"
+    json_logs = [_is_json_log(log_file) for log_file in worker_logs]
+    streams = [
+        _read_records(log_file, index, json_logs[index]) for index, log_file in enumerate(worker_logs)
+    ]
+    with open(merged_file, "w", encoding="utf-8") as f:
+        for _, worker_index, record in heapq.merge(*streams):
+            if not json_logs[worker_index]:
+                record = f"[{worker_logs[worker_index].stem.rsplit('_', 1)[-1]}] {record}"
+            f.write(record)
+    return merged_file
 
 # Global logger instance
 logger = TestLogger()
@@ -0,0 +1,123 @@
+import json
+from utils.logger import logger
+
+# File extensions blocked together, Network.setBlockedURLs only matches URLs so
+# extensionless images, fonts served from CSS APIs and other files ending in
+# one of these extensions are not told apart
+EXTENSION_GROUPS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "avif"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "ogg", "mp3", "wav"],
+    "stylesheet": ["css"]
+}
+
+def extension_patterns(extension):
+    """URL patterns of a file extension, with and without a query string"""
+    return [f"*.{extension}", f"*.{extension}?*"]
+
+# Typical transfer sizes used to estimate the bytes a blocked request saved
+DEFAULT_ESTIMATED_BYTES = {
+    "Image": 30000,
+    "Font": 40000,
+    "Media": 500000,
+    "Script": 60000,
+    "Stylesheet": 20000,
+    "Other": 5000
+}
+
+class NetworkPolicy:
+    """Network profile applied to Chromium drivers through DevTools commands"""
+    
+    def __init__(self, name, block_patterns=None, block_extensions=None, stubs=None,
+                 throttle=None, estimated_bytes=None):
+        self.name = name
+        self.block_patterns = list(block_patterns or [])
+        self.block_extensions = list(block_extensions or [])
+        self.stubs = dict(stubs or {})
+        self.throttle = throttle
+        self.estimated_bytes = dict(DEFAULT_ESTIMATED_BYTES, **(estimated_bytes or {}))
+        self.totals = {"blocked_requests": 0, "bytes_saved": 0}
+    
+    @classmethod
+    def from_config(cls, config):
+        """Create the active network profile, None when no profile is selected"""
+        name = config.network_profile
+        if not name or name == "none":
+            return None
+        
+        profiles = config.network_profiles
+        if name not in profiles:
+            raise ValueError(f"Unknown network profile: {name}")
+        
+        profile = profiles[name]
+        return cls(
+            name,
+            block_patterns=profile.get("block_patterns"),
+            block_extensions=profile.get("block_extensions"),
+            stubs=profile.get("stubs"),
+            throttle=profile.get("throttle"),
+            estimated_bytes=profile.get("estimated_bytes")
+        )
+    
+    def blocked_urls(self):
+        """All URL patterns to block, including file extensions and stubbed scripts"""
+        urls = list(self.block_patterns)
+        for entry in self.block_extensions:
+            # A group name or a single extension such as "png"
+            for extension in EXTENSION_GROUPS.get(entry, [entry.lstrip(".")]):
+                urls.extend(extension_patterns(extension))
+        # Stubbed third-party scripts are never downloaded
+        urls.extend(self.stubs)
+        return urls
+    
+    def apply(self, driver):
+        """Install the profile on a freshly created driver"""
+        if not hasattr(driver, "execute_cdp_cmd"):
+            logger.warning("⚠️ Network profile '%s' needs a Chromium based browser, skipped", self.name)
+            return
+        
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls()})
+        
+        # The DevTools bridge cannot answer intercepted requests synchronously, so
+        # stubbed hosts are blocked and their JavaScript API is replaced in the page
+        for source in self.stubs.values():
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        
+        if self.throttle:
+            # Throughput is in bytes per second, -1 disables the limit
+            download = self.throttle.get("download_kbps")
+            upload = self.throttle.get("upload_kbps")
+            driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+                "offline": False,
+                "latency": self.throttle.get("latency_ms", 0),
+                "downloadThroughput": download * 1024 / 8 if download else -1,
+                "uploadThroughput": upload * 1024 / 8 if upload else -1
+            })
+        
+        logger.debug("🚦 Network profile '%s' applied", self.name)
+    
+    def collect_stats(self, driver):
+        """Count requests blocked since the last call from the performance log"""
+        stats = {"blocked_requests": 0, "bytes_saved": 0, "by_type": {}}
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return stats
+        
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            if message.get("method") != "Network.loadingFailed":
+                continue
+            params = message.get("params", {})
+            if not params.get("blockedReason"):
+                continue
+            
+            resource_type = params.get("type", "Other")
+            stats["blocked_requests"] += 1
+            stats["bytes_saved"] += self.estimated_bytes.get(resource_type, self.estimated_bytes["Other"])
+            stats["by_type"][resource_type] = stats["by_type"].get(resource_type, 0) + 1
+        
+        self.totals["blocked_requests"] += stats["blocked_requests"]
+        self.totals["bytes_saved"] += stats["bytes_saved"]
+        return stats
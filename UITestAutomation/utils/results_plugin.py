@@ -0,0 +1,46 @@
+import os
+import pytest
+from utils.artifact_writer import artifact_writer
+from utils.logger import logger
+from utils.results_writer import ResultsWriter
+
+_writer = None
+
+def _results_dir():
+    return os.getenv("REPORT_PATH", "reports")
+
+def pytest_configure(config):
+    """Only the process that sees every report writes results: the xdist controller or a plain run"""
+    global _writer
+    # Records link to the attachments Allure writes, workers attach too
+    artifact_writer.configure(allure_dir=config.getoption("allure_report_dir", None))
+    if not hasattr(config, "workerinput"):
+        _writer = ResultsWriter(_results_dir()).open()
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    # Attachments made outside of a test, e.g. by session fixtures, belong to no record
+    artifact_writer.take_attachments()
+    yield
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Hand the attachments of a finished test to the results, xdist ships them with the report"""
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == "teardown":
+        report.attachments = artifact_writer.take_attachments()
+
+def pytest_runtest_logreport(report):
+    if _writer is not None:
+        _writer.add_report(report, worker=getattr(report, "worker_id", None) or "master")
+
+def pytest_sessionfinish(session, exitstatus):
+    if _writer is None:
+        return
+    _writer.close()
+    logger.info(
+        "🗒️ Results: %d records, %.1f KB, %.3fs writing, viewer %s",
+        _writer.stats["records"], _writer.stats["bytes"] / 1024, _writer.stats["write_time"],
+        os.path.join(_writer.results_dir, "index.html")
+    )
@@ -0,0 +1,233 @@
+import json
+import os
+import time
+
+# Failure text kept per test, the full traceback stays in pytest_output.log
+MAX_MESSAGE_LENGTH = 4000
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Test Results</title>
+<style>
+body { font-family: sans-serif; margin: 1em; }
+#summary span { margin-right: 1em; }
+table { border-collapse: collapse; width: 100%; }
+td { border-bottom: 1px solid #ddd; padding: 4px; vertical-align: top; }
+tr.test { cursor: pointer; }
+.passed { color: #2e7d32; } .failed, .error { color: #c62828; } .skipped, .rerun { color: #9e9e9e; }
+pre { white-space: pre-wrap; background: #f5f5f5; padding: 8px; }
+img { max-width: 480px; margin: 4px; border: 1px solid #ccc; }
+</style>
+</head>
+<body>
+<h1>Test Results</h1>
+<div id="summary">Loading results.jsonl...</div>
+<p>
+<select id="outcome"><option value="">all</option><option>failed</option><option>error</option><option>passed</option><option>skipped</option><option>rerun</option></select>
+<input id="search" placeholder="filter node id" size="60">
+</p>
+<table><tbody id="rows"></tbody></table>
+<script>
+// Records are parsed while the file streams in, details are built only when a row is opened
+const records = [];
+const counts = {};
+const rows = document.getElementById("rows");
+const PAGE = 500;
+let shown = 0;
+
+function matches(record) {
+  const outcome = document.getElementById("outcome").value;
+  const search = document.getElementById("search").value;
+  return (!outcome || record.outcome === outcome) && (!search || record.nodeid.includes(search));
+}
+
+function row(record) {
+  const tr = document.createElement("tr");
+  tr.className = "test";
+  tr.innerHTML = `<td class="${record.outcome}">${record.outcome}</td><td></td><td>${record.duration.toFixed(2)}s</td><td>${record.worker}</td>`;
+  tr.children[1].textContent = record.nodeid;
+  tr.onclick = () => toggle(tr, record);
+  return tr;
+}
+
+function toggle(tr, record) {
+  if (tr.nextSibling && tr.nextSibling.className === "details") {
+    tr.nextSibling.remove();
+    return;
+  }
+  const details = document.createElement("tr");
+  details.className = "details";
+  const td = document.createElement("td");
+  td.colSpan = 4;
+  if (record.message) {
+    const pre = document.createElement("pre");
+    pre.textContent = record.message;
+    td.appendChild(pre);
+  }
+  for (const attachment of record.attachments || []) {
+    if (!attachment.path) continue;
+    if ((attachment.type || "").startsWith("image/")) {
+      const img = document.createElement("img");
+      img.loading = "lazy";
+      img.src = attachment.path;
+      img.title = attachment.name;
+      td.appendChild(img);
+    } else {
+      const link = document.createElement("a");
+      link.href = attachment.path;
+      link.textContent = attachment.name;
+      td.appendChild(link);
+      td.appendChild(document.createElement("br"));
+    }
+  }
+  details.appendChild(td);
+  tr.after(details);
+}
+
+function render(reset) {
+  if (reset) {
+    rows.innerHTML = "";
+    shown = 0;
+  }
+  const fragment = document.createDocumentFragment();
+  let added = 0;
+  for (const record of records) {
+    if (added >= shown + PAGE) break;
+    if (!matches(record)) continue;
+    if (added++ >= shown) fragment.appendChild(row(record));
+  }
+  shown = added;
+  rows.appendChild(fragment);
+  summary();
+}
+
+function summary() {
+  document.getElementById("summary").innerHTML = Object.entries(counts)
+    .map(([outcome, count]) => `<span class="${outcome}">${outcome}: ${count}</span>`).join("") +
+    `<span>total: ${records.length}</span>`;
+}
+
+function add(line) {
+  if (!line.trim()) return;
+  const record = JSON.parse(line);
+  records.push(record);
+  counts[record.outcome] = (counts[record.outcome] || 0) + 1;
+}
+
+async function load() {
+  const response = await fetch("results.jsonl");
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let rest = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    const lines = (rest + value).split("\\n");
+    rest = lines.pop();
+    lines.forEach(add);
+    if (shown < PAGE) render(true);
+    else summary();
+  }
+  add(rest);
+  render(true);
+}
+
+window.onscroll = () => {
+  if (window.innerHeight + window.scrollY >= document.body.offsetHeight - 200) render(false);
+};
+document.getElementById("outcome").onchange = () => render(true);
+document.getElementById("search").oninput = () => render(true);
+load().catch(error => {
+  document.getElementById("summary").textContent =
+    `Could not load results.jsonl (${error}). Serve this folder, e.g. python -m http.server`;
+});
+</script>
+</body>
+</html>
+"""
+
+class ResultsWriter:
+    """Appends one JSON record per finished test to results.jsonl next to a static viewer
+    
+    Each record is written and flushed as its test finishes, so the cost per
+    test stays the same however large the run gets. Screenshots and other
+    attachments are linked, not embedded.
+    """
+    
+    def __init__(self, results_dir):
+        self.results_dir = results_dir
+        self.results_file = os.path.join(results_dir, "results.jsonl")
+        self._file = None
+        self._phases = {}
+        self.stats = {"records": 0, "bytes": 0, "write_time": 0.0}
+    
+    def open(self):
+        """Start a results file and place the viewer next to it"""
+        os.makedirs(self.results_dir, exist_ok=True)
+        with open(os.path.join(self.results_dir, "index.html"), "w", encoding="utf-8") as f:
+            f.write(VIEWER_HTML)
+        # One file per run, a folder reused without REPORT_PATH starts over
+        self._file = open(self.results_file, "w", encoding="utf-8")
+        return self
+    
+    def add_report(self, report, worker="master"):
+        """Collect a phase report, the record is written with the teardown report"""
+        phases = self._phases.setdefault(report.nodeid, [])
+        phases.append(report)
+        if report.when == "teardown":
+            del self._phases[report.nodeid]
+            self.write(self.record(phases, worker))
+    
+    def record(self, phases, worker):
+        """Result record of a test from its setup, call and teardown reports"""
+        outcome, failed_phase, message = "passed", None, None
+        for report in phases:
+            if report.outcome == "rerun":
+                outcome = "rerun"
+            elif report.failed and outcome != "rerun":
+                # A failing fixture is an error, a failing test body a failure
+                outcome = "failed" if report.when == "call" else "error"
+                failed_phase = report.when
+                message = report.longreprtext[-MAX_MESSAGE_LENGTH:]
+                break
+            elif report.skipped and outcome == "passed":
+                outcome = "skipped"
+                if isinstance(report.longrepr, tuple):
+                    message = str(report.longrepr[2])[:MAX_MESSAGE_LENGTH]
+        
+        attachments = []
+        for report in phases:
+            for attachment in getattr(report, "attachments", None) or []:
+                path = attachment["path"]
+                if path:
+                    # Relative links keep the report folder movable
+                    path = os.path.relpath(path, os.path.abspath(self.results_dir)).replace(os.sep, "/")
+                attachments.append({**attachment, "path": path})
+        
+        return {
+            "nodeid": phases[0].nodeid,
+            "outcome": outcome,
+            "phase": failed_phase,
+            "duration": round(sum(report.duration for report in phases), 3),
+            "start": getattr(phases[0], "start", None),
+            "stop": getattr(phases[-1], "stop", None),
+            "worker": worker,
+            "message": message,
+            "attachments": attachments
+        }
+    
+    def write(self, record):
+        """Append and flush a single record"""
+        start = time.perf_counter()
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        self._file.write(line)
+        self._file.flush()
+        self.stats["records"] += 1
+        self.stats["bytes"] += len(line)
+        self.stats["write_time"] += time.perf_counter() - start
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,274 @@
+"""
+SQLite index of the dated report folders for trend queries
+
+    python -m utils.run_index ingest
+    python -m utils.run_index trend test_google_search_pom --days 30
+    python -m utils.run_index flaky --days 30
+    python -m utils.run_index slowest-steps --days 7
+"""
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import statistics
+import sys
+from datetime import datetime, timedelta
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    started TEXT NOT NULL,
+    environment TEXT,
+    browser TEXT,
+    exit_code INTEGER,
+    wall_time REAL
+);
+CREATE TABLE IF NOT EXISTS tests (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL,
+    worker TEXT
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    page TEXT,
+    action TEXT NOT NULL,
+    locator TEXT,
+    outcome TEXT,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tests_nodeid ON tests (nodeid, run_id);
+CREATE INDEX IF NOT EXISTS steps_run ON steps (run_id);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+"""
+
+def percentile_summary(values):
+    """p50/p90/p99 of a list of durations"""
+    ordered = sorted(values)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+        return {"count": len(ordered), "p50": cuts[49], "p90": cuts[89], "p99": cuts[98], "max": ordered[-1]}
+    return {"count": len(ordered), "p50": ordered[0], "p90": ordered[0], "p99": ordered[0], "max": ordered[0]}
+
+def read_summary_file(report_path):
+    """Key: value lines of a run's test_summary.txt, None while the run is still going"""
+    summary_file = os.path.join(report_path, "test_summary.txt")
+    if not os.path.exists(summary_file):
+        return None
+    fields = {}
+    with open(summary_file, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith(" "):
+                continue
+            key, separator, value = line.partition(":")
+            if separator:
+                fields[key.strip()] = value.strip()
+    return fields
+
+class RunIndex:
+    """Local SQLite database of past runs, filled incrementally from reports/<date>/<timestamp>/"""
+    
+    def __init__(self, db_file=None, reports_dir="reports"):
+        self.reports_dir = reports_dir
+        self.db_file = db_file or os.path.join(reports_dir, "run_index.sqlite")
+        os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+        self.db = sqlite3.connect(self.db_file)
+        self.db.row_factory = sqlite3.Row
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def close(self):
+        self.db.close()
+    
+    def ingest(self):
+        """Add run folders that are finished and not indexed yet, returns the number added"""
+        known = {row["path"] for row in self.db.execute("SELECT path FROM runs")}
+        added = 0
+        for report_path in sorted(glob.glob(os.path.join(self.reports_dir, "*", "*"))):
+            report_path = os.path.normpath(report_path)
+            if report_path in known or not os.path.isdir(report_path):
+                continue
+            fields = read_summary_file(report_path)
+            if fields is None:
+                continue
+            with self.db:
+                self._ingest_run(report_path, fields)
+            added += 1
+        return added
+    
+    def _ingest_run(self, report_path, fields):
+        """Insert one run with its tests and steps in a single transaction"""
+        try:
+            started = datetime.strptime(fields.get("Time", ""), "%Y%m%d_%H%M%S")
+        except ValueError:
+            started = datetime.fromtimestamp(os.path.getmtime(report_path))
+        wall_time = fields.get("Wall Time", "").rstrip("s")
+        exit_code = fields.get("Exit Code")
+        run_id = self.db.execute(
+            "INSERT INTO runs (path, started, environment, browser, exit_code, wall_time) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                report_path, started.isoformat(), fields.get("Environment"), fields.get("Browser"),
+                int(exit_code) if exit_code and exit_code.lstrip("-").isdigit() else None,
+                float(wall_time) if wall_time else None
+            )
+        ).lastrowid
+        
+        tests, steps = [], []
+        for spans_file in sorted(glob.glob(os.path.join(report_path, "spans_*.jsonl"))):
+            worker = os.path.basename(spans_file)[len("spans_"):-len(".jsonl")]
+            with open(spans_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    nodeid = record["test"] or ""
+                    if record.get("type") == "test":
+                        tests.append((run_id, nodeid, record["outcome"], record["duration"], worker))
+                    elif record.get("type") == "span":
+                        steps.append((
+                            run_id, nodeid, record["page"], record["action"],
+                            record["locator"], record["outcome"], record["duration"]
+                        ))
+        
+        # results.jsonl knows errors and reruns, the spans only passed/failed/skipped
+        results_file = os.path.join(report_path, "results.jsonl")
+        if os.path.exists(results_file):
+            tests = []
+            with open(results_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        tests.append((
+                            run_id, record["nodeid"], record["outcome"],
+                            record["duration"], record["worker"]
+                        ))
+        
+        self.db.executemany("INSERT INTO tests VALUES (?, ?, ?, ?, ?)", tests)
+        self.db.executemany("INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?)", steps)
+    
+    def _since(self, days):
+        return (datetime.now() - timedelta(days=days)).isoformat()
+    
+    def duration_trend(self, test, days=30, by="day"):
+        """Duration percentiles of tests matching a name per day or per run"""
+        period = "substr(runs.started, 1, 10)" if by == "day" else "runs.started"
+        rows = self.db.execute(
+            f"SELECT {period} AS period, tests.duration FROM tests JOIN runs ON runs.id = tests.run_id "
+            "WHERE tests.nodeid LIKE ? AND runs.started >= ? AND tests.outcome IN ('passed', 'failed') "
+            "ORDER BY runs.started",
+            (f"%{test}%", self._since(days))
+        )
+        periods = {}
+        for row in rows:
+            periods.setdefault(row["period"], []).append(row["duration"])
+        return [{"period": period, **percentile_summary(values)} for period, values in periods.items()]
+    
+    def flaky_tests(self, days=30, min_runs=3):
+        """Tests whose outcome changes between runs or that passed on a rerun"""
+        rows = self.db.execute(
+            "SELECT tests.nodeid, tests.run_id, tests.outcome FROM tests JOIN runs ON runs.id = tests.run_id "
+            "WHERE runs.started >= ? ORDER BY tests.nodeid, runs.started",
+            (self._since(days),)
+        )
+        history = {}
+        for row in rows:
+            runs = history.setdefault(row["nodeid"], {})
+            # One final outcome per run, a rerun followed by a pass is kept as rerun
+            if runs.get(row["run_id"]) != "rerun":
+                runs[row["run_id"]] = row["outcome"]
+        
+        flaky = []
+        for nodeid, runs in history.items():
+            outcomes = [outcome for outcome in runs.values() if outcome != "skipped"]
+            if len(outcomes) < min_runs:
+                continue
+            failed = [outcome in ("failed", "error") for outcome in outcomes]
+            flips = sum(1 for previous, current in zip(failed, failed[1:]) if previous != current)
+            reruns = outcomes.count("rerun")
+            if not flips and not reruns:
+                continue
+            flaky.append({
+                "nodeid": nodeid,
+                "runs": len(outcomes),
+                "failure_rate": sum(failed) / len(outcomes),
+                # A single run can not flip, it is only listed for its rerun
+                "flip_rate": flips / (len(outcomes) - 1) if len(outcomes) > 1 else 0.0,
+                "reruns": reruns
+            })
+        return sorted(flaky, key=lambda item: (-item["flip_rate"], -item["reruns"]))
+    
+    def slowest_steps(self, days=7, limit=20):
+        """Page actions with the highest p90 duration"""
+        rows = self.db.execute(
+            "SELECT steps.page, steps.action, steps.locator, steps.duration FROM steps "
+            "JOIN runs ON runs.id = steps.run_id WHERE runs.started >= ?",
+            (self._since(days),)
+        )
+        steps = {}
+        for row in rows:
+            steps.setdefault((row["page"] or "", row["action"], row["locator"] or ""), []).append(row["duration"])
+        summaries = [
+            {"page": page, "action": action, "locator": locator, **percentile_summary(values)}
+            for (page, action, locator), values in steps.items()
+        ]
+        return sorted(summaries, key=lambda item: -item["p90"])[:limit]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the history of test runs")
+    parser.add_argument("--reports-dir", default=os.getenv("REPORTS_DIR", "reports"), help="Folder of the dated reports")
+    parser.add_argument("--db", default=None, help="SQLite file (default: <reports-dir>/run_index.sqlite)")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    commands.add_parser("ingest", help="Index new run folders")
+    trend = commands.add_parser("trend", help="Duration percentiles of a test over time")
+    trend.add_argument("test", help="Part of the node id, e.g. test_google_search_pom")
+    trend.add_argument("--days", type=int, default=30)
+    trend.add_argument("--by", choices=["day", "run"], default="day")
+    flaky = commands.add_parser("flaky", help="Tests whose outcome flips between runs")
+    flaky.add_argument("--days", type=int, default=30)
+    flaky.add_argument("--min-runs", type=int, default=3, help="Runs a test needs to be judged, at least 1")
+    slowest = commands.add_parser("slowest-steps", help="Page actions with the highest p90")
+    slowest.add_argument("--days", type=int, default=7)
+    slowest.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+    if args.command == "flaky" and args.min_runs < 1:
+        parser.error("--min-runs must be at least 1")
+    
+    index = RunIndex(args.db, args.reports_dir)
+    try:
+        # Queries always see the latest runs, only new folders are read
+        added = index.ingest()
+        if args.command == "ingest":
+            print(f"🗃️ Indexed {added} new runs into {index.db_file}")
+            return 0
+        if args.command == "trend":
+            rows = index.duration_trend(args.test, args.days, args.by)
+            columns = ["period", "count", "p50", "p90", "p99", "max"]
+        elif args.command == "flaky":
+            rows = index.flaky_tests(args.days, args.min_runs)
+            columns = ["nodeid", "runs", "failure_rate", "flip_rate", "reruns"]
+        else:
+            rows = index.slowest_steps(args.days, args.limit)
+            columns = ["page", "action", "locator", "count", "p50", "p90", "p99"]
+    finally:
+        index.close()
+    
+    if args.json:
+        print(json.dumps(rows, indent=4))
+        return 0
+    if not rows:
+        print("No data")
+        return 0
+    print("  ".join(columns))
+    for row in rows:
+        print("  ".join(f"{row[column]:.3f}" if isinstance(row[column], float) else str(row[column]) for column in columns))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
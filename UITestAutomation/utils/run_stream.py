@@ -0,0 +1,189 @@
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+# pytest -v result lines, plain and as printed by xdist workers
+RESULT_LINE = re.compile(r"^(?P<nodeid>\S+::\S+) (?P<outcome>PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS|RERUN)\b")
+XDIST_RESULT_LINE = re.compile(
+    r"^\[(?P<worker>gw\d+)\] (?:\[\s*\d+%\] )?(?P<outcome>PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS|RERUN) (?P<nodeid>\S+)"
+)
+# Number of tests, "collected 12 items" or "8 workers [12 items]"
+COLLECTED_LINE = re.compile(r"(?:collected|\[) ?(?P<count>\d+) items?")
+
+FAILED_OUTCOMES = ("FAILED", "ERROR")
+
+class RunEvents:
+    """Test results parsed from pytest's streamed output"""
+    
+    def __init__(self):
+        self.collected = None
+        self.outcomes = {}
+        self.counts = {}
+        self.started = time.monotonic()
+        self.aborted = None
+    
+    def feed(self, line):
+        """Parse one output line, return (nodeid, outcome) when it reported a result"""
+        match = RESULT_LINE.match(line) or XDIST_RESULT_LINE.match(line)
+        if match is None:
+            if self.collected is None:
+                collected = COLLECTED_LINE.search(line)
+                if collected:
+                    self.collected = int(collected.group("count"))
+            return None
+        
+        nodeid, outcome = match.group("nodeid"), match.group("outcome")
+        self.counts[outcome] = self.counts.get(outcome, 0) + 1
+        # A teardown error after a pass still fails the test
+        if self.outcomes.get(nodeid) not in FAILED_OUTCOMES:
+            self.outcomes[nodeid] = outcome
+        return nodeid, outcome
+    
+    @property
+    def completed(self):
+        return sum(1 for outcome in self.outcomes.values() if outcome != "RERUN")
+    
+    @property
+    def failures(self):
+        return [nodeid for nodeid, outcome in self.outcomes.items() if outcome in FAILED_OUTCOMES]
+    
+    def elapsed(self):
+        return time.monotonic() - self.started
+    
+    def throughput(self):
+        """Finished tests per second"""
+        elapsed = self.elapsed()
+        return self.completed / elapsed if elapsed > 0 else 0.0
+    
+    def totals(self):
+        """Number of tests per final outcome"""
+        totals = {}
+        for outcome in self.outcomes.values():
+            totals[outcome] = totals.get(outcome, 0) + 1
+        return totals
+    
+    def progress(self):
+        """One line status: done/total, outcome counts, throughput and remaining time"""
+        counts = " ".join(f"{outcome.lower()} {count}" for outcome, count in sorted(self.totals().items()))
+        
+        rate = self.throughput()
+        total = f"/{self.collected}" if self.collected else ""
+        line = f"▶ {self.completed}{total} | {counts or 'waiting'} | {rate:.2f} tests/s"
+        if self.collected and rate > 0:
+            line += f" | ETA {max(self.collected - self.completed, 0) / rate:.0f}s"
+        return line
+    
+    def summary(self):
+        """Totals of the run for the summary file"""
+        return {
+            "collected": self.collected,
+            "completed": self.completed,
+            "totals": self.totals(),
+            "failures": self.failures,
+            "reruns": self.counts.get("RERUN", 0),
+            "duration": self.elapsed(),
+            "throughput": self.throughput(),
+            "aborted": self.aborted
+        }
+
+def _popen_group_options():
+    """Start the child in its own process group so the whole tree can be stopped"""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+def _kill_process_tree(process):
+    if process.poll() is not None:
+        return
+    if os.name == "nt":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+def stop_process_tree(process, grace=15):
+    """Interrupt pytest so it still writes its reports, kill the tree if it is not done after grace seconds
+    
+    The caller keeps reading the output meanwhile, a full pipe would block
+    pytest's shutdown. Returns the timer of the kill.
+    """
+    try:
+        if os.name == "nt":
+            process.send_signal(signal.CTRL_BREAK_EVENT)
+        else:
+            # pytest and its xdist workers all get the interrupt
+            os.killpg(process.pid, signal.SIGINT)
+    except (ProcessLookupError, OSError):
+        pass
+    timer = threading.Timer(grace, _kill_process_tree, args=(process,))
+    timer.daemon = True
+    timer.start()
+    return timer
+
+def stream_pytest(cmd, env=None, log_file=None, max_failures=None, progress_interval=30):
+    """Run pytest, echo its output line by line and stop it after max_failures failed tests
+    
+    Returns the exit code and the parsed RunEvents. The full output goes to
+    log_file instead of being held in memory.
+    """
+    events = RunEvents()
+    live = sys.stdout.isatty()
+    last_progress = time.monotonic()
+    kill_timer = None
+    
+    process = subprocess.Popen(
+        cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, encoding="utf-8", errors="replace", bufsize=1, **_popen_group_options()
+    )
+    log = open(log_file, "w", encoding="utf-8") if log_file else None
+    try:
+        while True:
+            try:
+                line = process.stdout.readline()
+            except KeyboardInterrupt:
+                # The child runs in its own session and did not see Ctrl+C
+                if kill_timer is None:
+                    events.aborted = "interrupted"
+                    kill_timer = stop_process_tree(process)
+                continue
+            if not line:
+                break
+            line = line.rstrip("\n")
+            if log:
+                log.write(line + "\n")
+            result = events.feed(line)
+            
+            if live:
+                # Clear the progress line, print the output, then redraw it
+                sys.stdout.write(f"\r\033[K{line}\n{events.progress()}")
+                sys.stdout.flush()
+            else:
+                print(line)
+                if result and time.monotonic() - last_progress >= progress_interval:
+                    print(events.progress())
+                    last_progress = time.monotonic()
+            
+            if (max_failures and kill_timer is None and result and result[1] in FAILED_OUTCOMES
+                    and len(events.failures) >= max_failures):
+                events.aborted = f"{len(events.failures)} failures reached --max-failures {max_failures}"
+                if live:
+                    sys.stdout.write("\n")
+                print(f"🛑 Stopping run: {events.aborted}")
+                kill_timer = stop_process_tree(process)
+        returncode = process.wait()
+    finally:
+        if kill_timer:
+            kill_timer.cancel()
+        if log:
+            log.close()
+    
+    if live:
+        sys.stdout.write("\n")
+    print(events.progress())
+    return returncode, events
@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+import pytest
+from xdist.scheduler import LoadGroupScheduling
+from utils.logger import logger
+from utils.test_scheduler import DurationHistory, build_schedule
+
+_requirements_dir = None
+
+def pytest_addoption(parser):
+    group = parser.getgroup("ui")
+    group.addoption(
+        "--schedule-by-duration", action="store_true", default=False,
+        help="Hand tests to xdist workers in bins planned from the duration history, use with --dist loadgroup"
+    )
+
+def driver_requirement(item):
+    """Tests with the same requirement can share a worker's pooled or prelaunched driver"""
+    if "driver" not in getattr(item, "fixturenames", ()):
+        return "none"
+    return "fresh-browser" if item.get_closest_marker("fresh_browser") else "browser"
+
+def _enabled(config):
+    """Only distributed runs are scheduled, -n 0 and plain runs keep pytest's order"""
+    return config.getoption("--schedule-by-duration") and config.getoption("dist", "no") != "no"
+
+def pytest_configure(config):
+    """The controller collects nothing, workers tell it the driver requirement of every test through a file"""
+    global _requirements_dir
+    if _enabled(config) and not hasattr(config, "workerinput"):
+        _requirements_dir = tempfile.mkdtemp(prefix="schedule_")
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    if _requirements_dir is not None:
+        node.workerinput["schedule_requirements"] = os.path.join(_requirements_dir, "requirements.json")
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    """Write the driver requirement of every collected test, runs once deselection is done"""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None or workerinput["workerid"] != "gw0" or "schedule_requirements" not in workerinput:
+        return
+    requirements_file = workerinput["schedule_requirements"]
+    with open(requirements_file + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({item.nodeid: driver_requirement(item) for item in items}, f)
+    os.replace(requirements_file + ".tmp", requirements_file)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if _requirements_dir is None:
+        return None
+    return DurationScheduling(config, log, os.path.join(_requirements_dir, "requirements.json"))
+
+def pytest_sessionfinish(session, exitstatus):
+    if _requirements_dir is not None and not hasattr(session.config, "workerinput"):
+        shutil.rmtree(_requirements_dir, ignore_errors=True)
+
+class DurationScheduling(LoadGroupScheduling):
+    """loadgroup scheduling whose work units are bins planned from the duration history
+    
+    The plan is made once, in the controller, from the collection the workers
+    reported. Node ids stay as they are; tests that carry their own xdist_group
+    marker keep their group.
+    """
+    
+    def __init__(self, config, log=None, requirements_file=None):
+        super().__init__(config, log)
+        self.requirements_file = requirements_file
+        self.bin_of = {}
+    
+    def schedule(self):
+        if self.collection is None and self._check_nodes_have_same_collection():
+            self._plan(next(iter(self.registered_collections.values())))
+        super().schedule()
+    
+    def _plan(self, collection):
+        """Pack the collected tests into bins, longest bin first in the work queue"""
+        requirements = {}
+        if self.requirements_file and os.path.exists(self.requirements_file):
+            with open(self.requirements_file, "r", encoding="utf-8") as f:
+                requirements = json.load(f)
+        
+        # xdist has already tagged tests with their own group as nodeid@group
+        scheduled = [nodeid for nodeid in collection if "@" not in nodeid.rsplit("::", 1)[-1]]
+        if not scheduled:
+            return
+        requirements = {nodeid: requirements.get(nodeid, "browser") for nodeid in scheduled}
+        
+        history = DurationHistory.load(os.getenv("REPORTS_DIR", "reports"))
+        tests, sources = [], {}
+        for nodeid in scheduled:
+            estimate, source = history.estimate(nodeid, requirements[nodeid], requirements)
+            tests.append((nodeid, requirements[nodeid], estimate))
+            sources[source] = sources.get(source, 0) + 1
+        
+        schedule = build_schedule(tests, self.numnodes)
+        schedule["estimate_sources"] = sources
+        for entry in schedule["bins"]:
+            # The queue keeps insertion order, so the longest bin is handed out first
+            self.workqueue[entry["name"]] = OrderedDict()
+            for nodeid in entry["tests"]:
+                self.bin_of[nodeid] = entry["name"]
+        
+        if os.getenv("REPORT_PATH"):
+            with open(os.path.join(os.getenv("REPORT_PATH"), "schedule.json"), "w", encoding="utf-8") as f:
+                json.dump(schedule, f, indent=4)
+        logger.debug("🗓️ %d tests planned into %d bins", len(scheduled), len(schedule["bins"]))
+    
+    def _split_scope(self, nodeid):
+        if nodeid in self.bin_of:
+            return self.bin_of[nodeid]
+        return super()._split_scope(nodeid)
@@ -0,0 +1,81 @@
+import datetime
+from collections import deque
+import allure
+from utils.artifact_writer import artifact_writer
+
+class ScreenshotBuffer:
+    """Bounded in-memory ring buffer of step screenshots for the running test"""
+    
+    def __init__(self, size=5, on_failure=True, on_success=False, image_format="png", quality=70):
+        self.on_failure = on_failure
+        self.on_success = on_success
+        self.image_format = image_format
+        self.quality = quality
+        self.frames = deque(maxlen=size)
+        self.test_name = None
+    
+    def configure(self, size=None, on_failure=None, on_success=None, image_format=None, quality=None):
+        """Apply screenshot settings from the framework configuration"""
+        if size is not None:
+            self.frames = deque(self.frames, maxlen=size)
+        if on_failure is not None:
+            self.on_failure = on_failure
+        if on_success is not None:
+            self.on_success = on_success
+        if image_format is not None:
+            self.image_format = image_format
+        if quality is not None:
+            self.quality = quality
+    
+    def start(self, test_name):
+        """Start buffering frames for a new test"""
+        self.test_name = test_name
+        self.frames.clear()
+    
+    @property
+    def enabled(self):
+        """Check if step screenshots are taken at all"""
+        return self.on_success or self.on_failure
+    
+    def capture(self, driver, name):
+        """Capture a step screenshot according to the configured mode"""
+        if not self.enabled:
+            return
+        if self.image_format == "jpeg" and hasattr(driver, "execute_cdp_cmd"):
+            # Chromium encodes JPEG itself, several times smaller than PNG
+            payload = driver.execute_cdp_cmd(
+                "Page.captureScreenshot", {"format": "jpeg", "quality": self.quality}
+            )["data"]
+            self.add(name, payload, allure.attachment_type.JPG)
+        else:
+            self.add(name, driver.get_screenshot_as_base64())
+    
+    def add(self, name, payload, attachment_type=allure.attachment_type.PNG):
+        """Handle a base64 screenshot taken by the caller, e.g. an async driver"""
+        if self.on_success:
+            # Every step is wanted in the report, attach right away
+            artifact_writer.attach(
+                payload,
+                name=name,
+                attachment_type=attachment_type,
+                encoding="base64"
+            )
+        elif self.on_failure:
+            # Keep the base64 payload as is, it is only decoded if the test fails
+            self.frames.append((name, datetime.datetime.now(), payload, attachment_type))
+    
+    def flush(self, failed):
+        """Write buffered frames to the report if the test failed, then drop them"""
+        if failed and self.on_failure and not self.on_success:
+            for index, (name, taken_at, payload, attachment_type) in enumerate(self.frames, start=1):
+                artifact_writer.attach(
+                    payload,
+                    name=f"{index:02d}_{name} ({taken_at:%H:%M:%S.%f})",
+                    attachment_type=attachment_type,
+                    encoding="base64"
+                )
+        self.frames.clear()
+        self.test_name = None
+
+# Global screenshot buffer instance
+screenshot_buffer = ScreenshotBuffer()
@@ -0,0 +1,161 @@
+import html
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from utils.logger import logger
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Google</title></head>
+<body>
+    <div id="hplogo">Google</div>
+    <form action="/search" method="get" onsubmit="return this.q.value.trim() !== '';">
+        <input type="text" name="q" value="" autocomplete="off">
+        <input type="submit" name="btnK" value="Google Search">
+        <input type="submit" name="btnI" value="I'm Feeling Lucky">
+    </form>
+</body>
+</html>
+"""
+
+RESULTS_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>{query} - Google Search</title></head>
+<body>
+    <form action="/search" method="get">
+        <input type="text" name="q" value="{query}" autocomplete="off">
+        <input type="submit" name="btnK" value="Google Search">
+    </form>
+    <div id="search">
+{results}
+    </div>
+</body>
+</html>
+"""
+
+RESULT_ITEM = """        <div class="g"><a href="/result/{index}"><h3>{query} - result {index}</h3></a></div>"""
+
+RESULT_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Result {index}</title></head>
+<body><h1>Result {index}</h1></body>
+</html>
+"""
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Serves the Google search and results pages from memory"""
+    
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        if server.failure_rate and server.random.random() < server.failure_rate:
+            self._send(503, "<html><body>Injected failure</body></html>")
+            return
+        
+        url = urlparse(self.path)
+        if url.path in ("/", "/webhp"):
+            self._send(200, SEARCH_PAGE)
+        elif url.path == "/search":
+            query = parse_qs(url.query).get("q", [""])[0]
+            if not query.strip():
+                # Google keeps the homepage for empty queries
+                self._redirect("/")
+                return
+            escaped = html.escape(query)
+            results = "\n".join(
+                RESULT_ITEM.format(index=index, query=escaped)
+                for index in range(1, server.results_count + 1)
+            )
+            self._send(200, RESULTS_PAGE.format(query=escaped, results=results))
+        elif url.path.startswith("/result/"):
+            self._send(200, RESULT_PAGE.format(index=html.escape(url.path.rsplit("/", 1)[-1])))
+        elif url.path in server.stubs:
+            content_type, body = server.stubs[url.path]
+            self._send(200, body, content_type)
+        else:
+            self._send(404, "<html><body>Not found</body></html>")
+    
+    def _send(self, status, body, content_type="text/html; charset=utf-8"):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def _redirect(self, location):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+    
+    def log_message(self, format, *args):
+        logger.debug("🧪 Stub server: " + format, *args)
+
+class StubServer:
+    """Local stand-in for the Google pages, served from a background thread"""
+    
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0, failure_rate=0.0, results_count=10, seed=None):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.results_count = results_count
+        self.seed = seed
+        self.stubs = {}
+        self._server = None
+        self._thread = None
+    
+    @classmethod
+    def from_config(cls, config):
+        """Create stub server from framework configuration"""
+        return cls(
+            latency_ms=config.stub_server_latency_ms,
+            failure_rate=config.stub_server_failure_rate,
+            results_count=config.stub_server_results_count,
+            seed=config.stub_server_seed
+        )
+    
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+    
+    def add_stub(self, path, body, content_type="text/plain"):
+        """Serve a fixed response for the given path"""
+        self.stubs[path] = (content_type, body)
+        if self._server:
+            self._server.stubs = self.stubs
+    
+    def start(self):
+        """Bind to an ephemeral port and start serving in a daemon thread"""
+        self._server = ThreadingHTTPServer((self.host, self.port), StubRequestHandler)
+        self._server.daemon_threads = True
+        self._server.latency = self.latency_ms / 1000
+        self._server.failure_rate = self.failure_rate
+        self._server.results_count = self.results_count
+        self._server.random = random.Random(self.seed)
+        self._server.stubs = self.stubs
+        self.port = self._server.server_address[1]
+        
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        logger.info("🧪 Stub server listening on %s", self.base_url)
+        return self
+    
+    def stop(self):
+        """Stop serving and release the port"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
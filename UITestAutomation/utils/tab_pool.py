@@ -0,0 +1,322 @@
+import functools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger import logger
+
+def _pss_kb(pid):
+    """Proportional set size of a process, shared pages are split between their users"""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        # Older kernels: fall back to the resident set size
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return 0
+
+def process_tree_memory(root_pid):
+    """Memory of a process and all of its descendants in MB, None where /proc is missing"""
+    if not os.path.isdir("/proc"):
+        return None
+    
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # The command name may contain spaces, fields after it are fixed
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    
+    total, pending = 0, [root_pid]
+    while pending:
+        pid = pending.pop()
+        total += _pss_kb(pid)
+        pending.extend(children.get(pid, []))
+    return total / 1024
+
+def _unwrap(value):
+    """Real Selenium objects for arguments passed through a tab proxy"""
+    if isinstance(value, TabElement):
+        return value._element
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
+
+class _TabProxy:
+    """Forwards attribute access to a Selenium object while its tab is the current window"""
+    
+    def __init__(self, pool, handle, target):
+        self._pool = pool
+        self._handle = handle
+        self._target = target
+    
+    def _wrap(self, value):
+        from selenium.webdriver.common.alert import Alert
+        from selenium.webdriver.remote.switch_to import SwitchTo
+        from selenium.webdriver.remote.webelement import WebElement
+        if isinstance(value, WebElement):
+            return TabElement(self._pool, self._handle, value)
+        if isinstance(value, (SwitchTo, Alert)):
+            # Their commands act on whatever window is current, so they switch to the tab too
+            return _TabProxy(self._pool, self._handle, value)
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+    
+    def __getattr__(self, name):
+        # Properties like title or current_url run a command as soon as they are read
+        with self._pool.lock:
+            self._pool.activate(self._handle)
+            attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return self._wrap(attribute)
+        
+        @functools.wraps(attribute)
+        def command(*args, **kwargs):
+            with self._pool.lock:
+                self._pool.activate(self._handle)
+                return self._wrap(attribute(*_unwrap(args), **_unwrap(kwargs)))
+        return command
+
+class TabDriver(_TabProxy):
+    """WebDriver bound to one tab of a shared browser, usable by page objects
+    
+    The tabs share one WebDriver session, which runs one command at a time:
+    every command switches to its tab and runs under the pool lock, so the
+    commands of different tabs take turns. Only the sleeps of page objects
+    between polls and, on Chromium, page loads started with get() overlap.
+    What the tabs save is memory, not Selenium round trips.
+    """
+    
+    def __init__(self, pool, handle, context_id=None):
+        super().__init__(pool, handle, pool.driver)
+        self.handle = handle
+        self.context_id = context_id
+    
+    def get(self, url):
+        """Load a page, the lock is only held while the navigation is started and polled"""
+        if not self.context_id:
+            return self.__getattr__("get")(url)
+        
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        with self._pool.lock:
+            self._pool.activate(self._handle)
+            timeout = self._pool.driver.timeouts.page_load
+            # Page.navigate returns once the navigation starts, unlike the WebDriver command
+            result = self._pool.driver.execute_cdp_cmd("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise WebDriverException(f"Navigation to {url} failed: {result['errorText']}")
+        if not result.get("loaderId"):
+            # Same document navigation, e.g. a fragment change
+            return
+        
+        end = time.monotonic() + timeout
+        while not self._document_loaded(result["loaderId"]):
+            if time.monotonic() >= end:
+                raise TimeoutException(f"Page load of {url} timed out after {timeout}s")
+            time.sleep(0.05)
+    
+    def _document_loaded(self, loader_id):
+        """Whether the document of a navigation replaced the old one and finished loading"""
+        with self._pool.lock:
+            self._pool.activate(self._handle)
+            frame = self._pool.driver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]
+            if frame.get("loaderId") != loader_id:
+                return False
+            state = self._pool.driver.execute_cdp_cmd(
+                "Runtime.evaluate", {"expression": "document.readyState", "returnByValue": True}
+            )
+        return state["result"].get("value") == "complete"
+
+class TabElement(_TabProxy):
+    """WebElement found in a tab, its commands switch to the tab first"""
+    
+    def __init__(self, pool, handle, element):
+        super().__init__(pool, handle, element)
+        self._element = element
+
+class TabPool:
+    """One browser per worker hosting several isolated tabs driven from threads
+    
+    On Chromium every tab gets its own browser context (cookies, storage and
+    cache), disposing the context is the cleanup. Other browsers open plain
+    tabs that share cookies.
+    """
+    
+    def __init__(self, driver, max_tabs=4):
+        self.driver = driver
+        self.max_tabs = max_tabs
+        self.lock = threading.RLock()
+        self.worker_id = os.getenv("PYTEST_XDIST_WORKER", "master")
+        self.isolated = hasattr(driver, "execute_cdp_cmd")
+        # The first window stays open so the session survives when all tabs are closed
+        self.home_handle = driver.current_window_handle
+        self._current_handle = self.home_handle
+        self._open = set()
+        self.stats = {
+            "tabs_opened": 0,
+            "flows": 0,
+            "failed_flows": 0,
+            "max_concurrent": 0,
+            "baseline_memory_mb": self.memory_mb(),
+            "peak_memory_mb": None
+        }
+        if not self.isolated:
+            logger.warning("⚠️ Tab isolation needs a Chromium based browser, tabs share cookies")
+    
+    @classmethod
+    def from_factory(cls, factory, max_tabs=4):
+        """Launch the shared browser of the worker"""
+        return cls(factory.create_driver(), max_tabs)
+    
+    def memory_mb(self):
+        """Memory of the browser process tree started by the driver service"""
+        service = getattr(self.driver, "service", None)
+        process = getattr(service, "process", None)
+        return process_tree_memory(process.pid) if process else None
+    
+    def activate(self, handle):
+        """Make a tab the current window of the session, caller holds the lock"""
+        if self._current_handle != handle:
+            self.driver.switch_to.window(handle)
+            self._current_handle = handle
+    
+    def open_tab(self, url="about:blank"):
+        """Open a new isolated tab"""
+        with self.lock:
+            known = set(self.driver.window_handles)
+            context_id = None
+            if self.isolated:
+                context_id = self.driver.execute_cdp_cmd(
+                    "Target.createBrowserContext", {"disposeOnDetach": False}
+                )["browserContextId"]
+                self.driver.execute_cdp_cmd("Target.createTarget", {"url": url, "browserContextId": context_id})
+                handle = self._wait_for_new_handle(known)
+            else:
+                self.driver.switch_to.new_window("tab")
+                handle = self.driver.current_window_handle
+                self._current_handle = handle
+                if url != "about:blank":
+                    self.driver.get(url)
+            
+            self._open.add(handle)
+            self.stats["tabs_opened"] += 1
+            self.stats["max_concurrent"] = max(self.stats["max_concurrent"], len(self._open))
+            return TabDriver(self, handle, context_id)
+    
+    def _wait_for_new_handle(self, known, timeout=5):
+        """Window handle of a target created through DevTools"""
+        end = time.monotonic() + timeout
+        while True:
+            new = set(self.driver.window_handles) - known
+            if new:
+                return new.pop()
+            if time.monotonic() >= end:
+                raise TimeoutError("New tab did not show up in the window handles")
+            time.sleep(0.05)
+    
+    def close_tab(self, tab):
+        """Close a tab and drop everything it stored"""
+        with self.lock:
+            sample = len(self._open) >= self.stats["max_concurrent"]
+        if sample:
+            # Sampled while the most tabs are open, with their pages loaded; /proc is read without the lock
+            memory = self.memory_mb()
+            if memory is not None:
+                with self.lock:
+                    self.stats["peak_memory_mb"] = max(self.stats["peak_memory_mb"] or 0.0, memory)
+        
+        with self.lock:
+            self._open.discard(tab.handle)
+            try:
+                if tab.context_id:
+                    # Closes the tab together with its cookies, storage and cache
+                    self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": tab.context_id})
+                else:
+                    self.activate(tab.handle)
+                    self.driver.close()
+            except Exception as e:
+                logger.warning("Closing tab failed: %s", e)
+            finally:
+                self.driver.switch_to.window(self.home_handle)
+                self._current_handle = self.home_handle
+    
+    def run(self, flows):
+        """Run callables in threads, each gets its own tab as driver
+        
+        Returns the results in order. All flows run to the end before the
+        first error, if any, is raised.
+        """
+        def run_in_tab(flow):
+            tab = self.open_tab()
+            try:
+                return flow(tab)
+            finally:
+                self.close_tab(tab)
+        
+        with ThreadPoolExecutor(max_workers=self.max_tabs, thread_name_prefix="tab") as executor:
+            futures = [executor.submit(run_in_tab, flow) for flow in flows]
+        
+        results, errors = [], []
+        for future in futures:
+            self.stats["flows"] += 1
+            if future.exception():
+                self.stats["failed_flows"] += 1
+                errors.append(future.exception())
+                results.append(None)
+            else:
+                results.append(future.result())
+        if errors:
+            raise errors[0]
+        return results
+    
+    def close(self):
+        """Quit the shared browser"""
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning("Driver quit failed: %s", e)
+    
+    def get_stats(self):
+        """Tab statistics with the memory cost of a concurrent test"""
+        stats = {"worker": self.worker_id, "max_tabs": self.max_tabs, **self.stats}
+        peak, concurrent = stats["peak_memory_mb"], stats["max_concurrent"]
+        if peak is not None and concurrent:
+            stats["memory_per_concurrent_test_mb"] = peak / concurrent
+            if stats["baseline_memory_mb"] is not None:
+                # What one more concurrent test costs on top of the browser itself
+                stats["memory_per_extra_tab_mb"] = (peak - stats["baseline_memory_mb"]) / concurrent
+        return stats
+    
+    def report_stats(self, report_path=None):
+        """Log tab statistics and save them next to the reports"""
+        stats = self.get_stats()
+        if "memory_per_concurrent_test_mb" in stats:
+            logger.info(
+                "🗂️ Tab pool [%s]: %d tabs, %d concurrent, %.1f MB per concurrent test (browser alone %.1f MB)",
+                stats["worker"], stats["tabs_opened"], stats["max_concurrent"],
+                stats["memory_per_concurrent_test_mb"], stats["baseline_memory_mb"] or 0.0
+            )
+        
+        report_path = report_path or os.getenv("REPORT_PATH")
+        if report_path:
+            os.makedirs(report_path, exist_ok=True)
+            with open(os.path.join(report_path, f"tab_pool_{stats['worker']}.json"), "w") as f:
+                json.dump(stats, f, indent=4)
+        return stats
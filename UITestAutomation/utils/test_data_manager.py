@@ -1,54 +1,170 @@
+import atexit
 import json
 import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, List, Any
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Sequence
+from utils.immutable import freeze, thaw
+from utils.file_lock import FileLock
 
-class TestDataManager:  # noqa: N801
+class TestDataStore:
+    """Process-wide test data, parsed once and served from a read-only view
+    
+    Writes are queued and committed in batches: the file is re-read under a
+    lock, the queued changes are applied and the result replaces the file
+    atomically, so parallel workers never read a half-written file.
+    """
+    
+    # Resolved data file path -> store shared by all managers of the process
+    _stores = {}
+    _stores_lock = threading.Lock()
+    
+    def __init__(self, data_file, batch_size=20):
+        self.data_file = Path(data_file)
+        self.lock_file = self.data_file.with_name(self.data_file.name + ".lock")
+        self.batch_size = batch_size
+        self.data = MappingProxyType({})
+        self.index = {}
+        self.all_search_queries = ()
+        self._pending = []
+        self._lock = threading.RLock()
+    
+    @classmethod
+    def get(cls, data_file):
+        """Shared store of a data file, loaded on first use"""
+        key = str(Path(data_file).resolve())
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls._stores[key] = cls(data_file).load()
+            return store
+    
+    @classmethod
+    def commit_all(cls):
+        """Commit queued writes of every store"""
+        for store in list(cls._stores.values()):
+            store.commit()
+    
+    def load(self):
+        """Parse the data file and build the lookup index"""
+        if not self.data_file.exists():
+            raise FileNotFoundError(f"Test data file not found: {self.data_file}")
+        with open(self.data_file, 'r', encoding='utf-8') as f:
+            self._set_data(freeze(json.load(f)))
+        return self
+    
+    def _set_data(self, data):
+        """Swap in a new read-only view and rebuild the index"""
+        index = {}
+        for section, values in data.items():
+            if isinstance(values, Mapping):
+                for name, value in values.items():
+                    index[(section, name)] = value
+        
+        all_search_queries = []
+        for queries in data.get("search_queries", {}).values():
+            if isinstance(queries, Sequence) and not isinstance(queries, str):
+                all_search_queries.extend(queries)
+        
+        # Readers holding the previous view keep a consistent snapshot
+        self.data, self.index, self.all_search_queries = data, index, tuple(all_search_queries)
+    
+    def lookup(self, section, name, default=None):
+        """Value of an entry of a section"""
+        return self.index.get((section, name), default)
+    
+    def queue_write(self, key, value, only_if_missing=False):
+        """Queue a top-level change, visible to this process immediately"""
+        with self._lock:
+            if only_if_missing and key in self.data:
+                return
+            value = freeze(value)
+            self._pending.append((key, value, only_if_missing))
+            data = dict(self.data)
+            data[key] = value
+            self._set_data(MappingProxyType(data))
+            if len(self._pending) >= self.batch_size:
+                self.commit()
+    
+    def commit(self):
+        """Apply queued writes to the file atomically"""
+        with self._lock:
+            if not self._pending:
+                return
+            with FileLock(self.lock_file):
+                # Start from the file on disk, other workers may have committed meanwhile
+                with open(self.data_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for key, value, only_if_missing in self._pending:
+                    if only_if_missing and key in data:
+                        continue
+                    data[key] = thaw(value)
+                
+                fd, temp_file = tempfile.mkstemp(
+                    prefix=f".{self.data_file.name}.", suffix=".tmp", dir=self.data_file.parent
+                )
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, indent=4, ensure_ascii=False)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temp_file, self.data_file)
+                except BaseException:
+                    if os.path.exists(temp_file):
+                        os.remove(temp_file)
+                    raise
+            
+            self._pending = []
+            self._set_data(freeze(data))
+
+# Queued writes must not be lost when the process ends without a commit
+atexit.register(TestDataStore.commit_all)
+
+class TestDataManager:
     """Manager for test data operations"""
     
     def __init__(self, data_file="test_data/test_data.json"):
         self.data_file = Path(data_file)
-        self.test_data = self._load_test_data()
+        self.store = TestDataStore.get(data_file)
     
-    def _load_test_data(self) -> Dict[str, Any]:
-        """Load test data from JSON file"""
-        if self.data_file.exists():
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            raise FileNotFoundError(f"Test data file not found: {self.data_file}")
+    @property
+    def test_data(self) -> Mapping[str, Any]:
+        """Read-only view of the test data"""
+        return self.store.data
     
-    def get_search_queries(self, category: str = "valid_searches") -> List[str]:
+    def get_search_queries(self, category: str = "valid_searches") -> Sequence[str]:
         """Get search queries by category"""
-        return self.test_data.get("search_queries", {}).get(category, [])
+        return self.store.lookup("search_queries", category, ())
     
     def get_url(self, key: str) -> str:
         """Get URL by key"""
-        return self.test_data.get("urls", {}).get(key, "")
+        return self.store.lookup("urls", key, "")
     
     def get_expected_result(self, key: str) -> str:
         """Get expected result by key"""
-        return self.test_data.get("expected_results", {}).get(key, "")
+        return self.store.lookup("expected_results", key, "")
     
-    def get_test_user(self, user_type: str = "valid_user") -> Dict[str, str]:
+    def get_test_user(self, user_type: str = "valid_user") -> Mapping[str, str]:
         """Get test user credentials"""
-        return self.test_data.get("test_users", {}).get(user_type, {})
+        return self.store.lookup("test_users", user_type, MappingProxyType({}))
     
-    def get_browser_config(self, browser: str) -> Dict[str, Any]:
+    def get_browser_config(self, browser: str) -> Mapping[str, Any]:
         """Get browser configuration"""
-        return self.test_data.get("browser_configs", {}).get(browser, {})
+        return self.store.lookup("browser_configs", browser, MappingProxyType({}))
     
     def get_timeout(self, timeout_type: str = "medium") -> int:
         """Get timeout value by type"""
-        return self.test_data.get("timeouts", {}).get(timeout_type, 10)
+        return self.store.lookup("timeouts", timeout_type, 10)
     
-    def get_test_categories(self) -> Dict[str, List[str]]:
+    def get_test_categories(self) -> Mapping[str, Sequence[str]]:
         """Get test categories and their test methods"""
-        return self.test_data.get("test_categories", {})
+        return self.test_data.get("test_categories", MappingProxyType({}))
     
-    def get_tests_by_category(self, category: str) -> List[str]:
+    def get_tests_by_category(self, category: str) -> Sequence[str]:
         """Get test methods by category"""
-        return self.test_data.get("test_categories", {}).get(category, [])
+        return self.store.lookup("test_categories", category, ())
     
     def get_random_search_query(self, category: str = "valid_searches") -> str:
         """Get a random search query from specified category"""
@@ -58,33 +174,25 @@ class TestDataManager:  # noqa: N801
     
     def get_all_search_queries(self) -> List[str]:
         """Get all search queries from all categories"""
-        all_queries = []
-        search_queries = self.test_data.get("search_queries", {})
-        
-        for category in search_queries.values():
-            if isinstance(category, list):
-                all_queries.extend(category)
-        
-        return all_queries
+        return list(self.store.all_search_queries)
     
     def add_test_data(self, key: str, value: Any):
-        """Add new test data"""
-        if key not in self.test_data:
-            self.test_data[key] = value
-            self._save_test_data()
+        """Add new test data, written to the file with the next batch"""
+        self.store.queue_write(key, value, only_if_missing=True)
     
     def update_test_data(self, key: str, value: Any):
-        """Update existing test data"""
-        self.test_data[key] = value
-        self._save_test_data()
+        """Update existing test data, written to the file with the next batch"""
+        self.store.queue_write(key, value)
     
-    def _save_test_data(self):
-        """Save test data to JSON file"""
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(self.test_data, f, indent=4, ensure_ascii=False)
+    def save(self):
+        """Write queued changes to the file now"""
+        self.store.commit()
     
     def get_data_for_parametrized_test(self, test_type: str) -> List[Dict[str, Any]]:
-        """Get data for parametrized tests"""
+        """Get data for parametrized tests
+        
+        Builds every row in memory, large corpora should use @pytest.mark.data_source
+        """
         if test_type == "search":
             return [
                 {"query": query, "expected": "search"} 
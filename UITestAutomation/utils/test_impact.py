@@ -0,0 +1,412 @@
+import ast
+import fnmatch
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from datetime import datetime
+
+# Index older than this is not trusted, the full suite runs instead
+MAX_INDEX_AGE_DAYS = 14
+
+# Changes here can affect any test
+FULL_SUITE_PATTERNS = (
+    "conftest.py", "pytest.ini", "requirements.txt", "Dockerfile", "docker-compose.yml",
+    "config/*", "utils/impact_plugin.py", "utils/test_impact.py"
+)
+
+# Changes here never affect a test
+IGNORED_PATTERNS = ("*.md", ".gitignore", "run_tests.py", "run_tests.bat", "benchmarks/*")
+
+# Symbol of the code that runs when a module is imported
+MODULE_SYMBOL = "<module>"
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@", re.MULTILINE)
+
+def _git(*args):
+    """Output of a git command run in the project directory"""
+    return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout
+
+def current_commit():
+    return _git("rev-parse", "HEAD").strip()
+
+def untracked_files():
+    return set(_git("ls-files", "--others", "--exclude-standard").split())
+
+def changed_files(ref):
+    """Project files that differ between ref and the working tree, untracked files included"""
+    return set(_git("diff", "--relative", "--no-renames", "--name-only", ref).split()) | untracked_files()
+
+def changed_lines(ref, path):
+    """Changed line numbers of a file against ref, on the old and on the new side"""
+    old, new = set(), set()
+    for match in HUNK_HEADER.finditer(_git("diff", "--relative", "--no-renames", "-U0", ref, "--", path)):
+        old_start, old_count, new_start, new_count = match.groups()
+        old_count = 1 if old_count is None else int(old_count)
+        new_count = 1 if new_count is None else int(new_count)
+        old.update(range(int(old_start), int(old_start) + old_count))
+        new.update(range(int(new_start), int(new_start) + new_count))
+    return old, new
+
+def source_at(ref, path):
+    """Content of a file at ref, None if it did not exist there"""
+    try:
+        return _git("show", f"{ref}:./{path}")
+    except subprocess.CalledProcessError:
+        return None
+
+def symbol_table(source):
+    """Top level functions, methods and class attributes of a module as (start, end, name, kind)
+    
+    Nested functions belong to the function that defines them, like the
+    recorded coverage does.
+    """
+    symbols = []
+    
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                start = min([child.lineno] + [decorator.lineno for decorator in child.decorator_list])
+                symbols.append((start, child.end_lineno, prefix + child.name, "function"))
+            elif isinstance(child, ast.ClassDef):
+                visit(child, f"{prefix}{child.name}.")
+            elif prefix and isinstance(child, (ast.Assign, ast.AnnAssign)):
+                targets = child.targets if isinstance(child, ast.Assign) else [child.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        symbols.append((child.lineno, child.end_lineno, prefix + target.id, "attribute"))
+    
+    visit(ast.parse(source), "")
+    return symbols
+
+def symbols_at_lines(source, lines):
+    """Symbols that contain any of the lines, MODULE_SYMBOL for lines outside of them"""
+    try:
+        table = symbol_table(source)
+    except SyntaxError:
+        return {(MODULE_SYMBOL, "module")}
+    
+    found = set()
+    for line in lines:
+        hits = [(name, kind) for start, end, name, kind in table if start <= line <= end]
+        found.update(hits or [(MODULE_SYMBOL, "module")])
+    return found
+
+def attribute_users(source, attributes):
+    """Functions of a module that read any of the attributes by name, like self.SEARCH_BOX"""
+    users = set()
+    
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if any(isinstance(inner, ast.Attribute) and inner.attr in attributes for inner in ast.walk(child)):
+                    users.add(prefix + child.name)
+            elif isinstance(child, ast.ClassDef):
+                visit(child, f"{prefix}{child.name}.")
+    
+    visit(ast.parse(source), "")
+    return users
+
+class ImpactRecorder:
+    """Records which project functions each test calls
+    
+    The trace function only sees call events and returns no local tracer, so
+    lines run untraced. Calls are recorded per top level function or method.
+    """
+    
+    def __init__(self, root):
+        self.root = os.path.abspath(root) + os.sep
+        self.tests = {}
+        self.shared = set()
+        self._current = None
+        self._symbols = {}
+        self._functions = {}
+    
+    def _symbol(self, code):
+        symbol = self._symbols.get(code, False)
+        if symbol is False:
+            filename = os.path.abspath(code.co_filename)
+            symbol = None
+            if filename.startswith(self.root) and "site-packages" not in filename:
+                path = os.path.relpath(filename, self.root).replace(os.sep, "/")
+                symbol = f"{path}::{self._function_name(filename, code)}"
+            self._symbols[code] = symbol
+        return symbol
+    
+    def _function_name(self, filename, code):
+        """Name of the top level function or method a code object belongs to
+        
+        Looked up in the symbol table of the file, the same one the diffs are
+        mapped with (code.co_qualname would need Python 3.11). Code outside of
+        any function, like a module or class body, keeps its own name.
+        """
+        functions = self._functions.get(filename)
+        if functions is None:
+            try:
+                with open(filename, "r", encoding="utf-8") as f:
+                    functions = [(start, end, name) for start, end, name, kind in symbol_table(f.read()) if kind == "function"]
+            except (OSError, SyntaxError, UnicodeDecodeError):
+                functions = []
+            self._functions[filename] = functions
+        
+        for start, end, name in functions:
+            if start <= code.co_firstlineno <= end:
+                return name
+        return code.co_name
+    
+    def _trace(self, frame, event, arg):
+        if event == "call" and self._current is not None:
+            symbol = self._symbol(frame.f_code)
+            if symbol:
+                self._current.add(symbol)
+        return None
+    
+    def start(self):
+        """Trace calls of this and of all threads started later"""
+        if sys.gettrace() is not None:
+            # Coverage or a debugger owns the trace function already
+            return False
+        threading.settrace(self._trace)
+        sys.settrace(self._trace)
+        return True
+    
+    def stop(self):
+        sys.settrace(None)
+        threading.settrace(None)
+    
+    def start_test(self, nodeid):
+        self._current = self.tests.setdefault(nodeid, set())
+    
+    def finish_test(self):
+        self._current = None
+    
+    def record_shared(self):
+        """Attribute the following calls to code shared by all tests, returns the previous target"""
+        previous, self._current = self._current, self.shared
+        return previous
+    
+    def restore(self, previous):
+        self._current = previous
+    
+    def imported_files(self):
+        """Project modules imported so far, their import time code runs before any test"""
+        paths = set()
+        for module in list(sys.modules.values()):
+            filename = getattr(module, "__file__", None)
+            if filename and os.path.abspath(filename).startswith(self.root) and "site-packages" not in filename:
+                paths.add(os.path.relpath(os.path.abspath(filename), self.root).replace(os.sep, "/"))
+        return paths
+    
+    def save(self, path):
+        """Write what this process recorded, merged later by ImpactIndex.build"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "tests": {nodeid: sorted(symbols) for nodeid, symbols in self.tests.items()},
+                "shared": sorted(self.shared),
+                "imported": sorted(self.imported_files())
+            }, f)
+
+class ImpactIndex:
+    """Which project functions, methods and files every test of a recording run used"""
+    
+    def __init__(self, reports_dir="reports"):
+        self.reports_dir = reports_dir
+        self.index_file = os.path.join(reports_dir, "test_impact.json")
+        self.commit = None
+        self.created = None
+        self.dirty = []
+        self.tests = {}
+        self.shared = set()
+        self.imported = set()
+    
+    @staticmethod
+    def partial_dir(reports_dir="reports"):
+        return os.path.join(reports_dir, "impact")
+    
+    @classmethod
+    def load(cls, reports_dir="reports"):
+        """Load the index, None if nothing was recorded yet"""
+        index = cls(reports_dir)
+        if not os.path.exists(index.index_file):
+            return None
+        with open(index.index_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        symbols = data["symbols"]
+        index.commit = data["commit"]
+        index.created = datetime.fromisoformat(data["created"])
+        index.dirty = data["dirty"]
+        index.tests = {nodeid: {symbols[i] for i in ids} for nodeid, ids in data["tests"].items()}
+        index.shared = set(data["shared"])
+        index.imported = set(data["imported"])
+        return index
+    
+    @classmethod
+    def build(cls, reports_dir="reports"):
+        """Merge the files of all recording processes into the index"""
+        index = cls(reports_dir)
+        partials = sorted(glob.glob(os.path.join(cls.partial_dir(reports_dir), "impact_*.json")))
+        for partial in partials:
+            with open(partial, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for nodeid, symbols in data["tests"].items():
+                index.tests.setdefault(nodeid, set()).update(symbols)
+            index.shared.update(data["shared"])
+            index.imported.update(data["imported"])
+        if not index.tests:
+            return None
+        
+        index.commit = current_commit()
+        index.created = datetime.now()
+        # Uncommitted changes were recorded too, later selections treat these files as changed
+        index.dirty = sorted(changed_files("HEAD"))
+        index.save()
+        for partial in partials:
+            os.remove(partial)
+        return index
+    
+    def save(self):
+        """Write the index, symbols are stored once and referenced by position"""
+        symbols = sorted(set().union(*self.tests.values()))
+        positions = {symbol: i for i, symbol in enumerate(symbols)}
+        os.makedirs(self.reports_dir, exist_ok=True)
+        with open(self.index_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": self.commit,
+                "created": self.created.isoformat(),
+                "dirty": self.dirty,
+                "symbols": symbols,
+                "tests": {nodeid: sorted(positions[s] for s in used) for nodeid, used in sorted(self.tests.items())},
+                "shared": sorted(self.shared),
+                "imported": sorted(self.imported)
+            }, f, indent=1)
+    
+    def stale_reason(self, max_age_days=MAX_INDEX_AGE_DAYS):
+        """Why the index can not be trusted for the current checkout, None if it can"""
+        age = datetime.now() - self.created
+        if age.days >= max_age_days:
+            return f"index is {age.days} days old"
+        try:
+            _git("merge-base", "--is-ancestor", self.commit, "HEAD")
+        except subprocess.CalledProcessError:
+            return f"index commit {self.commit[:10]} is not an ancestor of HEAD"
+        return None
+    
+    def covered_files(self):
+        return {symbol.split("::", 1)[0] for symbols in self.tests.values() for symbol in symbols}
+    
+    def symbols_in(self, path):
+        """Recorded symbols of a file, shared ones included"""
+        prefix = f"{path}::"
+        recorded = set().union(self.shared, *self.tests.values())
+        return {symbol for symbol in recorded if symbol.startswith(prefix)}
+    
+    def tests_using(self, symbols):
+        """Tests that called any of the symbols"""
+        symbols = set(symbols)
+        return {nodeid for nodeid, used in self.tests.items() if not symbols.isdisjoint(used)}
+
+def _impacted_symbols(index, path, refs, untracked):
+    """Recorded symbols of a file touched by its changes against each ref
+    
+    Returns (symbols, whole_file). Changed locators and other class
+    attributes select every function that reads an attribute of that name.
+    """
+    current = None
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            current = f.read()
+    
+    found = set()
+    for ref in refs:
+        if path in untracked:
+            old_lines, new_lines = set(), set(range(1, current.count("\n") + 2))
+        else:
+            old_lines, new_lines = changed_lines(ref, path)
+        if current is not None:
+            found |= symbols_at_lines(current, new_lines)
+        previous = source_at(ref, path) if old_lines else None
+        if previous is not None:
+            found |= symbols_at_lines(previous, old_lines)
+    
+    if (MODULE_SYMBOL, "module") in found:
+        return set(), True
+    
+    symbols = {f"{path}::{name}" for name, kind in found if kind == "function"}
+    attributes = {name.rsplit(".", 1)[1] for name, kind in found if kind == "attribute"}
+    if attributes:
+        for covered in index.covered_files():
+            if not covered.endswith(".py") or not os.path.exists(covered):
+                continue
+            with open(covered, "r", encoding="utf-8") as f:
+                source = f.read()
+            try:
+                symbols |= {f"{covered}::{name}" for name in attribute_users(source, attributes)}
+            except SyntaxError:
+                return set(), True
+    return symbols, False
+
+def select_tests(base_ref, reports_dir="reports", max_age_days=MAX_INDEX_AGE_DAYS):
+    """Tests affected by the changes between base_ref and the working tree
+    
+    The result has full_suite set, with the reason, whenever the index can
+    not decide safely. "known" lists every test of the index, tests outside
+    of it are new and always run.
+    """
+    selection = {"base_ref": base_ref, "full_suite": True, "reason": None, "changed_files": [], "selected": [], "known": []}
+    index = ImpactIndex.load(reports_dir)
+    if index is None:
+        selection["reason"] = "no test impact index, record one with --record-impact"
+        return selection
+    selection["reason"] = index.stale_reason(max_age_days)
+    if selection["reason"]:
+        return selection
+    
+    # Files changed since the index was recorded may have changed which code a test runs
+    untracked = untracked_files()
+    refs = {base_ref: changed_files(base_ref), index.commit: changed_files(index.commit)}
+    changed = set().union(*refs.values(), index.dirty)
+    selection["changed_files"] = sorted(changed)
+    selection["known"] = sorted(index.tests)
+    
+    covered = index.covered_files()
+    selected = set()
+    for path in sorted(changed):
+        if any(fnmatch.fnmatch(path, pattern) for pattern in IGNORED_PATTERNS):
+            continue
+        if any(fnmatch.fnmatch(path, pattern) for pattern in FULL_SUITE_PATTERNS):
+            selection["reason"] = f"{path} can affect every test"
+            return selection
+        if not path.endswith(".py"):
+            selection["reason"] = f"{path} is not mapped to tests"
+            return selection
+        if path not in covered:
+            if path in index.imported and not path.startswith("tests/"):
+                # Imported but no test called into it: only import time code can matter
+                selection["reason"] = f"{path} runs at import time only"
+                return selection
+            # Not reached by any recorded test, new tests are selected as unknown
+            continue
+        
+        if path in index.dirty:
+            # Recorded from uncommitted content, a diff against a commit says nothing about it
+            symbols, whole_file = set(), True
+        else:
+            symbols, whole_file = _impacted_symbols(
+                index, path, [ref for ref, paths in refs.items() if path in paths], untracked
+            )
+        if whole_file:
+            # Module level code changed, everything recorded in the file is affected
+            symbols = index.symbols_in(path)
+        if not index.shared.isdisjoint(symbols):
+            selection["reason"] = f"{path} changes code that session fixtures run for every test"
+            return selection
+        selected |= index.tests_using(symbols)
+    
+    selection["full_suite"] = False
+    selection["reason"] = f"{len(selected)} of {len(index.tests)} recorded tests affected"
+    selection["selected"] = sorted(selected)
+    return selection
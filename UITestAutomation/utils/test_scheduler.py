@@ -0,0 +1,176 @@
+import glob
+import heapq
+import json
+import os
+import statistics
+from datetime import datetime
+
+# Estimate for a test nothing is known about
+DEFAULT_ESTIMATE = 10.0
+
+# Durations kept per test, the estimate is their median
+HISTORY_SIZE = 5
+
+# Bins per worker share of a requirement, more bins let free workers balance the tail
+BINS_PER_WORKER = 2
+
+def function_id(nodeid):
+    """Node id of the test function, without parameters"""
+    return nodeid.split("[", 1)[0]
+
+class DurationHistory:
+    """Per-test durations of previous runs, read from the spans exports under reports/"""
+    
+    def __init__(self, reports_dir="reports"):
+        self.reports_dir = reports_dir
+        self.history_file = os.path.join(reports_dir, "test_durations.json")
+        self.tests = {}
+        self.imported = []
+        self._medians = None
+    
+    @classmethod
+    def load(cls, reports_dir="reports"):
+        """Load the history file, built from existing reports the first time"""
+        history = cls(reports_dir)
+        if os.path.exists(history.history_file):
+            with open(history.history_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            history.tests = data.get("tests", {})
+            history.imported = data.get("imported", [])
+        else:
+            for report_path in sorted(glob.glob(os.path.join(reports_dir, "*", "*"))):
+                history.add_report(report_path)
+        return history
+    
+    def add_report(self, report_path):
+        """Add the test durations of a report folder, each folder only once"""
+        report_path = os.path.normpath(report_path)
+        if report_path in self.imported:
+            return 0
+        
+        added = 0
+        for spans_file in sorted(glob.glob(os.path.join(report_path, "spans_*.jsonl"))):
+            with open(spans_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    # Skipped tests say nothing about how long the test takes
+                    if record.get("type") != "test" or record["outcome"] == "skipped":
+                        continue
+                    durations = self.tests.setdefault(record["test"], [])
+                    durations.append(round(record["duration"], 3))
+                    del durations[:-HISTORY_SIZE]
+                    added += 1
+        
+        if added:
+            self.imported.append(report_path)
+            self._medians = None
+        return added
+    
+    def save(self):
+        """Write the history file"""
+        os.makedirs(self.reports_dir, exist_ok=True)
+        with open(self.history_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "updated": datetime.now().isoformat(),
+                # Only the recent folders are needed to avoid importing a report twice
+                "imported": self.imported[-50:],
+                "tests": self.tests
+            }, f, indent=4)
+    
+    def _index(self):
+        """Median durations grouped by test function, file and overall"""
+        if self._medians is None:
+            self._medians = {"function": {}, "file": {}, "all": []}
+            for test, durations in self.tests.items():
+                median = statistics.median(durations)
+                self._medians["function"].setdefault(function_id(test), []).append(median)
+                self._medians["file"].setdefault(test.split("::", 1)[0], []).append(median)
+                self._medians["all"].append(median)
+        return self._medians
+    
+    def estimate(self, nodeid, requirement=None, requirements=None):
+        """Expected duration of a test and where the estimate came from
+        
+        Unknown tests get the median of their other parameters, then of the
+        tests of their file, then of known tests with the same driver
+        requirement (requirements maps node ids to requirements).
+        """
+        if nodeid in self.tests:
+            return statistics.median(self.tests[nodeid]), "history"
+        
+        medians = self._index()
+        for source, key in (("function", function_id(nodeid)), ("file", nodeid.split("::", 1)[0])):
+            if key in medians[source]:
+                return statistics.median(medians[source][key]), source
+        
+        if requirements:
+            known = [
+                statistics.median(self.tests[test]) for test, test_requirement in requirements.items()
+                if test_requirement == requirement and test in self.tests
+            ]
+            if known:
+                return statistics.median(known), "requirement"
+        
+        if medians["all"]:
+            return statistics.median(medians["all"]), "global"
+        return DEFAULT_ESTIMATE, "default"
+
+def pack_longest_first(tests, bins):
+    """Pack (nodeid, estimate) pairs into bins, longest test to the least loaded bin"""
+    loads = [(0.0, index, []) for index in range(bins)]
+    heapq.heapify(loads)
+    for nodeid, estimate in sorted(tests, key=lambda test: -test[1]):
+        load, index, members = heapq.heappop(loads)
+        members.append(nodeid)
+        heapq.heappush(loads, (load + estimate, index, members))
+    return [(load, members) for load, _, members in sorted(loads, key=lambda entry: entry[1]) if members]
+
+def simulate_makespan(bin_estimates, workers):
+    """Finish time of the last worker when bins are handed out in order to the first free worker"""
+    finish_times = [0.0] * max(workers, 1)
+    for estimate in bin_estimates:
+        heapq.heappush(finish_times, heapq.heappop(finish_times) + estimate)
+    return max(finish_times)
+
+def build_schedule(tests, workers):
+    """Group tests by driver requirement and split every group into bins of similar length
+    
+    tests is a list of (nodeid, requirement, estimate). Each requirement gets
+    a share of the workers in proportion to its total estimate, bins are
+    returned longest first so xdist hands them out in LPT order.
+    """
+    groups = {}
+    for nodeid, requirement, estimate in tests:
+        groups.setdefault(requirement, []).append((nodeid, estimate))
+    
+    total = sum(estimate for _, _, estimate in tests) or 1.0
+    bins = []
+    for requirement, members in sorted(groups.items()):
+        share = sum(estimate for _, estimate in members) / total
+        count = min(len(members), max(1, round(workers * share * BINS_PER_WORKER)))
+        for index, (load, nodeids) in enumerate(pack_longest_first(members, count)):
+            bins.append({
+                "name": f"sched-{requirement}-{index}",
+                "requirement": requirement,
+                "estimate": load,
+                "tests": nodeids
+            })
+    
+    bins.sort(key=lambda entry: -entry["estimate"])
+    return {
+        "workers": workers,
+        "predicted_makespan": simulate_makespan([entry["estimate"] for entry in bins], workers),
+        "bins": bins
+    }
+
+def actual_makespan(report_path):
+    """Busy time of every worker from the spans exports of a report folder"""
+    busy = {}
+    for spans_file in glob.glob(os.path.join(report_path, "spans_*.jsonl")):
+        worker = os.path.basename(spans_file)[len("spans_"):-len(".jsonl")]
+        with open(spans_file, "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record.get("type") == "test":
+                    busy[worker] = busy.get(worker, 0.0) + record["duration"]
+    return busy
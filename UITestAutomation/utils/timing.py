@@ -0,0 +1,162 @@
+import functools
+import json
+import contextvars
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Actions of the spans currently open, per thread and per asyncio task
+_open_spans = contextvars.ContextVar("open_spans", default=())
+
+class SpanRecorder:
+    """Collects timing spans of page actions and aggregates them per test and per session"""
+    
+    def __init__(self):
+        self.test_name = None
+        self.spans = []
+        self.session = {}
+        self.tests = {"passed": 0, "failed": 0, "skipped": 0}
+        self.test_durations = []
+        # Flows in tabs and async sessions record spans concurrently
+        self._lock = threading.Lock()
+    
+    def start_test(self, test_name):
+        """Start collecting spans for a new test"""
+        self.test_name = test_name
+        self.spans = []
+        _open_spans.set(())
+    
+    @contextmanager
+    def span(self, action, page=None, locator=None):
+        """Time a block and record it as a span of the running test"""
+        open_spans = _open_spans.get()
+        parent = open_spans[-1] if open_spans else None
+        token = _open_spans.set(open_spans + (action,))
+        started_at = time.time()
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            _open_spans.reset(token)
+            self.record({
+                "test": self.test_name,
+                "page": page,
+                "action": action,
+                "locator": str(locator[1]) if locator else None,
+                "parent": parent,
+                "outcome": outcome,
+                "start": started_at,
+                "duration": duration
+            })
+    
+    def record(self, span):
+        """Store a span and add it to the session aggregate"""
+        with self._lock:
+            self.spans.append(span)
+            key = (span["page"] or "", span["action"])
+            aggregate = self.session.setdefault(key, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0})
+            aggregate["count"] += 1
+            aggregate["total"] += span["duration"]
+            aggregate["max"] = max(aggregate["max"], span["duration"])
+            if span["outcome"] != "ok":
+                aggregate["errors"] += 1
+    
+    def test_summary(self):
+        """Aggregate the spans of the running test per action"""
+        actions = {}
+        for span in self.spans:
+            if span["parent"] is not None:
+                # Nested spans are already part of their parent's time
+                continue
+            aggregate = actions.setdefault(span["action"], {"count": 0, "total": 0.0})
+            aggregate["count"] += 1
+            aggregate["total"] += span["duration"]
+        return actions
+    
+    def finish_test(self, outcome, duration, output_file=None):
+        """Close the running test and append its spans to the JSON Lines export"""
+        self.tests[outcome] = self.tests.get(outcome, 0) + 1
+        self.test_durations.append(duration)
+        summary = {
+            "type": "test",
+            "test": self.test_name,
+            "outcome": outcome,
+            "duration": duration,
+            "actions": self.test_summary()
+        }
+        
+        if output_file:
+            with open(output_file, "a", encoding="utf-8") as f:
+                for span in self.spans:
+                    f.write(json.dumps(dict(span, type="span")) + "\n")
+                f.write(json.dumps(summary) + "\n")
+        
+        self.test_name = None
+        self.spans = []
+        return summary
+    
+    def write_prometheus(self, output_file, worker="master"):
+        """Write session aggregates in the Prometheus text exposition format"""
+        lines = [
+            "# HELP ui_action_duration_seconds Time spent in page object actions",
+            "# TYPE ui_action_duration_seconds summary"
+        ]
+        for (page, action), aggregate in sorted(self.session.items()):
+            labels = f'worker="{worker}",page="{page}",action="{action}"'
+            lines.append(f"ui_action_duration_seconds_sum{{{labels}}} {aggregate['total']:.6f}")
+            lines.append(f"ui_action_duration_seconds_count{{{labels}}} {aggregate['count']}")
+        
+        lines.append("# HELP ui_action_max_seconds Slowest single page object action")
+        lines.append("# TYPE ui_action_max_seconds gauge")
+        for (page, action), aggregate in sorted(self.session.items()):
+            labels = f'worker="{worker}",page="{page}",action="{action}"'
+            lines.append(f"ui_action_max_seconds{{{labels}}} {aggregate['max']:.6f}")
+        
+        lines.append("# HELP ui_action_errors_total Page object actions that raised")
+        lines.append("# TYPE ui_action_errors_total counter")
+        for (page, action), aggregate in sorted(self.session.items()):
+            labels = f'worker="{worker}",page="{page}",action="{action}"'
+            lines.append(f"ui_action_errors_total{{{labels}}} {aggregate['errors']}")
+        
+        lines.append("# HELP ui_tests_total Finished tests by outcome")
+        lines.append("# TYPE ui_tests_total counter")
+        for outcome, count in sorted(self.tests.items()):
+            lines.append(f'ui_tests_total{{worker="{worker}",outcome="{outcome}"}} {count}')
+        
+        lines.append("# HELP ui_test_duration_seconds Wall-clock time of tests")
+        lines.append("# TYPE ui_test_duration_seconds summary")
+        lines.append(f'ui_test_duration_seconds_sum{{worker="{worker}"}} {sum(self.test_durations):.6f}')
+        lines.append(f'ui_test_duration_seconds_count{{worker="{worker}"}} {len(self.test_durations)}')
+        
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+def timed(action):
+    """Decorator recording a page object method as a timing span"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                locator = args[0] if args and isinstance(args[0], tuple) else None
+                with span_recorder.span(action, type(self).__name__, locator):
+                    return await func(self, *args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            locator = args[0] if args and isinstance(args[0], tuple) else None
+            with span_recorder.span(action, type(self).__name__, locator):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+# Global span recorder instance
+span_recorder = SpanRecorder()
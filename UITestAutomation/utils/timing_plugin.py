@@ -0,0 +1,76 @@
+import datetime
+import glob
+import os
+import time
+import allure
+import pytest
+from utils.artifact_writer import artifact_writer
+from utils.logger import logger
+from utils.timing import span_recorder
+
+def _worker_id():
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+def _metrics_dir():
+    return os.getenv("REPORT_PATH", "reports")
+
+def _outcome(item):
+    """Overall outcome of a test from the reports stored on the item"""
+    for when in ("setup", "call", "teardown"):
+        report = getattr(item, f"rep_{when}", None)
+        if report is None:
+            continue
+        if report.failed:
+            return "failed"
+        if report.skipped:
+            return "skipped"
+    return "passed"
+
+def pytest_configure(config):
+    """Start the spans exports of the run empty, tests append to them as they finish"""
+    # Workers start after the controller, which also clears files of workers a previous run had
+    if not hasattr(config, "workerinput"):
+        for spans_file in glob.glob(os.path.join(_metrics_dir(), "spans_*.jsonl")):
+            os.remove(spans_file)
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Collect spans for the duration of a test and export them once it finished"""
+    span_recorder.start_test(item.nodeid)
+    start = time.perf_counter()
+    yield
+    duration = time.perf_counter() - start
+    
+    os.makedirs(_metrics_dir(), exist_ok=True)
+    span_recorder.finish_test(
+        _outcome(item), duration,
+        output_file=os.path.join(_metrics_dir(), f"spans_{_worker_id()}.jsonl")
+    )
+    logger.log_performance(item.nodeid, duration)
+
+@pytest.fixture(scope="function", autouse=True)
+def timing_metadata():
+    """Attach start, end and per-action timings of every test to the report"""
+    start_time = datetime.datetime.now()
+    yield
+    end_time = datetime.datetime.now()
+    
+    lines = [
+        f"Test Duration: {end_time - start_time}",
+        f"Start Time: {start_time}",
+        f"End Time: {end_time}",
+        "",
+        "Action timings:"
+    ]
+    for action, aggregate in sorted(span_recorder.test_summary().items(), key=lambda item: -item[1]["total"]):
+        lines.append(f"  {aggregate['total']:8.3f}s  {action} x{aggregate['count']}")
+    artifact_writer.attach("\n".join(lines), name="test_metadata", attachment_type=allure.attachment_type.TEXT)
+
+def pytest_sessionfinish(session, exitstatus):
+    """Export session aggregates as a Prometheus text file"""
+    if not span_recorder.tests or not sum(span_recorder.tests.values()):
+        return
+    span_recorder.write_prometheus(
+        os.path.join(_metrics_dir(), f"metrics_{_worker_id()}.prom"),
+        worker=_worker_id()
+    )
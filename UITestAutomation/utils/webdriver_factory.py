@@ -2,18 +2,39 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from config.config import Config
+from utils.driver_resolver import DriverResolver
+from utils.network_policy import NetworkPolicy
+from utils.logger import logger
+from concurrent.futures import ThreadPoolExecutor
 import os
+import time
 
 class WebDriverFactory:
-    """Factory class for creating WebDriver instances"""
+    """Factory class for creating WebDriver instances
     
-    def __init__(self, config: Config):
+    In prelaunch mode the browser of the next fresh-browser test starts in a
+    background thread while the current test runs, and quitting happens in
+    the background too. Every test still gets a browser nobody used before.
+    Callers that know the next test does not need one pass prelaunch_next=False.
+    """
+    
+    def __init__(self, config: Config, prelaunch=False):
         self.config = config
         self.driver = None
+        self.resolver = DriverResolver.from_config(config)
+        self.network_policy = NetworkPolicy.from_config(config)
+        self.prelaunch = prelaunch
+        self._executor = None
+        self._next = None
+        self._quits = []
+        self.stats = {
+            "fresh_drivers": 0,
+            "prelaunch_hits": 0,
+            "prelaunch_failures": 0,
+            "handover_wait": 0.0,
+            "background_quits": 0
+        }
     
     def create_driver(self, browser_name=None):
         """Create and return a WebDriver instance"""
@@ -31,12 +52,84 @@ class WebDriverFactory:
         else:
             raise ValueError(f"Unsupported browser: {browser_name}")
     
+    def _background(self):
+        """Two threads, so a launch and a quit can overlap"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="driver")
+        return self._executor
+    
+    def acquire_fresh(self, prelaunch_next=True):
+        """Return a browser nobody used before, launched ahead of time in prelaunch mode"""
+        self.stats["fresh_drivers"] += 1
+        driver = None
+        if self._next is not None:
+            start = time.perf_counter()
+            try:
+                driver = self._next.result()
+                self.stats["prelaunch_hits"] += 1
+            except Exception as e:
+                self.stats["prelaunch_failures"] += 1
+                logger.warning("Prelaunched driver failed to start, launching a new one: %s", e)
+            finally:
+                self.stats["handover_wait"] += time.perf_counter() - start
+                self._next = None
+        
+        if driver is None:
+            driver = self.create_driver()
+        if prelaunch_next:
+            self.prelaunch_next()
+        return driver
+    
+    def prelaunch_next(self):
+        """Start the browser of the next fresh-browser test while the current test runs, in prelaunch mode"""
+        if self.prelaunch and self._next is None:
+            self._next = self._background().submit(self.create_driver)
+    
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning("Driver quit failed: %s", e)
+    
+    def quit_driver(self, driver):
+        """Quit a driver, in the background in prelaunch mode"""
+        if not self.prelaunch:
+            self._quit(driver)
+            return
+        self.stats["background_quits"] += 1
+        self._quits = [future for future in self._quits if not future.done()]
+        self._quits.append(self._background().submit(self._quit, driver))
+    
+    def shutdown(self):
+        """Quit the unused prelaunched driver and wait for background quits"""
+        if self._next is not None:
+            try:
+                self._quit(self._next.result())
+            except Exception as e:
+                logger.warning("Prelaunched driver failed to start: %s", e)
+            self._next = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._quits = []
+    
+    def get_stats(self):
+        """Fresh-browser launch statistics"""
+        fresh, hits = self.stats["fresh_drivers"], self.stats["prelaunch_hits"]
+        return {
+            "prelaunch": self.prelaunch,
+            **self.stats,
+            "avg_handover_wait": self.stats["handover_wait"] / hits if hits else 0.0,
+            "prelaunch_hit_rate": hits / fresh if fresh else 0.0
+        }
+    
     def _create_chrome_driver(self):
         """Create Chrome WebDriver"""
         options = self.config.get_browser_options()
         
-        # Use webdriver-manager for automatic driver management
-        service = ChromeService(ChromeDriverManager().install())
+        # Driver path is resolved once and cached across workers
+        service = ChromeService(self.resolver.resolve("chrome"))
         driver = webdriver.Chrome(service=service, options=options)
         
         self._configure_driver(driver)
@@ -46,8 +139,8 @@ class WebDriverFactory:
         """Create Firefox WebDriver"""
         options = self.config.get_browser_options()
         
-        # Use webdriver-manager for automatic driver management
-        service = FirefoxService(GeckoDriverManager().install())
+        # Driver path is resolved once and cached across workers
+        service = FirefoxService(self.resolver.resolve("firefox"))
         
         driver = webdriver.Firefox(service=service, options=options)
         self._configure_driver(driver)
@@ -58,8 +151,8 @@ class WebDriverFactory:
         """Create Edge WebDriver"""
         options = self.config.get_browser_options()
         
-        # Use webdriver-manager for automatic driver management
-        service = EdgeService(EdgeChromiumDriverManager().install())
+        # Driver path is resolved once and cached across workers
+        service = EdgeService(self.resolver.resolve("edge"))
         
         driver = webdriver.Edge(service=service, options=options)
         self._configure_driver(driver)
@@ -68,8 +161,9 @@ class WebDriverFactory:
     
     def _configure_driver(self, driver):
         """Configure driver with common settings"""
-        # Set timeouts
-        driver.implicitly_wait(self.config.browser_implicit_wait)
+        # Implicit waits stack on top of explicit waits and hide the real wait
+        # budget, page objects rely on explicit waits only
+        driver.implicitly_wait(0)
         driver.set_page_load_timeout(self.config.browser_page_load_timeout)
         
         # Maximize window if not headless
@@ -80,6 +174,10 @@ class WebDriverFactory:
         if self.config.browser_window_size:
             width, height = self.config.browser_window_size.split(',')
             driver.set_window_size(int(width), int(height))
+        
+        # Apply network profile (blocking, stubs, throttling)
+        if self.network_policy:
+            self.network_policy.apply(driver)
     
     def create_driver_with_capabilities(self, capabilities):
         """Create driver with custom capabilities"""
@@ -90,7 +188,7 @@ class WebDriverFactory:
             for key, value in capabilities.items():
                 options.set_capability(key, value)
             
-            service = ChromeService(ChromeDriverManager().install())
+            service = ChromeService(self.resolver.resolve("chrome"))
             driver = webdriver.Chrome(service=service, options=options)
         
         elif browser_name == "firefox":
@@ -98,7 +196,7 @@ class WebDriverFactory:
             for key, value in capabilities.items():
                 options.set_capability(key, value)
             
-            service = FirefoxService(GeckoDriverManager().install())
+            service = FirefoxService(self.resolver.resolve("firefox"))
             driver = webdriver.Firefox(service=service, options=options)
         
         else:
@@ -124,7 +222,7 @@ class WebDriverFactory:
         options = self.config.get_browser_options()
         options.add_experimental_option("mobileEmulation", mobile_emulation)
         
-        service = ChromeService(ChromeDriverManager().install())
+        service = ChromeService(self.resolver.resolve("chrome"))
         driver = webdriver.Chrome(service=service, options=options)
         
         return driver